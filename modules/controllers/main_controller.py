@@ -2,17 +2,21 @@ import logging
 from pathlib import Path
 
 from PySide6.QtCore import QObject, Qt
+from PySide6.QtWidgets import QApplication
 
 from modules.models.application.application_manager import ApplicationManager
 from modules.models.configuration.configuration_manager import ConfigurationManager
 from modules.models.export.export import ExportModel
 from modules.models.indexes.index_kit_manager import IndexKitManager
+from modules.models.journal.edit_journal import EditJournal
 from modules.models.logging.log_widget_handler import LogWidgetHandler
 from modules.models.logging.statusbar_handler import StatusBarLogHandler
 from modules.models.override_cycles.OverrideCyclesModel import OverrideCyclesModel
+from modules.models.project.project_model import ProjectModel
 from modules.models.sample.sample_model import SampleModel, CustomProxyModel
 from modules.models.state.state_model import StateModel
 from modules.models.test.test_profile_manager import TestProfileManager
+from modules.models.compute.compute_service import ComputeService
 from modules.models.validation.color_balance.color_balance_data_generator import ColorBalanceDataGenerator
 from modules.models.validation.compatibility_tester import CompatibilityTester
 from modules.models.validation.sample_data_overview.sample_data_overview import SampleDataOverviewGenerator
@@ -88,6 +92,7 @@ class MainController(QObject):
         self._import_model = ImportModel(self._test_profile_manager, self._logger)
 
         self._override_cycles_model = OverrideCyclesModel(self._state_model, self._logger)
+        self._project_model = ProjectModel(self._sample_model, self._state_model, self._logger)
 
         self._export_model = ExportModel(self._state_model,
                                          self._configuration_manager,
@@ -107,6 +112,9 @@ class MainController(QObject):
 
         # validation models
 
+        # persistent worker pool for the overview and validation computations
+        self._compute_service = ComputeService(self._logger)
+
         self._general_validator = GeneralValidator(
             self._configuration_manager,
             self._application_manager,
@@ -116,16 +124,19 @@ class MainController(QObject):
 
         self._sample_data_overview_generator = SampleDataOverviewGenerator(
             self._state_model,
+            self._compute_service,
             self._logger
         )
 
         self._index_distance_data_generator = IndexDistanceDataGenerator(
             self._state_model,
+            self._compute_service,
             self._logger
         )
 
         self._color_balance_data_generator = ColorBalanceDataGenerator(
             self._state_model,
+            self._compute_service,
             self._logger
         )
 
@@ -134,6 +145,7 @@ class MainController(QObject):
             self._sample_data_overview_generator,
             self._index_distance_data_generator,
             self._color_balance_data_generator,
+            self._compute_service,
             self._state_model,
             self._logger
         )
@@ -187,6 +199,13 @@ class MainController(QObject):
         )
 
         self._connect_signals()
+
+        # restore the edits of a crashed session, then journal the new ones
+        self._edit_journal = EditJournal(self._sample_model, self._state_model, self._logger)
+        self._edit_journal.recover()
+        self._edit_journal.start()
+        self._connect_journal_signals()
+
         self._logger.info("Init done!")
 
     def _connect_signals(self):
@@ -217,7 +236,13 @@ class MainController(QObject):
         self._worksheet_view.import_button.clicked.connect(self._sample_model.import_from_api)
 
     def _connect_file_signals(self):
-        pass
+        self._file_widget.project_open_path_ready.connect(self._project_model.open)
+        self._file_widget.project_save_path_ready.connect(self._project_model.save)
+        self._project_model.validation_results_loaded.connect(self._general_validation_widget.populate)
+        self._project_model.validation_results_loaded.connect(self._export_model.set_validation_results)
+        self._general_validator.general_validation_results_ready.connect(
+            self._project_model.set_validation_results
+        )
 
     # def _connect_import_signals(self):
     #     self._import_model.sample_test_data_ready.connect(self._sample_model.populate_from_dataframe)
@@ -227,10 +252,21 @@ class MainController(QObject):
         self._export_widget.samplesheet_v2_export_path_ready.connect(self._export_model.export_samplesheet_v2)
         self._export_widget.json_export_path_ready.connect(self._export_model.export_json)
         self._export_widget.package_export_path_ready.connect(self._export_model.export_package)
+        self._export_model.package_progress.connect(self._status_bar.display_progress)
+        self._export_model.package_finished.connect(
+            lambda path: self._status_bar.display_message("INFO", f"Saved package {path}")
+        )
+        self._export_model.package_failed.connect(
+            lambda message: self._status_bar.display_message("ERROR", f"Package export failed: {message}")
+        )
 
 
     def _connect_run_setup_signals(self):
         self._run_setup_widget.run_setup_data_ready.connect(self._state_model.set_run_setup_data)
+        self._state_model.state_changed.connect(self._run_setup_widget.show_run_info)
+
+    def _connect_journal_signals(self):
+        QApplication.instance().aboutToQuit.connect(self._edit_journal.close)
 
     def _connect_configuration_signals(self):
         self._configuration_manager.users_changed.connect(
@@ -326,6 +362,9 @@ class MainController(QObject):
         self._general_validator.general_validation_results_ready.connect(
             self._general_validation_widget.populate
         )
+        self._general_validator.general_validation_results_ready.connect(
+            self._export_model.set_validation_results
+        )
 
         self._general_validator.success.connect(self._main_validator.populate_manual_overview_widgets)
         self._sample_data_overview_generator.data_ready.connect(self._sample_data_overview_widget.populate)
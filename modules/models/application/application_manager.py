@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 from logging import Logger
 
+from packaging.version import Version
+
 from modules.models.application.application_profile import ApplicationProfile
 from modules.models.configuration.configuration_manager import ConfigurationManager
 
@@ -147,6 +149,18 @@ class ApplicationManager:
         return self._profile_name_to_data.get(profile_name, {})
 
 
+    def profile_name_to_version(self, profile_name: str) -> Optional[Version]:
+        """Get the version of an application profile.
+
+        Args:
+            profile_name: The application profile name
+
+        Returns:
+            The profile version if found, None otherwise
+        """
+        profile = self._profile_name_to_profile.get(profile_name)
+        return profile.version if profile is not None else None
+
     def profile_name_to_profile(self, profile_name: str) -> Optional[Dict[str, Any]]:
         """Get the full application profile object.
         
@@ -0,0 +1,169 @@
+import threading
+from logging import Logger
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancel token has been cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation of a compute job.
+
+    Jobs check the token between steps, e.g. once per lane, and stop by calling
+    raise_if_cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class ComputeJobSignals(QObject):
+    """Signals emitted by compute jobs, delivered on the thread of the service."""
+    finished = Signal(str, int, object)  # key, generation, result
+    error = Signal(str, int, str)        # key, generation, message
+
+
+class ComputeJob(QRunnable):
+    """Run a compute function with its cancel token in the compute pool."""
+
+    def __init__(self, key: str, generation: int, fn: Callable[[CancelToken], Any],
+                 token: CancelToken, signals: ComputeJobSignals):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.fn = fn
+        self.token = token
+        self.signals = signals
+        self.setAutoDelete(True)
+
+    @Slot()
+    def run(self) -> None:
+        # jobs cancelled while queued are dropped without running
+        if self.token.cancelled:
+            return
+
+        try:
+            result = self.fn(self.token)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if not self.token.cancelled:
+                self.signals.error.emit(self.key, self.generation, str(e))
+            return
+
+        if not self.token.cancelled:
+            self.signals.finished.emit(self.key, self.generation, result)
+
+
+class ComputeService(QObject):
+    """Persistent worker pool for the heavy validation and overview computations.
+
+    Jobs are submitted under a key, e.g. "index_distance". Submitting under a
+    key cancels the running or queued job of that key and bumps its generation,
+    results of older generations are dropped, so the latest request always wins.
+    Queued jobs are started in order of priority, higher first.
+
+    Args:
+        logger: Logger for failed jobs
+        max_threads: Number of worker threads of the pool
+    """
+
+    def __init__(self, logger: Logger, max_threads: int = 2):
+        super().__init__()
+        self._logger = logger
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, max_threads))
+
+        self._generations: Dict[str, int] = {}
+        self._tokens: Dict[str, CancelToken] = {}
+        self._callbacks: Dict[str, tuple] = {}
+
+        self._signals = ComputeJobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.error.connect(self._on_error)
+
+    def submit(self, key: str, fn: Callable[[CancelToken], Any],
+               on_result: Callable[[Any], None],
+               on_error: Optional[Callable[[str], None]] = None,
+               priority: int = 0) -> int:
+        """Submit a job, superseding the previous job under the same key.
+
+        Args:
+            key: Name of the computation, one job per key is current
+            fn: The computation, called with its cancel token in a worker thread.
+                It must only use data snapshotted on the GUI thread.
+            on_result: Called with the result on the GUI thread, if the job is still current
+            on_error: Called with the error message on the GUI thread, if the job is still current
+            priority: Queue priority, higher priority jobs start first
+
+        Returns:
+            The generation of the submitted job
+        """
+        self.cancel(key)
+
+        generation = self._generations.get(key, 0) + 1
+        token = CancelToken()
+
+        self._generations[key] = generation
+        self._tokens[key] = token
+        self._callbacks[key] = (on_result, on_error)
+
+        self._pool.start(ComputeJob(key, generation, fn, token, self._signals), priority)
+        return generation
+
+    def cancel(self, key: str) -> None:
+        """Cancel the current job of key, its result is dropped."""
+        token = self._tokens.pop(key, None)
+        if token is not None:
+            token.cancel()
+        self._callbacks.pop(key, None)
+
+    def cancel_all(self) -> None:
+        """Cancel all current jobs, e.g. when the data they were computed from is replaced."""
+        for key in list(self._tokens):
+            self.cancel(key)
+
+    def is_running(self, key: str) -> bool:
+        return key in self._tokens
+
+    def _current_callbacks(self, key: str, generation: int) -> Optional[tuple]:
+        if self._generations.get(key) != generation or key not in self._tokens:
+            return None
+        self._tokens.pop(key)
+        return self._callbacks.pop(key, None)
+
+    @Slot(str, int, object)
+    def _on_finished(self, key: str, generation: int, result: Any) -> None:
+        callbacks = self._current_callbacks(key, generation)
+        if callbacks is None:
+            self._logger.debug(f"Dropped stale result of {key} job {generation}")
+            return
+
+        on_result, _ = callbacks
+        on_result(result)
+
+    @Slot(str, int, str)
+    def _on_error(self, key: str, generation: int, message: str) -> None:
+        callbacks = self._current_callbacks(key, generation)
+        if callbacks is None:
+            return
+
+        self._logger.error(f"Compute job {key} failed: {message}")
+        _, on_error = callbacks
+        if on_error is not None:
+            on_error(message)
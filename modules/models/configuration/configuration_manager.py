@@ -72,6 +72,7 @@ class ConfigurationManager(QObject):
         'sample_settings_file_path': 'config/sample_settings.yaml',
         'validation_settings_file_path': 'config/validation/validation_settings.yaml',
         'samplesheet_v1_template_file_path': 'config/samplesheet_v1.yaml',
+        'export_settings_file_path': 'config/export_settings.yaml',
     }
 
     def __init__(self, logger: Logger, config_paths: Optional[Dict[str, str]] = None):
@@ -171,6 +172,7 @@ class ConfigurationManager(QObject):
         - Sample settings
         - Validation settings
         - Sample sheet template
+        - Export settings
         
         Raises:
             ConfigError: If any required configuration file is missing or invalid.
@@ -212,6 +214,11 @@ class ConfigurationManager(QObject):
             self._paths['samplesheet_v1_template_file_path'],
             "sample sheet template"
         )
+
+        self._export_settings = self._load_config_file(
+            self._paths['export_settings_file_path'],
+            "export settings"
+        ) or {}
         
         self._logger.info("All configuration files loaded successfully")
             
@@ -407,6 +414,15 @@ class ConfigurationManager(QObject):
         """
         return self._samplesheet_v1_template
 
+    @property
+    def export_settings(self) -> Dict[str, Any]:
+        """Get the export settings.
+        
+        Returns:
+            Dictionary containing the export settings, empty if none are configured
+        """
+        return self._export_settings
+
     @property
     def required_sample_fields(self) -> List[str]:
         """Get the list of required sample fields.
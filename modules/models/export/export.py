@@ -1,21 +1,57 @@
-import json
-import zipfile
-from dataclasses import asdict
+from copy import deepcopy
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 from logging import Logger
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from PySide6.QtCore import QObject, Signal
+import pandas as pd
+from PySide6.QtCore import QObject, Signal, Slot
 
 from modules.models.configuration.configuration_manager import ConfigurationManager
 from modules.models.application.application_manager import ApplicationManager
+from modules.models.export.export_cache import ExportArtifacts, ExportCache
+from modules.models.export.package_builder import PackageBuilder, PackageEntry
+from modules.models.export.samplesheet_v1.samplesheet_v1 import IlluminaSampleSheetV1
 from modules.models.export.samplesheet_v2.samplesheet_v2 import IlluminaSampleSheetV2
 from modules.models.override_cycles.OverrideCyclesModel import OverrideCyclesModel
-from modules.models.state.state_model import StateModel
+from modules.models.sample.lane_partition import LanePartition, is_lane
+from modules.models.state.state_model import RunInfo, StateModel
+from modules.models.validation.validation_result import ValidationResult
+from modules.utils import json_backend
+
+
+@dataclass(frozen=True)
+class ProfileExport:
+    """The export settings of an application profile, copied from the ApplicationManager."""
+    profile_id: str
+    application_name: Optional[str]
+    settings: dict
+    translate: Optional[dict]
+    data_fields: List[str]
+    data: dict
+
+
+@dataclass(frozen=True)
+class ExportSnapshot:
+    """The export input, taken on the GUI thread so exports can be built in worker threads.
+
+    The application profiles and the override cycles of every pattern are
+    resolved when the snapshot is taken, building an export from it only
+    formats the snapshot data.
+    """
+    run_info: RunInfo
+    sample_df: pd.DataFrame
+    profiles: Tuple[ProfileExport, ...]
+    override_cycles: Dict[str, Optional[str]]  # pattern, resolved override cycles
+    validation_results: Tuple[ValidationResult, ...]
 
 
 class ExportModel(QObject):
     samplesheet_v2_ready = Signal(object)
+    package_progress = Signal(int, int, str)  # done, total, message
+    package_finished = Signal(object)         # path of the written package
+    package_failed = Signal(str)              # error message
 
     def __init__(self, state_model: StateModel,
                  configuration_manager: ConfigurationManager,
@@ -41,143 +77,355 @@ class ExportModel(QObject):
         self._json_data = None
         self._samplesheet_v1_data = None
         self._samplesheet_v2_data = None
+        self._samplesheet_v2_builder = None
+
+        self._export_cache = ExportCache()
+        self._artifacts = None
+        self._validation_results: Tuple[ValidationResult, ...] = ()
+
+        package_settings = self._configuration_manager.export_settings.get("Package", {})
+        self._compression_levels = package_settings.get("CompressionLevel", {})
+
+        self._package_builder = PackageBuilder(self._logger, package_settings.get("Workers", 4))
+        self._package_builder.progress.connect(self.package_progress)
+        self._package_builder.finished.connect(self.package_finished)
+        self._package_builder.failed.connect(self.package_failed)
+
+    @Slot(object)
+    def set_validation_results(self, validation_results: List[ValidationResult]) -> None:
+        """Keep the latest general validation results for the package validation report."""
+        self._validation_results = tuple(validation_results)
+
+    def _snapshot(self) -> ExportSnapshot:
+        run_info = self._state_model.run_info
+        return self._make_snapshot(
+            replace(run_info, lanes=list(run_info.lanes or [])),
+            self._state_model.sample_df,
+            self._state_model.sample_application_profile_ids,
+            self._state_model.run_cycles,
+            self._validation_results,
+        )
+
+    def _make_snapshot(self, run_info: RunInfo, sample_df: pd.DataFrame, profile_ids: Iterable[str],
+                       run_cycles: Tuple[int, int, int, int],
+                       validation_results: Tuple[ValidationResult, ...]) -> ExportSnapshot:
+        """Resolve the profiles and override cycles of an export, on the GUI thread."""
+        application_manager = self._application_manager
+
+        profiles = tuple(
+            ProfileExport(
+                profile_id=profile_id,
+                application_name=application_manager.application_profile_to_app(profile_id),
+                settings=deepcopy(application_manager.profile_name_to_settings(profile_id)),
+                translate=deepcopy(application_manager.profile_name_to_translate(profile_id)),
+                data_fields=list(application_manager.profile_name_to_data_fields(profile_id)),
+                data=deepcopy(application_manager.profile_name_to_data(profile_id)),
+            )
+            for profile_id in profile_ids
+        )
+
+        patterns = sample_df["OverrideCyclesPattern"].dropna().unique() \
+            if "OverrideCyclesPattern" in sample_df.columns else ()
+        override_cycles = {
+            pattern: self._override_cycles_model.pattern_to_cycles(pattern, run_cycles) for pattern in patterns
+        }
 
-    def generate(self):
-        self.generate_samplesheet_v2()
-        self.generate_json()
+        return ExportSnapshot(run_info, sample_df, profiles, override_cycles, tuple(validation_results))
 
-    def generate_json(self):
+    def _export_cache_key(self) -> str:
+        profile_versions = {
+            profile_name: self._application_manager.profile_name_to_version(profile_name)
+            for profile_name in self._state_model.sample_application_profile_ids
+        }
+        return ExportCache.key(self._state_model.run_info,
+                               self._state_model.sample_generation,
+                               profile_versions)
 
-        run_info_dict = asdict(self._state_model.run_info)
+    def generate(self):
+        """Generate the samplesheet and json, reusing the cached export when its inputs are unchanged."""
+        key = self._export_cache_key()
+        artifacts = self._export_cache.get(key)
+
+        if artifacts is None:
+            snapshot = self._snapshot()
+            self.generate_samplesheet_v2(snapshot)
+            self.generate_json(snapshot)
+
+            artifacts = ExportArtifacts(
+                samplesheet_v2=self._state_model.samplesheet_v2,
+                samplesheet_v2_builder=self._samplesheet_v2_builder,
+                json=self._state_model.json,
+                json_data=self._json_data,
+            )
+            self._export_cache.put(key, artifacts)
+        else:
+            self._logger.info("Export input unchanged, using cached export data")
+            self._samplesheet_v2_builder = artifacts.samplesheet_v2_builder
+            self._json_data = artifacts.json_data
+            self._state_model.samplesheet_v2 = artifacts.samplesheet_v2
+            self._state_model.json = artifacts.json
+
+        self._artifacts = artifacts
+
+    def generate_json(self, snapshot: Optional[ExportSnapshot] = None):
+
+        # Kept for export_json, which streams the records instead of writing the text
+        self._json_data = self._build_json_data(snapshot or self._snapshot())
+        self._state_model.json = self._json_text(self._json_data)
+
+    @staticmethod
+    def _build_json_data(snapshot: ExportSnapshot) -> Tuple[dict, pd.DataFrame]:
+
+        run_info_dict = asdict(snapshot.run_info)
         run_info_dict.update({"json": ""})
         run_info_dict.update({"samplesheet_v2": ""})
 
-        df = self._state_model.sample_df.copy()
-        df["OverrideCycles"] = df["OverrideCyclesPattern"].apply(self._override_cycles_model.pattern_to_cycles)
+        df = snapshot.sample_df.copy()
+        df["OverrideCycles"] = df["OverrideCyclesPattern"].map(snapshot.override_cycles)
 
-        df = df.to_dict(orient="records")
+        return run_info_dict, df
+
+    @staticmethod
+    def _json_text(json_data: Tuple[dict, pd.DataFrame]) -> str:
+        run_info_dict, df = json_data
 
         json_dict = {
             "run_info": run_info_dict,
-            "samples": df
+            "samples": list(json_backend.dataframe_records(df))
         }
 
-        json_str = json.dumps(json_dict, indent=4)
-        self._state_model.json = json_str
+        return json_backend.dumps(json_dict, indent=True)
+
+    def generate_samplesheet_v2(self, snapshot: Optional[ExportSnapshot] = None):
+
+        illumina_samplesheet_v2 = self._build_samplesheet_v2(snapshot or self._snapshot())
+
+        self._samplesheet_v2_builder = illumina_samplesheet_v2
+
+        samplesheet_v2_data = illumina_samplesheet_v2.generate()
+        self._state_model.samplesheet_v2 = samplesheet_v2_data
 
-    def generate_samplesheet_v2(self):
+    @staticmethod
+    def _build_samplesheet_v2(snapshot: ExportSnapshot) -> IlluminaSampleSheetV2:
 
         file_format_version = "2"
+        run_info = snapshot.run_info
 
         illumina_samplesheet_v2 = IlluminaSampleSheetV2()
 
-        illumina_samplesheet_v2.set_header_field("RunName", self._state_model.run_name)
-        illumina_samplesheet_v2.set_header_field("RunDescription", self._state_model.run_description)
+        illumina_samplesheet_v2.set_header_field("RunName", run_info.run_name)
+        illumina_samplesheet_v2.set_header_field("RunDescription", run_info.run_description)
         illumina_samplesheet_v2.set_header_field("FileFormatVersion", file_format_version)
-        illumina_samplesheet_v2.set_header_field("InstrumentType", self._state_model.instrument)
-        illumina_samplesheet_v2.set_header_field("Custom_uuid", self._state_model.uuid)
+        illumina_samplesheet_v2.set_header_field("InstrumentType", run_info.instrument)
+        illumina_samplesheet_v2.set_header_field("Custom_uuid", run_info.uuid)
 
-        illumina_samplesheet_v2.set_read_field("Index1Cycles", str(self._state_model.index1_cycles))
-        illumina_samplesheet_v2.set_read_field("Index2Cycles", str(self._state_model.index2_cycles))
-        illumina_samplesheet_v2.set_read_field("Read1Cycles", str(self._state_model.read1_cycles))
-        illumina_samplesheet_v2.set_read_field("Read2Cycles", str(self._state_model.read2_cycles))
+        illumina_samplesheet_v2.set_read_field("Index1Cycles", str(run_info.index1_cycles))
+        illumina_samplesheet_v2.set_read_field("Index2Cycles", str(run_info.index2_cycles))
+        illumina_samplesheet_v2.set_read_field("Read1Cycles", str(run_info.read1_cycles))
+        illumina_samplesheet_v2.set_read_field("Read2Cycles", str(run_info.read2_cycles))
 
         illumina_samplesheet_v2.set_sequencing_field("LibraryPrepKits", str(None))
 
-        df_base = self._state_model.sample_df
+        df_base = snapshot.sample_df
 
-        for profile_name in self._state_model.sample_application_profile_ids:
+        # Explode the profiles once and take each profile's rows from the groups
+        profile_exploded_df = df_base.explode("ApplicationProfileId")
+        profile_groups = profile_exploded_df.groupby("ApplicationProfileId", sort=False)
 
-            application_name = self._application_manager.application_profile_to_app(profile_name)
-            settings = self._application_manager.profile_name_to_settings(profile_name)
-            translate = self._application_manager.profile_name_to_translate(profile_name)
+        for profile in snapshot.profiles:
 
-            data_fields = self._application_manager.profile_name_to_data_fields(profile_name)
+            data_fields = profile.data_fields
 
-            exploded_app_df = df_base.explode("ApplicationProfileId")
-            exploded_app_profile_df = exploded_app_df[exploded_app_df["ApplicationProfileId"] == profile_name].copy()
+            if profile.profile_id in profile_groups.groups:
+                exploded_app_profile_df = profile_groups.get_group(profile.profile_id).copy()
+            else:
+                exploded_app_profile_df = profile_exploded_df.iloc[0:0].copy()
 
             if "Lane" in data_fields:
+                # one row per sample and lane, samples without lanes are left out as in SampleSheet v1
                 exploded_app_profile_df = exploded_app_profile_df.explode("Lane")
+                has_lane = exploded_app_profile_df["Lane"].map(is_lane).astype(bool)
+                exploded_app_profile_df = exploded_app_profile_df.loc[has_lane]
 
-            for key, value in self._application_manager.profile_name_to_data(profile_name).items():
+            for key, value in profile.data.items():
                 exploded_app_profile_df[key] = value
 
             if "OverrideCycles" in data_fields:
-                exploded_app_profile_df["OverrideCycles"] = exploded_app_profile_df["OverrideCyclesPattern"].apply(self._override_cycles_model.pattern_to_cycles)
+                exploded_app_profile_df["OverrideCycles"] = \
+                    exploded_app_profile_df["OverrideCyclesPattern"].map(snapshot.override_cycles)
 
             new = [field for field in data_fields if field not in exploded_app_profile_df.columns]
 
             for new_field in new:
                 exploded_app_profile_df[new_field] = None
 
-            df = exploded_app_profile_df[data_fields].copy()
-            if translate:
-                df.rename(columns=translate, inplace=True)
+            df = exploded_app_profile_df[data_fields]
+            if profile.translate:
+                df = df.rename(columns=profile.translate)
 
-            illumina_samplesheet_v2.set_application(application_name, settings, df)
+            illumina_samplesheet_v2.set_application(profile.application_name, profile.settings, df)
 
-        samplesheet_v2_data = illumina_samplesheet_v2.generate()
-        self._state_model.samplesheet_v2 = samplesheet_v2_data
+        return illumina_samplesheet_v2
+
+    @staticmethod
+    def _build_samplesheet_v1(snapshot: ExportSnapshot) -> str:
+        """Build a bcl2fastq style v1 samplesheet, with one data row per sample and lane."""
+        run_info = snapshot.run_info
+
+        samplesheet = IlluminaSampleSheetV1()
+        samplesheet.set_experiment_info(run_info.investigator, run_info.run_name, run_info.run_description)
+        samplesheet.set_header_field("Date", run_info.date)
+
+        if run_info.read2_cycles:
+            samplesheet.set_paired_end_reads(run_info.read1_cycles, run_info.read2_cycles)
+        else:
+            samplesheet.set_single_end_reads(run_info.read1_cycles)
+
+        df = snapshot.sample_df
+        if df.empty:
+            return samplesheet.generate_samplesheet()
+
+        i5_column = "IndexI5RC" if run_info.i5_samplesheet_orientation_bcl2fastq == "rc" else "IndexI5"
+        # one row per sample and lane, samples without lanes are left out
+        lane_df = LanePartition(df).exploded() if "Lane" in df.columns else df
+
+        for record in json_backend.dataframe_records(lane_df):
+            samplesheet.add_sample(
+                sample_id=record.get("Sample_ID") or "",
+                sample_name=record.get("Sample_ID") or "",
+                i7_index_id=record.get("IndexI7Name") or "",
+                index=record.get("IndexI7") or "",
+                i5_index_id=record.get("IndexI5Name") or "",
+                index2=record.get(i5_column) or "",
+                Lane=record.get("Lane") or "",
+            )
 
+        return samplesheet.generate_samplesheet()
 
-    def export_package(self, save_path: Path) -> bool:
-        """Save samplesheet_v2 data to a zip file.
+    @staticmethod
+    def _validation_report(snapshot: ExportSnapshot) -> str:
+        run_info = snapshot.run_info
+
+        lines = [
+            "Validation report",
+            "=================",
+            "",
+            f"Run: {run_info.run_name}",
+            f"UUID: {run_info.uuid}",
+            f"Validated: {run_info.is_validated}",
+            "",
+        ]
+
+        if not snapshot.validation_results:
+            lines.append("No validation results available")
+
+        for result in snapshot.validation_results:
+            lines.append(f"[{result.severity.name}] {result.name}: {result.message}")
+
+        return "\n".join(lines) + "\n"
+
+    def _compression_level(self, entry_name: str) -> int:
+        return int(self._compression_levels.get(entry_name, 6))
+
+    def export_package(self, save_path: Path) -> None:
+        """Build the export package in the background and save it to a zip file.
+
+        SampleSheet v2 and json are taken from the cached export when it matches the
+        generated data, and are otherwise generated from a snapshot in a worker
+        thread, along with SampleSheet v1 and the validation report. Progress is
+        reported through package_progress, the outcome through package_finished
+        or package_failed.
 
         Args:
             save_path: Path where the zip file should be saved
-
-        Returns:
-            bool: True if save was successful, False otherwise
         """
         if not self._state_model.samplesheet_v2:
             self._logger.warning("No samplesheet_v2 data available to save")
-            return False
+            self.package_failed.emit("No samplesheet_v2 data available to save")
+            return
 
         if not self._state_model.json:
             self._logger.warning("No sample json data available to save")
-            return False
-
-        try:
-            save_path = save_path.with_suffix(".zip")
-            # Ensure the save directory exists
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Create a timestamp for the filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            samplesheet_filename = f"SampleSheet_{timestamp}.csv"
-            sample_json_filename = f"SampleJson_{timestamp}.json"
-            readme_filename = "README.txt"
-
-            with zipfile.ZipFile(save_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add the samplesheet as a file in the zip
-                zipf.writestr(samplesheet_filename, self._state_model.samplesheet_v2)
-                zipf.writestr(sample_json_filename, self._state_model.json)
-
-                # Add a README file with metadata
-                readme_content = f"""SampleSheet Package
+            self.package_failed.emit("No sample json data available to save")
+            return
+
+        save_path = save_path.with_suffix(".zip")
+        snapshot = self._snapshot()
+
+        # Create a timestamp for the filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        artifacts = self._artifacts
+        if (artifacts is not None
+                and artifacts.samplesheet_v2 == self._state_model.samplesheet_v2
+                and artifacts.json == self._state_model.json):
+            # The compressed samplesheet and json are kept with the cached export
+            samplesheet_v2_level = self._compression_level("SampleSheetV2")
+            json_level = self._compression_level("Json")
+            samplesheet_v2_source = lambda: artifacts.compressed("samplesheet_v2", samplesheet_v2_level)
+            json_source = lambda: artifacts.compressed("json", json_level)
+        else:
+            samplesheet_v2_source = lambda: self._build_samplesheet_v2(snapshot).generate()
+            json_source = lambda: self._json_text(self._build_json_data(snapshot))
+
+        # Add a README file with metadata
+        readme_content = f"""SampleSheet Package
     =================
 
     Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-    Run: {self._state_model.run_name}
-    Instrument: {self._state_model.instrument}
+    Run: {snapshot.run_info.run_name}
+    Instrument: {snapshot.run_info.instrument}
     """
-                zipf.writestr(readme_filename, readme_content)
 
-            self._logger.info(f"Successfully saved package to {save_path}")
-            return True
+        entries = [
+            PackageEntry(f"SampleSheet_{timestamp}.csv", samplesheet_v2_source,
+                         self._compression_level("SampleSheetV2")),
+            PackageEntry(f"SampleSheetV1_{timestamp}.csv", lambda: self._build_samplesheet_v1(snapshot),
+                         self._compression_level("SampleSheetV1")),
+            PackageEntry(f"SampleJson_{timestamp}.json", json_source,
+                         self._compression_level("Json")),
+            PackageEntry(f"ValidationReport_{timestamp}.txt", lambda: self._validation_report(snapshot),
+                         self._compression_level("ValidationReport")),
+            PackageEntry("README.txt", readme_content, self._compression_level("Readme")),
+        ]
 
-        except Exception as e:
-            self._logger.error(f"Failed to save package: {str(e)}")
-            return False
+        self._package_builder.build(save_path, entries)
 
     def export_samplesheet_v2(self, path: Path):
+        """Stream the generated samplesheet_v2 to a csv file.
+
+        The file is written from the builder, but generate still keeps the whole
+        text in StateModel.samplesheet_v2 for the export preview, so peak memory
+        is that of the full sheet.
+
+        Args:
+            path: Path of the file, the suffix is set to .csv
+        """
         path = path.with_suffix(".csv")
-        path.write_text(self._state_model.samplesheet_v2)
+
+        if self._samplesheet_v2_builder is None:
+            path.write_text(self._state_model.samplesheet_v2)
+            return
+
+        with path.open("w", newline="") as fh:
+            self._samplesheet_v2_builder.write(fh)
 
     def export_json(self, path: Path):
+        """Stream the generated sample json to a file, one sample record at a time.
+
+        Args:
+            path: Path of the file, the suffix is set to .json
+        """
         path = path.with_suffix(".json")
-        path.write_text(self._state_model.json)
+
+        if self._json_data is None:
+            path.write_text(self._state_model.json)
+            return
+
+        run_info_dict, df = self._json_data
+        with path.open("wb") as fh:
+            json_backend.write_document(fh, {"run_info": run_info_dict}, "samples",
+                                        json_backend.dataframe_records(df))
 
 
 # class MakeJson(QObject):
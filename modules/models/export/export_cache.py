@@ -0,0 +1,90 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from modules.models.export.samplesheet_v2.samplesheet_v2 import IlluminaSampleSheetV2
+from modules.models.export.zip_writer import CompressedEntry, compress_entry
+from modules.utils import json_backend
+
+# RunInfo fields that hold generated output, not input to the export. The status
+# fields is_validated and file_data_generated are exported in the json, so they
+# are part of the key.
+_NON_KEY_FIELDS = ("samplesheet_v2", "json")
+
+
+@dataclass
+class ExportArtifacts:
+    """The generated export files for one state of the run info and samples.
+
+    Compressed zip entries are made on first use and kept, so packages exported
+    from the same artifacts only compress each file once.
+    """
+    samplesheet_v2: str
+    samplesheet_v2_builder: IlluminaSampleSheetV2
+    json: str
+    json_data: Tuple[dict, pd.DataFrame]
+    _compressed: Dict[Tuple[str, int], CompressedEntry] = field(default_factory=dict, repr=False)
+
+    def compressed(self, name: str, level: int = 6) -> CompressedEntry:
+        """Return the compressed zip entry of an artifact.
+
+        Args:
+            name: Name of the text attribute, "samplesheet_v2" or "json".
+            level: zlib compression level.
+
+        Returns:
+            The compressed entry, shared between calls with the same arguments.
+        """
+        key = (name, level)
+        entry = self._compressed.get(key)
+        if entry is None:
+            entry = compress_entry(getattr(self, name), level)
+            self._compressed[key] = entry
+        return entry
+
+
+class ExportCache:
+    """LRU cache of export artifacts keyed by a content hash of their inputs."""
+
+    def __init__(self, max_entries: int = 4):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, ExportArtifacts]" = OrderedDict()
+
+    @staticmethod
+    def key(run_info: Any, sample_generation: int, profile_versions: Dict[str, Any]) -> str:
+        """Hash the inputs of an export.
+
+        Args:
+            run_info: The RunInfo dataclass.
+            sample_generation: Generation of the sample model the samples were read at.
+            profile_versions: Application profile id to profile version, for the profiles in use.
+
+        Returns:
+            Hex digest identifying the export content.
+        """
+        run_info_dict = asdict(run_info)
+        for name in _NON_KEY_FIELDS:
+            run_info_dict.pop(name, None)
+
+        versions = sorted((str(profile), str(version)) for profile, version in profile_versions.items())
+        payload = json_backend.dumpb([run_info_dict, sample_generation, versions])
+
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[ExportArtifacts]:
+        artifacts = self._entries.get(key)
+        if artifacts is not None:
+            self._entries.move_to_end(key)
+        return artifacts
+
+    def put(self, key: str, artifacts: ExportArtifacts) -> None:
+        self._entries[key] = artifacts
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Callable, List, Union
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from modules.models.export.zip_writer import CompressedEntry, compress_entry, write_zip
+
+EntrySource = Union[str, bytes, CompressedEntry, Callable[[], Union[str, bytes, CompressedEntry]]]
+
+
+@dataclass
+class PackageEntry:
+    """An entry of the package archive.
+
+    The source is either the entry content, an already compressed entry, or a
+    callable returning one of those. Callables run in a worker thread, so they
+    must only use data snapshotted on the GUI thread.
+    """
+    filename: str
+    source: EntrySource
+    level: int = 6
+
+
+def _compressed_entry(entry: PackageEntry) -> CompressedEntry:
+    content = entry.source() if callable(entry.source) else entry.source
+    if isinstance(content, CompressedEntry):
+        return content
+    return compress_entry(content, entry.level)
+
+
+class PackageBuilderSignals(QObject):
+    """Signals emitted by a package job."""
+    progress = Signal(int, int, str)  # done, total, message
+    finished = Signal(object)         # path of the written package
+    error = Signal(str)
+
+
+class PackageJob(QRunnable):
+    """Build, compress and write the entries of a package archive.
+
+    Entries are built and compressed concurrently on a thread pool of their own.
+    zlib releases the GIL while compressing, so compression of the entries runs
+    in parallel. The archive is written to a temporary file that replaces the
+    target once complete.
+    """
+    def __init__(self, save_path: Path, entries: List[PackageEntry], workers: int):
+        super().__init__()
+        self.save_path = save_path
+        self.entries = entries
+        self.workers = max(1, workers)
+        self.signals = PackageBuilderSignals()
+        self.setAutoDelete(True)
+
+    @Slot()
+    def run(self) -> None:
+        # one step per entry and one for writing the archive
+        total = len(self.entries) + 1
+        temp_path = self.save_path.with_name(self.save_path.name + ".part")
+
+        try:
+            compressed: List[CompressedEntry] = [None] * len(self.entries)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {
+                    executor.submit(_compressed_entry, entry): i
+                    for i, entry in enumerate(self.entries)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    compressed[i] = future.result()
+                    self.signals.progress.emit(done, total, f"Packaged {self.entries[i].filename}")
+
+            self.save_path.parent.mkdir(parents=True, exist_ok=True)
+            with temp_path.open("wb") as fh:
+                write_zip(fh, [(entry.filename, data) for entry, data in zip(self.entries, compressed)])
+            temp_path.replace(self.save_path)
+
+            self.signals.progress.emit(total, total, f"Saved package {self.save_path.name}")
+            self.signals.finished.emit(self.save_path)
+
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            self.signals.error.emit(str(e))
+
+
+class PackageBuilder(QObject):
+    """Builds export packages off the GUI thread, one package at a time."""
+
+    progress = Signal(int, int, str)  # done, total, message
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, logger: Logger, workers: int = 4):
+        super().__init__()
+        self._logger = logger
+        self._workers = workers
+
+        # own pool with a single thread, so packages are written in the order requested
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    def build(self, save_path: Path, entries: List[PackageEntry]) -> None:
+        """Start building a package in the background.
+
+        Args:
+            save_path: Path of the zip archive
+            entries: The archive entries, in archive order
+        """
+        job = PackageJob(save_path, entries, self._workers)
+        job.signals.progress.connect(self.progress)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.error.connect(self._on_error)
+
+        self.progress.emit(0, len(entries) + 1, f"Building package {save_path.name}")
+        self._pool.start(job)
+
+    @Slot(object)
+    def _on_finished(self, save_path: Path) -> None:
+        self._logger.info(f"Successfully saved package to {save_path}")
+        self.finished.emit(save_path)
+
+    @Slot(str)
+    def _on_error(self, message: str) -> None:
+        self._logger.error(f"Failed to save package: {message}")
+        self.progress.emit(1, 1, "Package export failed")
+        self.failed.emit(message)
@@ -1,3 +1,7 @@
+import csv
+import io
+from typing import TextIO
+
 import pandas as pd
 
 
@@ -68,40 +72,47 @@ class IlluminaSampleSheetV2:
 
         self._applications.append(application)
 
-    def generate(self) -> str:
-
-        rows = list()
-
-        rows.append('[Header]')
-        for key, value in self._header.items():
-            rows.append(f'{key},{value}')
-        rows.append('')
-
-        rows.append('[Reads]')
-        for key, value in self._reads.items():
-            rows.append(f'{key},{value}')
-        rows.append('')
-
-        rows.append('[Sequencing]')
-        for key, value in self._sequencing.items():
-            rows.append(f'{key},{value}')
-        rows.append('')
+    @staticmethod
+    def _write_key_values(writer, section_name: str, values: dict) -> None:
+        writer.writerow([f'[{section_name}]'])
+        for key, value in values.items():
+            writer.writerow([key, value])
+
+    @staticmethod
+    def _write_data(writer, section_name: str, data: pd.DataFrame) -> None:
+        writer.writerow([f'[{section_name}]'])
+        writer.writerow(data.columns)
+        # csv writes None as an empty field, like DataFrame.to_csv does for NA
+        writer.writerows(data.astype(object).where(data.notna(), None).itertuples(index=False, name=None))
+
+    def write(self, fh: TextIO) -> None:
+        """
+        Write the sample sheet section by section to a text file-like object.
+
+        Rows are written with the csv module as they are produced, so no copy of
+        the full sample sheet is built in memory. Files should be opened with
+        newline=''.
+
+        Args:
+            fh: The file-like object to write to.
+        """
+        writer = csv.writer(fh, lineterminator='\n')
+
+        self._write_key_values(writer, 'Header', self._header)
+        fh.write('\n')
+        self._write_key_values(writer, 'Reads', self._reads)
+        fh.write('\n')
+        self._write_key_values(writer, 'Sequencing', self._sequencing)
 
         for application in self._applications:
-
             application_name = application.get('ApplicationName')
-            settings_name = f'{application_name}_Settings'
-            data_name = f'{application_name}_Data'
-
-            rows.append(f'[{settings_name}]')
-            for key, value in application.get('Settings').items():
-                rows.append(f'{key},{value}')
-            rows.append('')
 
-            rows.append(f'[{data_name}]')
-            for row in application.get('Data').to_csv(index=False).splitlines():
-                rows.append(row)
-            rows.append('')
+            fh.write('\n')
+            self._write_key_values(writer, f'{application_name}_Settings', application.get('Settings'))
+            fh.write('\n')
+            self._write_data(writer, f'{application_name}_Data', application.get('Data'))
 
-
-        return '\n'.join(rows)
+    def generate(self) -> str:
+        buffer = io.StringIO()
+        self.write(buffer)
+        return buffer.getvalue()
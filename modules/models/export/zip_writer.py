@@ -0,0 +1,114 @@
+"""
+Minimal zip archive writer for entries that are compressed ahead of time.
+
+zipfile compresses an entry while it is written, so the compressed bytes can
+not be reused for the next archive. Here each entry is deflated once into a
+CompressedEntry, and an archive is assembled from the stored bytes, leaving only
+the headers to be written per archive.
+"""
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Optional, Tuple, Union
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+_VERSION = 20
+_VERSION_MADE_BY = (3 << 8) | _VERSION  # unix, so the file mode in the external attributes is used
+_UTF8_NAMES = 0x800
+_FILE_MODE = 0o100644 << 16
+_MAX_SIZE = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+
+
+@dataclass(frozen=True)
+class CompressedEntry:
+    """The stored bytes of a zip entry with the values its headers need."""
+    data: bytes
+    crc: int
+    size: int
+    method: int
+
+
+def compress_entry(content: Union[str, bytes], level: int = 6) -> CompressedEntry:
+    """Compress content into an entry that can be written to any number of archives.
+
+    Args:
+        content: The entry content, str is encoded as UTF-8.
+        level: zlib compression level, 0 stores the content uncompressed.
+
+    Returns:
+        The compressed entry.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    if len(content) > _MAX_SIZE:
+        raise ValueError("zip entries larger than 4 GiB are not supported")
+
+    crc = zlib.crc32(content) & _MAX_SIZE
+
+    if level == 0:
+        return CompressedEntry(content, crc, len(content), ZIP_STORED)
+
+    # negative window bits give a raw deflate stream, without the zlib header and checksum
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = compressor.compress(content) + compressor.flush()
+    return CompressedEntry(data, crc, len(content), ZIP_DEFLATED)
+
+
+def _dos_date_time(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_date, dos_time
+
+
+def write_zip(fh: BinaryIO, entries: Iterable[Tuple[str, CompressedEntry]],
+              timestamp: Optional[float] = None) -> None:
+    """Write a zip archive holding the given compressed entries.
+
+    Args:
+        fh: Binary file-like object to write to.
+        entries: Pairs of archive name and compressed entry, in archive order.
+        timestamp: Modification time of the entries, defaults to now.
+    """
+    dos_date, dos_time = _dos_date_time(time.time() if timestamp is None else timestamp)
+
+    central_directory = []
+    offset = 0
+
+    for name, entry in entries:
+        filename = name.encode("utf-8")
+
+        local_header = _LOCAL_HEADER.pack(
+            b"PK\x03\x04", _VERSION, _UTF8_NAMES, entry.method, dos_time, dos_date,
+            entry.crc, len(entry.data), entry.size, len(filename), 0
+        )
+        fh.write(local_header)
+        fh.write(filename)
+        fh.write(entry.data)
+
+        central_directory.append(_CENTRAL_HEADER.pack(
+            b"PK\x01\x02", _VERSION_MADE_BY, _VERSION, _UTF8_NAMES, entry.method, dos_time, dos_date,
+            entry.crc, len(entry.data), entry.size, len(filename), 0, 0, 0, 0, _FILE_MODE, offset
+        ) + filename)
+
+        offset += len(local_header) + len(filename) + len(entry.data)
+        if offset > _MAX_SIZE:
+            raise ValueError("zip archives larger than 4 GiB are not supported")
+
+    central_directory_size = 0
+    for header in central_directory:
+        fh.write(header)
+        central_directory_size += len(header)
+
+    count = len(central_directory)
+    fh.write(_END_OF_CENTRAL_DIRECTORY.pack(
+        b"PK\x05\x06", 0, 0, count, count, central_directory_size, offset, 0
+    ))
@@ -1,7 +1,12 @@
+import numpy as np
 from PySide6.QtCore import QSortFilterProxyModel, Qt
 
 
 class AllColumnFilterProxyModel(QSortFilterProxyModel):
+    # Separates column values in a row's search key so a filter text can
+    # never match across the boundary between two columns.
+    _KEY_SEPARATOR = "\x1f"
+
     def __init__(self, filter_columns=None):
         """
         Initialize the proxy model with optional filter columns.
@@ -14,9 +19,41 @@ class AllColumnFilterProxyModel(QSortFilterProxyModel):
         self.filter_text = ""
         self.filter_columns = filter_columns or []
 
+        # One lowercase search key per source row and the boolean mask of
+        # accepted rows for the current filter text.
+        self._search_keys = np.array([], dtype=np.str_)
+        self._accepted_rows = np.array([], dtype=bool)
+
+    def setSourceModel(self, source_model):
+        """Set the source model and build the search keys for its rows."""
+        old_model = self.sourceModel()
+        if old_model is not None:
+            old_model.dataChanged.disconnect(self._on_source_data_changed)
+            for signal in self._source_structure_signals(old_model):
+                signal.disconnect(self._on_source_changed)
+
+        super().setSourceModel(source_model)
+
+        if source_model is not None:
+            source_model.dataChanged.connect(self._on_source_data_changed)
+            for signal in self._source_structure_signals(source_model):
+                signal.connect(self._on_source_changed)
+
+        self._rebuild_search_keys()
+
+    @staticmethod
+    def _source_structure_signals(model):
+        return (
+            model.modelReset,
+            model.rowsInserted,
+            model.rowsRemoved,
+            model.layoutChanged,
+        )
+
     def set_filter_text(self, text):
         """Set the filter text and trigger a filter update."""
         self.filter_text = text.strip().lower()
+        self._update_accepted_rows()
         self.invalidateFilter()
 
     def set_filter_columns(self, columns):
@@ -27,8 +64,96 @@ class AllColumnFilterProxyModel(QSortFilterProxyModel):
             columns (list): List of column names to filter on.
         """
         self.filter_columns = columns
+        self._rebuild_search_keys()
+        self.invalidateFilter()
+
+    def _on_source_changed(self, *args):
+        # the proxy has already filtered the changed rows against the old keys
+        self._rebuild_search_keys()
         self.invalidateFilter()
 
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        """Rebuild the search keys of the changed rows only."""
+        model = self.sourceModel()
+        if model is None or self._search_keys.size != model.rowCount():
+            self._on_source_changed()
+            return
+
+        top, bottom = top_left.row(), bottom_right.row()
+        if top < 0 or bottom < top:
+            return
+
+        keys = self._search_keys_for_rows(model, top, bottom + 1)
+
+        # widen the fixed width string array if a new key does not fit
+        width = max((len(key) for key in keys), default=0)
+        if width > self._search_keys.dtype.itemsize // np.dtype("<U1").itemsize:
+            self._search_keys = self._search_keys.astype(f"<U{width}")
+        self._search_keys[top:bottom + 1] = keys
+
+        previous = self._accepted_rows[top:bottom + 1].copy()
+        self._update_accepted_rows()
+        if not np.array_equal(previous, self._accepted_rows[top:bottom + 1]):
+            self.invalidateFilter()
+
+    def _rebuild_search_keys(self):
+        """
+        Precompute one lowercase, concatenated search key per source row.
+
+        Only columns in filter_columns (or all columns if none are given) are
+        part of the key. Keys are rebuilt when the source model changes, so a
+        keystroke in the filter box only has to evaluate a vectorized mask.
+        """
+        model = self.sourceModel()
+        if model is None:
+            self._search_keys = np.array([], dtype=np.str_)
+            self._update_accepted_rows()
+            return
+
+        keys = self._search_keys_for_rows(model, 0, model.rowCount())
+
+        self._search_keys = np.array(keys, dtype=np.str_)
+        self._update_accepted_rows()
+
+    def _search_keys_for_rows(self, model, start, stop):
+        # models backed by a dataframe that expose their display conversion
+        # are keyed column-wise, others through data() one cell at a time
+        dataframe = getattr(model, "dataframe", None)
+        display_text = getattr(model, "display_text", None)
+        if dataframe is not None and display_text is not None:
+            return self._search_keys_from_dataframe(dataframe.iloc[start:stop], display_text)
+        return self._search_keys_from_model(model, range(start, stop))
+
+    def _search_keys_from_dataframe(self, dataframe, display_text):
+        columns = [col for col in dataframe.columns
+                   if not self.filter_columns or str(col) in self.filter_columns]
+        if dataframe.empty or not columns:
+            return [""] * len(dataframe)
+
+        # to_numpy keeps the column's own scalars (e.g. float32), as data() sees them
+        texts = [[display_text(value) for value in dataframe[col].to_numpy()] for col in columns]
+        return [self._KEY_SEPARATOR.join(row).lower() for row in zip(*texts)]
+
+    def _search_keys_from_model(self, model, rows):
+        columns = [
+            column for column in range(model.columnCount())
+            if not self.filter_columns
+            or model.headerData(column, Qt.Horizontal, Qt.DisplayRole) in self.filter_columns
+        ]
+
+        keys = []
+        for row in rows:
+            values = (model.data(model.index(row, column), Qt.DisplayRole) for column in columns)
+            keys.append(self._KEY_SEPARATOR.join(str(value).lower() for value in values))
+        return keys
+
+    def _update_accepted_rows(self):
+        if not self.filter_text or self._search_keys.size == 0:
+            self._accepted_rows = np.ones(self._search_keys.size, dtype=bool)
+            return
+
+        self._accepted_rows = np.char.find(self._search_keys, self.filter_text) >= 0
+
     def filterAcceptsRow(self, source_row, source_parent):
         """
         Determine if the row should be included based on the filter.
@@ -36,19 +161,8 @@ class AllColumnFilterProxyModel(QSortFilterProxyModel):
         """
         if not self.filter_text:
             return True
-            
-        model = self.sourceModel()
-        
-        for column in range(model.columnCount()):
-            # Skip columns not in filter_columns if filter_columns is specified
-            if self.filter_columns:
-                header = model.headerData(column, Qt.Horizontal, Qt.DisplayRole)
-                if header not in self.filter_columns:
-                    continue
-                    
-            index = model.index(source_row, column, source_parent)
-            data = model.data(index, Qt.DisplayRole)
-            if self.filter_text in str(data).lower():
-                return True
-                
-        return False
+
+        if source_row >= self._accepted_rows.size:
+            return False
+
+        return bool(self._accepted_rows[source_row])
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QByteArray, QDataStream, QIODevice
+
+INDEX_COLUMNS_MIME_TYPE = "application/x-samplesheet-index-columns"
+INDEX_JSON_MIME_TYPE = "application/json"
+
+_PAYLOAD_VERSION = 1
+
+
+def encode_index_columns(columns: Dict[str, List[str]]) -> QByteArray:
+    """Encode column-oriented index data into a compact binary drag payload.
+
+    The payload holds a version, the row and column counts, and then each
+    column as its name followed by its values, so a drop target can write
+    whole column slices without building per-row records.
+
+    Args:
+        columns: Mapping of column name to a list of string values. All lists
+            must have the same length.
+
+    Returns:
+        The encoded payload.
+    """
+    row_count = len(next(iter(columns.values()))) if columns else 0
+
+    payload = QByteArray()
+    stream = QDataStream(payload, QIODevice.WriteOnly)
+    stream.writeInt32(_PAYLOAD_VERSION)
+    stream.writeInt32(row_count)
+    stream.writeInt32(len(columns))
+
+    for name, values in columns.items():
+        stream.writeQString(str(name))
+        for value in values:
+            stream.writeQString(value)
+
+    return payload
+
+
+def decode_index_columns(payload) -> Optional[Dict[str, List[str]]]:
+    """Decode a payload created by encode_index_columns.
+
+    Args:
+        payload: The QByteArray (or bytes) read from the mime data.
+
+    Returns:
+        Mapping of column name to list of string values, or None if the
+        payload has an unknown version or is truncated.
+    """
+    stream = QDataStream(QByteArray(payload), QIODevice.ReadOnly)
+
+    if stream.readInt32() != _PAYLOAD_VERSION:
+        return None
+
+    row_count = stream.readInt32()
+    column_count = stream.readInt32()
+
+    columns = {}
+    for _ in range(column_count):
+        name = stream.readQString()
+        columns[name] = [stream.readQString() for _ in range(row_count)]
+
+    if stream.status() != QDataStream.Ok:
+        return None
+
+    return columns
+
+
+def records_to_columns(records: List[dict]) -> Dict[str, List[str]]:
+    """Convert JSON drag records into the column-oriented form.
+
+    Args:
+        records: List of row dictionaries as found in the JSON payload.
+
+    Returns:
+        Mapping of column name to a list of string values, with missing and
+        null values as empty strings.
+    """
+    names = dict.fromkeys(key for record in records for key in record)
+
+    return {
+        name: ["" if record.get(name) is None else str(record.get(name)) for record in records]
+        for name in names
+    }
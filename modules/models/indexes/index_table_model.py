@@ -5,6 +5,12 @@ import pandas as pd
 from PySide6.QtCore import QAbstractTableModel, Qt, QMimeData, QModelIndex, QObject
 from PySide6.QtCore import QPersistentModelIndex
 
+from modules.models.indexes.index_mime import (
+    INDEX_COLUMNS_MIME_TYPE,
+    INDEX_JSON_MIME_TYPE,
+    encode_index_columns,
+)
+
 
 class IndexTableModel(QAbstractTableModel):
     """A table model for displaying and interacting with index kit data.
@@ -53,13 +59,19 @@ class IndexTableModel(QAbstractTableModel):
             
         if role == Qt.DisplayRole or role == Qt.EditRole:
             try:
-                value = self._dataframe.iat[index.row(), index.column()]
-                return str(value) if pd.notna(value) else ""
+                return self.display_text(self._dataframe.iat[index.row(), index.column()])
             except (IndexError, KeyError):
                 return None
                 
         return None
 
+    @staticmethod
+    def display_text(value: Any) -> str:
+        """Return the text shown for a cell value, empty for missing values."""
+        if pd.api.types.is_scalar(value) and pd.isna(value):
+            return ""
+        return str(value)
+
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """Return the number of rows in the model.
         
@@ -135,48 +147,54 @@ class IndexTableModel(QAbstractTableModel):
         row_indexes: Set[int] = {index.row() for index in indexes if index.isValid()}
         return sorted(row_indexes)
 
+    def mimeTypes(self) -> List[str]:
+        """Return the mime types produced by mimeData."""
+        return [INDEX_COLUMNS_MIME_TYPE, INDEX_JSON_MIME_TYPE]
+
+    def selected_columns(self, rows: List[int]) -> Dict[str, List[str]]:
+        """Extract the given rows as column-oriented string lists.
+
+        Args:
+            rows: Row numbers to extract.
+
+        Returns:
+            Mapping of column name to the string values of the rows, with
+            missing values as empty strings.
+        """
+        subset = self._dataframe.iloc[rows]
+        return {
+            str(col): subset[col].astype(object).where(subset[col].notna(), "").astype(str).tolist()
+            for col in subset.columns
+        }
+
     def mimeData(self, indexes: List[QModelIndex]) -> Optional[QMimeData]:
-        """Generate a QMimeData object containing the selected data in JSON format.
-        
+        """Generate a QMimeData object containing the selected rows.
+
+        The rows are stored column-oriented in a compact binary payload, with
+        a JSON list of records as fallback for drop targets that only accept
+        JSON.
+
         Args:
             indexes: List of QModelIndex objects representing the selected items.
-            
+
         Returns:
-            A QMimeData object containing the selected data as JSON, or None if no valid indexes.
+            A QMimeData object containing the selected data, or None if no valid indexes.
         """
         if not indexes:
             return None
-            
+
         try:
             rows = self.indexes_to_rows(indexes)
             if not rows:
                 return None
-                
-            # Create a DataFrame with only the selected rows
-            df = self._dataframe.iloc[rows].copy()
-            
-            # Convert to list of dicts and handle non-serializable types
-            records = []
-            for _, row in df.iterrows():
-                record = {}
-                for col in df.columns:
-                    val = row[col]
-                    # Convert non-serializable types to strings
-                    if pd.isna(val):
-                        record[col] = None
-                    elif isinstance(val, (pd.Timestamp, pd.Timedelta)):
-                        record[col] = str(val)
-                    else:
-                        record[col] = val
-                records.append(record)
-            
-            # Convert to JSON
-            json_data = json.dumps(records, default=str)
-            
-            # Create and return MIME data
+
+            columns = self.selected_columns(rows)
+            records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
             mime_data = QMimeData()
-            mime_data.setData("application/json", json_data.encode('utf-8'))
+            mime_data.setData(INDEX_COLUMNS_MIME_TYPE, encode_index_columns(columns))
+            mime_data.setData(INDEX_JSON_MIME_TYPE, json.dumps(records).encode('utf-8'))
             return mime_data
-            
+
         except Exception as e:
             return None
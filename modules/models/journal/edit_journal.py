@@ -0,0 +1,405 @@
+import os
+import threading
+from dataclasses import asdict
+from logging import Logger
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QLockFile, QObject, QRunnable, QStandardPaths, QThreadPool, QTimer, Slot
+
+from modules.models.sample.sample_model import SampleModel
+from modules.models.state.state_model import StateModel
+from modules.utils import json_backend
+
+Cell = Tuple[int, int]  # row, column
+
+# generated output and status flags, they are set again by generating and validating after a recovery
+_UNJOURNALED_FIELDS = ("samplesheet_v2", "json", "file_data_generated", "is_validated")
+
+
+def _journaled_run_info(run_info: dict) -> dict:
+    return {key: value for key, value in run_info.items() if key not in _UNJOURNALED_FIELDS}
+
+
+def replay(snapshot: Optional[dict], records: List[dict]) -> Tuple[int, Dict[Cell, str], dict]:
+    """Apply journal records to a snapshot.
+
+    Records with a sequence number covered by the snapshot are skipped, so a
+    journal that was not truncated after a compaction replays correctly.
+
+    Args:
+        snapshot: The compacted snapshot, None if there is none
+        records: The decoded journal records in order
+
+    Returns:
+        The row count, the non-empty cell texts and the run info fields
+    """
+    snapshot = snapshot or {}
+    seq = snapshot.get("seq", -1)
+    row_count = snapshot.get("row_count", 0)
+    cells = {(row, column): text for row, column, text in snapshot.get("cells", [])}
+    run_info = dict(snapshot.get("run_info", {}))
+
+    for record in records:
+        if record.get("seq", -1) <= seq:
+            continue
+
+        op = record.get("op")
+        if op == "cells":
+            for row, column, text in record["cells"]:
+                if text:
+                    cells[(row, column)] = text
+                else:
+                    cells.pop((row, column), None)
+        elif op == "insert":
+            cells = _shift_rows(cells, record["row"], record["count"])
+            row_count += record["count"]
+        elif op == "remove":
+            cells = _shift_rows(cells, record["row"], -record["count"])
+            row_count -= record["count"]
+        elif op == "resize":
+            row_count = record["count"]
+            cells = {cell: text for cell, text in cells.items() if cell[0] < row_count}
+        elif op == "run_info":
+            run_info.update(record["data"])
+
+    return row_count, cells, run_info
+
+
+def _shift_rows(cells: Dict[Cell, str], first: int, count: int) -> Dict[Cell, str]:
+    """Move the cells at or after first by count rows, dropping removed rows when count is negative."""
+    shifted = {}
+    for (row, column), text in cells.items():
+        if row < first:
+            shifted[(row, column)] = text
+        elif count > 0:
+            shifted[(row + count, column)] = text
+        elif row >= first - count:
+            shifted[(row + count, column)] = text
+    return shifted
+
+
+class _JournalFile:
+    """The journal and snapshot files, written by one thread at a time."""
+
+    def __init__(self, journal_path: Path, snapshot_path: Path):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def append(self, data: bytes) -> None:
+        """Append encoded records and fsync them."""
+        with self._lock:
+            if self._fh is None:
+                self._fh = open(self.journal_path, "ab")
+            self._fh.write(data)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def compact(self, snapshot: bytes) -> None:
+        """Atomically replace the snapshot, then truncate the journal it covers."""
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with self._lock:
+            with open(tmp_path, "wb") as fh:
+                fh.write(snapshot)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            if self._fh is not None:
+                self._fh.close()
+            self._fh = open(self.journal_path, "wb")
+            os.fsync(self._fh.fileno())
+
+    def discard(self) -> None:
+        """Close and delete the files."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            for path in (self.journal_path, self.snapshot_path):
+                path.unlink(missing_ok=True)
+
+
+class _JournalJob(QRunnable):
+    def __init__(self, fn, logger: Logger):
+        super().__init__()
+        self._fn = fn
+        self._logger = logger
+
+    def run(self):
+        try:
+            self._fn()
+        except OSError as e:
+            self._logger.error(f"Edit journal write failed: {e}")
+
+
+class EditJournal(QObject):
+    """Append-only journal of sample cell edits and run info changes, for crash recovery.
+
+    Model changes only mark the changed ranges dirty. Every FLUSH_INTERVAL_MS
+    the dirty cells are compared against the journaled texts and the changed
+    ones are written as one record, the writing and fsync run on a single
+    writer thread. After COMPACT_RECORDS records the current state is written
+    as a snapshot and the journal is truncated.
+
+    Files live in journal_dir, by default in the per-user application data
+    directory: snapshot.json holds the compacted state and journal.jsonl one
+    JSON record per line, each with a sequence number. journal.lock keeps a
+    second instance from using the same journal, that instance runs without one.
+    """
+
+    FLUSH_INTERVAL_MS = 1000
+    COMPACT_RECORDS = 2000
+
+    SNAPSHOT_VERSION = 2
+
+    def __init__(self, sample_model: SampleModel, state_model: StateModel, logger: Logger,
+                 journal_dir: Optional[Path] = None):
+        super().__init__()
+
+        self._sample_model = sample_model
+        self._state_model = state_model
+        self._logger = logger
+
+        if journal_dir is None:
+            journal_dir = Path(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)) / "journal"
+        path = Path(journal_dir).absolute()
+        path.mkdir(parents=True, exist_ok=True)
+        self._file = _JournalFile(path / "journal.jsonl", path / "snapshot.json")
+
+        # a lock is only stale once its process is gone, not after a timeout
+        self._lock_file = QLockFile(str(path / "journal.lock"))
+        self._lock_file.setStaleLockTime(0)
+        self._locked = self._lock_file.tryLock(0)
+        if not self._locked:
+            self._logger.warning(f"Edit journal in {path} is used by another instance, "
+                                 f"edits are not journaled")
+
+        # one writer thread keeps the appends and compactions in order
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # journaled state, the cells hold non-empty texts only
+        self._cells: Dict[Cell, str] = {}
+        self._row_count = 0
+        self._run_info: dict = {}
+
+        self._dirty: List[Tuple[int, int, int, int]] = []
+        self._buffer: List[bytes] = []
+        self._seq = 0
+        self._records_since_compact = 0
+        self._started = False
+
+    def recover(self) -> bool:
+        """Restore the sample data and run info from the snapshot and journal of a crashed session.
+
+        Must run before start().
+
+        Returns:
+            bool: True if any state was recovered.
+        """
+        if not self._locked:
+            return False
+
+        snapshot = None
+        if self._file.snapshot_path.exists():
+            try:
+                snapshot = json_backend.loads(self._file.snapshot_path.read_bytes())
+            except ValueError as e:
+                self._logger.warning(f"Ignoring unreadable journal snapshot: {e}")
+
+        if snapshot is not None and snapshot.get("version") != self.SNAPSHOT_VERSION:
+            # the records continue the snapshot, so neither can be used
+            self._logger.warning(f"Ignoring journal of snapshot version {snapshot.get('version')}")
+            return False
+
+        records = self._read_records()
+        if snapshot is None and not records:
+            return False
+
+        row_count, cells, run_info = replay(snapshot, records)
+        cells = self._map_columns(cells, (snapshot or {}).get("columns"))
+        run_info = _journaled_run_info(run_info)
+        if not cells and run_info.items() <= _journaled_run_info(asdict(self._state_model.run_info)).items():
+            return False
+
+        self._seq = max([(snapshot or {}).get("seq", -1)] + [r.get("seq", -1) for r in records]) + 1
+
+        model = self._sample_model
+        if row_count > model.rowCount():
+            model.setRowCount(row_count)
+        model.write_cells(((row, column, text) for (row, column), text in cells.items()), undo_text=None)
+
+        # taken as journaled, with the dependent fields of the crashed session
+        if run_info:
+            self._state_model.load_run_info(run_info)
+
+        self._logger.info(f"Recovered {len(cells)} sample cells from the edit journal")
+        return True
+
+    def _read_records(self) -> List[dict]:
+        if not self._file.journal_path.exists():
+            return []
+
+        records = []
+        with open(self._file.journal_path, "rb") as fh:
+            for line in fh:
+                try:
+                    records.append(json_backend.loads(line))
+                except ValueError:
+                    # a torn last line from the crash, the records before it are complete
+                    break
+        return records
+
+    def _map_columns(self, cells: Dict[Cell, str], columns: Optional[list]) -> Dict[Cell, str]:
+        """Map the snapshot column order onto the current sample fields."""
+        fields = self._sample_model.fields
+        if not columns or list(columns) == list(fields):
+            return cells
+
+        column_map = {i: fields.index(name) for i, name in enumerate(columns) if name in fields}
+        return {(row, column_map[column]): text
+                for (row, column), text in cells.items() if column in column_map}
+
+    def start(self) -> None:
+        """Take a snapshot of the current state and start journaling changes."""
+        if not self._locked:
+            return
+
+        model = self._sample_model
+        self._row_count = model.rowCount()
+        self._cells = {}
+        self._read_cells(0, 0, self._row_count - 1, model.columnCount() - 1)
+        self._run_info = _journaled_run_info(asdict(self._state_model.run_info))
+
+        model.dataChanged.connect(self._on_data_changed)
+        model.rowsAboutToBeInserted.connect(self._collect)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._collect)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelReset.connect(self._on_model_reset)
+        self._state_model.state_changed.connect(self._on_state_changed)
+
+        self._started = True
+        self._compact()
+
+    @Slot(dict)
+    def _on_state_changed(self, changes: dict) -> None:
+        """Journal the changed run info fields, from the run setup or an opened project."""
+        data = _journaled_run_info(changes)
+        if not self._started or not data:
+            return
+        self._collect()
+        self._run_info.update(data)
+        self._append({"op": "run_info", "data": data})
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        # only remember the range, the cells are read when the journal is flushed
+        self._dirty.append((top_left.row(), top_left.column(), bottom_right.row(), bottom_right.column()))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _on_rows_inserted(self, parent, first, last):
+        count = last - first + 1
+        self._cells = _shift_rows(self._cells, first, count)
+        self._row_count += count
+        self._append({"op": "insert", "row": first, "count": count})
+        self._dirty.append((first, 0, last, self._sample_model.columnCount() - 1))
+
+    def _on_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self._cells = _shift_rows(self._cells, first, -count)
+        self._row_count -= count
+        self._append({"op": "remove", "row": first, "count": count})
+
+    def _on_model_reset(self):
+        self._dirty = []
+        self._row_count = self._sample_model.rowCount()
+        self._cells = {cell: text for cell, text in self._cells.items() if cell[0] < self._row_count}
+        self._append({"op": "resize", "count": self._row_count})
+        self._dirty.append((0, 0, self._row_count - 1, self._sample_model.columnCount() - 1))
+
+    def _read_cells(self, top: int, left: int, bottom: int, right: int) -> List[list]:
+        """Read the cells of a range, update the journaled texts and return the changed cells."""
+        model = self._sample_model
+        changed = []
+        for row in range(max(top, 0), min(bottom, model.rowCount() - 1) + 1):
+            for column in range(max(left, 0), min(right, model.columnCount() - 1) + 1):
+                item = model.item(row, column)
+                text = item.text() if item is not None else ""
+                if self._cells.get((row, column), "") == text:
+                    continue
+                if text:
+                    self._cells[(row, column)] = text
+                else:
+                    del self._cells[(row, column)]
+                changed.append([row, column, text])
+        return changed
+
+    @Slot()
+    def _collect(self, *args) -> None:
+        """Turn the dirty ranges into one cells record, before the rows they refer to move."""
+        dirty, self._dirty = self._dirty, []
+        changed = []
+        for top, left, bottom, right in dirty:
+            changed.extend(self._read_cells(top, left, bottom, right))
+        if changed:
+            self._append({"op": "cells", "cells": changed})
+
+    def _append(self, record: dict) -> None:
+        record["seq"] = self._seq
+        self._seq += 1
+        self._buffer.append(json_backend.dumpb(record) + b"\n")
+        self._records_since_compact += 1
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @Slot()
+    def flush(self) -> None:
+        """Write the pending records on the writer thread, compacting if the journal has grown."""
+        if not self._started:
+            return
+
+        self._collect()
+        if self._records_since_compact >= self.COMPACT_RECORDS:
+            self._compact()
+            return
+
+        if self._buffer:
+            data, self._buffer = b"".join(self._buffer), []
+            self._pool.start(_JournalJob(lambda: self._file.append(data), self._logger))
+
+    def _compact(self) -> None:
+        snapshot = json_backend.dumpb({
+            "version": self.SNAPSHOT_VERSION,
+            "seq": self._seq - 1,
+            "columns": list(self._sample_model.fields),
+            "row_count": self._row_count,
+            "cells": [[row, column, text] for (row, column), text in self._cells.items()],
+            "run_info": self._run_info,
+        })
+
+        # the snapshot covers the buffered records
+        self._buffer = []
+        self._records_since_compact = 0
+        self._pool.start(_JournalJob(lambda: self._file.compact(snapshot), self._logger))
+
+    @Slot()
+    def close(self) -> None:
+        """Stop journaling at a clean shutdown, delete the journal files and release the lock."""
+        if not self._started:
+            return
+
+        self._started = False
+        self._flush_timer.stop()
+        self._pool.waitForDone()
+        self._file.discard()
+        self._lock_file.unlock()
+        self._locked = False
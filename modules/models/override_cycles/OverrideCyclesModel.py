@@ -1,5 +1,9 @@
 import re
+from functools import lru_cache
 from logging import Logger
+from typing import Optional
+
+import pandas as pd
 
 from PySide6.QtCore import Signal, QObject, Slot
 from modules.models.state.state_model import StateModel
@@ -23,16 +27,30 @@ class OverrideCyclesModel(QObject):
         }
 
         self._oc_parts_re = {
-            "Read1Cycles": r"(Y\d+|N\d+|U\d+|Y{r})",
-            "Index1Cycles": r"(I\d+|N\d+|U\d+|I{i})",
-            "Index2Cycles": r"(I\d+|N\d+|U\d+|I{i})",
-            "Read2Cycles": r"(Y\d+|N\d+|U\d+|Y{r})",
+            "Read1Cycles": re.compile(r"(Y\d+|N\d+|U\d+|Y\{r\})"),
+            "Index1Cycles": re.compile(r"(I\d+|N\d+|U\d+|I\{i\})"),
+            "Index2Cycles": re.compile(r"(I\d+|N\d+|U\d+|I\{i\})"),
+            "Read2Cycles": re.compile(r"(Y\d+|N\d+|U\d+|Y\{r\})"),
         }
 
         self._digits_re = re.compile(r'^\d+')
         self._left_nondigits_re = re.compile(r'^\D+')
         self._placeholder_re = re.compile(r'\{[ir]\}')
 
+        # Resolved patterns keyed by (pattern, run cycles), cleared when the run cycles change
+        self._resolve_cached = lru_cache(maxsize=256)(self._resolve)
+
+        self._state_model.run_cycles_changed.connect(self.clear_cache)
+        self._state_model.read1_cycles_changed.connect(self.clear_cache)
+        self._state_model.index1_cycles_changed.connect(self.clear_cache)
+        self._state_model.index2_cycles_changed.connect(self.clear_cache)
+        self._state_model.read2_cycles_changed.connect(self.clear_cache)
+
+    @Slot()
+    def clear_cache(self, *args) -> None:
+        """Drop all resolved override cycles."""
+        self._resolve_cached.cache_clear()
+
     def override_cycles_validate(self, override_cycles_dict: dict) -> bool:
 
        for key, value in override_cycles_dict.items():
@@ -75,7 +93,7 @@ class OverrideCyclesModel(QObject):
         return True
 
     def _nonvariable_oc_len(self, oc_part_key, oc_part_str):
-        matches = re.findall(self._oc_parts_re[oc_part_key], oc_part_str)
+        matches = self._oc_parts_re[oc_part_key].findall(oc_part_str)
 
         preset_oc_len = 0
         for m in matches:
@@ -86,38 +104,53 @@ class OverrideCyclesModel(QObject):
 
         return preset_oc_len
 
-    def pattern_to_cycles(self, override_cycles_pattern: str) -> str:
+    def pattern_to_cycles(self, override_cycles_pattern: str, run_cycles: Optional[tuple] = None) -> str:
+        """Resolve an override cycles pattern against the run cycles.
+
+        Results are memoized per pattern and run cycles.
+
+        Args:
+            override_cycles_pattern: The override cycles pattern
+            run_cycles: Run cycles to resolve against, defaults to the current run cycles
+        """
+        if run_cycles is None:
+            run_cycles = self._state_model.run_cycles
+        return self._resolve_cached(override_cycles_pattern, tuple(run_cycles))
+
+    def resolve_series(self, series: pd.Series, run_cycles: Optional[tuple] = None) -> pd.Series:
+        """Resolve a series of override cycles patterns, resolving each distinct pattern once.
+
+        Args:
+            series: Series of override cycles patterns, may contain missing values
+            run_cycles: Run cycles to resolve against, defaults to the current run cycles.
+                Pass a snapshot when resolving outside the GUI thread.
+
+        Returns:
+            Series of override cycles with the same index, missing where the pattern is missing
+        """
+        if run_cycles is None:
+            run_cycles = self._state_model.run_cycles
+        resolved = {pattern: self.pattern_to_cycles(pattern, run_cycles) for pattern in series.dropna().unique()}
+        return series.map(resolved)
+
+    def _resolve(self, override_cycles_pattern: str, run_cycles: tuple) -> str:
         read1_pattern, index1_pattern, index2_pattern, read2_pattern = override_cycles_pattern.split("-")
+        read1_rc, index1_ic, index2_ic, read2_rc = run_cycles
 
         read1_non_variable_oc = self._nonvariable_oc_len("Read1Cycles", read1_pattern)
-        read1_rc = self._state_model.read1_cycles
         read1_variable_oc = read1_rc - read1_non_variable_oc
         read_1_oc = read1_pattern.replace("{r}", str(read1_variable_oc))
 
         read2_non_variable_oc = self._nonvariable_oc_len("Read2Cycles", read2_pattern)
-        read2_rc = self._state_model.read2_cycles
         read2_variable_oc = read2_rc - read2_non_variable_oc
-        read_2_oc = read1_pattern.replace("{r}", str(read2_variable_oc))
+        read_2_oc = read2_pattern.replace("{r}", str(read2_variable_oc))
 
         index1_non_variable_oc = self._nonvariable_oc_len("Index1Cycles", index1_pattern)
-        index1_ic = self._state_model.index1_cycles
         index1_variable_oc = index1_ic - index1_non_variable_oc
         index_1_oc = index1_pattern.replace("{i}", str(index1_variable_oc))
 
         index2_non_variable_oc = self._nonvariable_oc_len("Index2Cycles", index2_pattern)
-        index2_ic = self._state_model.index2_cycles
         index2_variable_oc = index2_ic - index2_non_variable_oc
         index_2_oc = index2_pattern.replace("{i}", str(index2_variable_oc))
 
         return f"{read_1_oc}-{index_1_oc}-{index_2_oc}-{read_2_oc}"
-
-
-
-
-        non_variable_oc_index1_len = self._nonvariable_oc_len("Index1Cycles", index1_pattern)
-        non_variable_oc_index2_len = self._nonvariable_oc_len("Index2Cycles", index2_pattern)
-        non_variable_oc_read2_len = self._nonvariable_oc_len("Read2Cycles", read2_pattern)
-
-
-
-
@@ -0,0 +1,297 @@
+"""
+Binary project file holding a run in progress.
+
+Layout::
+
+    magic (8 bytes) | header length (uint32 LE) | header (JSON) | sections
+
+The small JSON header lists the row count, the sample columns and the offset,
+length and dtype of every section, relative to the end of the header. Sections
+hold the run info and validation state as JSON, and the sample table as
+columns: text columns are dictionary coded, with the distinct values stored
+once and a code array per row, and the Lane column is stored as an array of
+lane bitmasks. Opening a file only parses the header, sections are read when
+they are accessed and decoded with np.frombuffer, without parsing every cell.
+"""
+import os
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.models.sample.list_values import Column, DictColumn
+from modules.utils import json_backend
+
+MAGIC = b"SCPROJ\x00\x01"
+FORMAT_VERSION = 1
+PROJECT_SUFFIX = ".scproj"
+
+_PREFIX = struct.Struct("<8sI")  # magic, header length
+_ALIGN = 8
+
+# the sections of each column kind, and which of them hold arrays
+_COLUMN_SECTIONS = {"dict": ("values", "offsets", "codes"), "lane_mask": ("masks",)}
+_ARRAY_SECTIONS = {"offsets", "codes", "masks"}
+
+
+class ProjectFileError(Exception):
+    """Raised when a project file cannot be read."""
+    def __init__(self, path: Path, message: str):
+        super().__init__(f"Failed to read project file {path}: {message}")
+        self.path = path
+
+
+@dataclass
+class ProjectData:
+    """The contents of a project file."""
+    run_info: dict
+    row_count: int
+    columns: Dict[str, Column] = field(default_factory=dict)
+    validation: dict = field(default_factory=dict)
+
+
+def encode_texts(texts: List[str]) -> DictColumn:
+    """Dictionary code a column of cell texts, in order of first appearance."""
+    codes, values = pd.factorize(pd.Series(texts, dtype=object), sort=False)
+    return DictColumn([str(value) for value in values], codes.astype(_code_dtype(len(values))))
+
+
+def _code_dtype(value_count: int) -> np.dtype:
+    if value_count <= 1 << 8:
+        return np.dtype("u1")
+    if value_count <= 1 << 16:
+        return np.dtype("<u2")
+    return np.dtype("<u4")
+
+
+class _SectionWriter:
+    """Collects the sections of a file and their header references."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, data: bytes, dtype: Optional[np.dtype] = None) -> dict:
+        ref = {"offset": self.size, "length": len(data)}
+        if dtype is not None:
+            ref["dtype"] = dtype.str
+
+        padding = -len(data) % _ALIGN
+        self.chunks.append(data + b"\x00" * padding)
+        self.size += len(data) + padding
+        return ref
+
+    def add_array(self, array: np.ndarray) -> dict:
+        array = np.ascontiguousarray(array)
+        return self.add(array.tobytes(), array.dtype)
+
+    def add_json(self, obj) -> dict:
+        return self.add(json_backend.dumpb(obj))
+
+
+def write_project(path: Path, project: ProjectData) -> None:
+    """Write a project file, replacing an existing file only once it is complete.
+
+    Args:
+        path: The path of the project file.
+        project: The run info, sample columns and validation state to save.
+    """
+    path = Path(path)
+    sections = _SectionWriter()
+
+    columns = []
+    for name, column in project.columns.items():
+        if isinstance(column, DictColumn):
+            encoded = [value.encode("utf-8") for value in column.values]
+            offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            columns.append({
+                "name": name,
+                "kind": "dict",
+                "values": sections.add(b"".join(encoded)),
+                "offsets": sections.add_array(offsets),
+                "codes": sections.add_array(column.codes),
+            })
+        else:
+            columns.append({
+                "name": name,
+                "kind": "lane_mask",
+                "masks": sections.add_array(np.asarray(column, dtype="u1")),
+            })
+
+    header = {
+        "version": FORMAT_VERSION,
+        "row_count": project.row_count,
+        "run_info": sections.add_json(project.run_info),
+        "validation": sections.add_json(project.validation),
+        "columns": columns,
+    }
+    header_bytes = json_backend.dumpb(header)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        fh.write(header_bytes)
+        for chunk in sections.chunks:
+            fh.write(chunk)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+class ProjectFile:
+    """Read access to a project file.
+
+    Only the header is read when the file is opened, the run info, validation
+    state and sample columns are read on access.
+
+    Args:
+        path: The path of the project file.
+
+    Raises:
+        ProjectFileError: If the file is not a project file, has an unsupported
+            version or a header that does not describe its sections.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        try:
+            with open(self.path, "rb") as fh:
+                prefix = fh.read(_PREFIX.size)
+                if len(prefix) < _PREFIX.size:
+                    raise ProjectFileError(self.path, "file is truncated")
+
+                magic, header_length = _PREFIX.unpack(prefix)
+                if magic != MAGIC:
+                    raise ProjectFileError(self.path, "not a project file")
+
+                self._header = json_backend.loads(fh.read(header_length))
+        except (OSError, ValueError) as e:
+            raise ProjectFileError(self.path, str(e)) from e
+
+        self._check_header()
+
+        self._data_start = _PREFIX.size + header_length
+        self._columns = {column["name"]: column for column in self._header["columns"]}
+
+    def _check_header(self) -> None:
+        """Check that the header references every section it needs, so reads fail with ProjectFileError."""
+        header = self._header
+        if not isinstance(header, dict):
+            raise ProjectFileError(self.path, "header is not an object")
+
+        if header.get("version") != FORMAT_VERSION:
+            raise ProjectFileError(self.path, f"unsupported version {header.get('version')}")
+
+        row_count = header.get("row_count")
+        if not isinstance(row_count, int) or row_count < 0:
+            raise ProjectFileError(self.path, f"invalid row count {row_count!r}")
+
+        for name in ("run_info", "validation"):
+            self._check_ref(header.get(name), name)
+
+        columns = header.get("columns")
+        if not isinstance(columns, list):
+            raise ProjectFileError(self.path, "header lists no columns")
+
+        for column in columns:
+            if not isinstance(column, dict) or not isinstance(column.get("name"), str):
+                raise ProjectFileError(self.path, f"invalid column {column!r}")
+
+            sections = _COLUMN_SECTIONS.get(column.get("kind"))
+            if sections is None:
+                raise ProjectFileError(self.path, f"column {column['name']} has unknown kind {column.get('kind')!r}")
+
+            for section in sections:
+                self._check_ref(column.get(section), f"{column['name']} {section}", section in _ARRAY_SECTIONS)
+
+    def _check_ref(self, ref, name: str, array: bool = False) -> None:
+        if not isinstance(ref, dict) or not all(
+                isinstance(ref.get(key), int) and ref[key] >= 0 for key in ("offset", "length")):
+            raise ProjectFileError(self.path, f"missing or invalid {name} section")
+
+        if array:
+            try:
+                dtype = np.dtype(ref["dtype"]) if isinstance(ref.get("dtype"), str) else None
+            except TypeError:
+                dtype = None
+            if dtype is None or dtype.kind != "u" or ref["length"] % dtype.itemsize:
+                raise ProjectFileError(self.path, f"invalid {name} section type {ref.get('dtype')!r}")
+
+    @property
+    def row_count(self) -> int:
+        return self._header["row_count"]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def _read(self, ref: dict) -> bytes:
+        with open(self.path, "rb") as fh:
+            fh.seek(self._data_start + ref["offset"])
+            data = fh.read(ref["length"])
+
+        if len(data) != ref["length"]:
+            raise ProjectFileError(self.path, "file is truncated")
+        return data
+
+    def _read_array(self, ref: dict) -> np.ndarray:
+        return np.frombuffer(self._read(ref), dtype=np.dtype(ref["dtype"]))
+
+    def _read_json(self, name: str) -> dict:
+        try:
+            data = json_backend.loads(self._read(self._header[name]))
+        except ValueError as e:
+            raise ProjectFileError(self.path, f"invalid {name} section: {e}") from e
+
+        if not isinstance(data, dict):
+            raise ProjectFileError(self.path, f"invalid {name} section")
+        return data
+
+    def run_info(self) -> dict:
+        """Return the saved RunInfo fields."""
+        return self._read_json("run_info")
+
+    def validation(self) -> dict:
+        """Return the saved validation state."""
+        return self._read_json("validation")
+
+    def column(self, name: str) -> Column:
+        """Return a sample column, decoding each distinct value once."""
+        column = self._columns[name]
+
+        if column["kind"] == "lane_mask":
+            masks = self._read_array(column["masks"])
+            if len(masks) != self.row_count:
+                raise ProjectFileError(self.path, f"column {name} has {len(masks)} rows, not {self.row_count}")
+            return masks
+
+        blob = self._read(column["values"])
+        offsets = self._read_array(column["offsets"])
+        codes = self._read_array(column["codes"])
+
+        if len(codes) != self.row_count:
+            raise ProjectFileError(self.path, f"column {name} has {len(codes)} rows, not {self.row_count}")
+        if len(offsets) == 0 or offsets[-1] != len(blob) or np.any(np.diff(offsets.astype(np.int64)) < 0):
+            raise ProjectFileError(self.path, f"column {name} has invalid value offsets")
+        if len(codes) and codes.max() >= len(offsets) - 1:
+            raise ProjectFileError(self.path, f"column {name} has codes without a value")
+
+        try:
+            values = [blob[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+        except UnicodeDecodeError as e:
+            raise ProjectFileError(self.path, f"column {name} has invalid values: {e}") from e
+        return DictColumn(values, codes)
+
+    def read(self) -> ProjectData:
+        """Read the whole project."""
+        return ProjectData(
+            run_info=self.run_info(),
+            row_count=self.row_count,
+            columns={name: self.column(name) for name in self._columns},
+            validation=self.validation(),
+        )
@@ -0,0 +1,122 @@
+from dataclasses import asdict
+from logging import Logger
+from pathlib import Path
+from typing import List
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from modules.models.project.project_file import (
+    PROJECT_SUFFIX,
+    ProjectData,
+    ProjectFile,
+    ProjectFileError,
+    encode_texts,
+    write_project,
+)
+from modules.models.sample.sample_model import SampleModel
+from modules.models.state.state_model import StateModel
+from modules.models.validation.validation_result import StatusLevel, ValidationResult
+
+
+class ProjectModel(QObject):
+    """Saves the run in progress to a project file and opens it again.
+
+    A project holds the RunInfo, the sample table and the latest general
+    validation results, see project_file for the format.
+    """
+
+    validation_results_loaded = Signal(object)
+
+    def __init__(self, sample_model: SampleModel, state_model: StateModel, logger: Logger):
+        super().__init__()
+
+        self._sample_model = sample_model
+        self._state_model = state_model
+        self._logger = logger
+
+        self._validation_results: List[ValidationResult] = []
+
+    @Slot(object)
+    def set_validation_results(self, validation_results: List[ValidationResult]) -> None:
+        """Keep the latest general validation results, they are saved with the project."""
+        self._validation_results = list(validation_results)
+
+    @Slot(object)
+    def save(self, path) -> bool:
+        """
+        Save the run info, sample table and validation state to a project file.
+
+        Args:
+            path: The path of the project file, the project suffix is added if missing.
+
+        Returns:
+            bool: True if the project was saved, False otherwise.
+        """
+        path = Path(path)
+        if path.suffix != PROJECT_SUFFIX:
+            path = path.with_name(path.name + PROJECT_SUFFIX)
+
+        model = self._sample_model
+        lane_column = model.fields.index("Lane") if "Lane" in model.fields else None
+
+        # lanes are saved as bitmasks unless a cell holds text that is not a lane list
+        if lane_column is not None and not all(model.list_cell_valid(row, lane_column)
+                                               for row in range(model.rowCount())):
+            lane_column = None
+
+        columns = {
+            field: model.lane_masks() if column == lane_column else encode_texts(model.column_texts(column))
+            for column, field in enumerate(model.fields)
+        }
+
+        project = ProjectData(
+            run_info=asdict(self._state_model.run_info),
+            row_count=model.rowCount(),
+            columns=columns,
+            validation={
+                "results": [
+                    {"name": result.name, "message": result.message, "severity": result.severity.name}
+                    for result in self._validation_results
+                ],
+            },
+        )
+
+        try:
+            write_project(path, project)
+        except OSError as e:
+            self._logger.error(f"Failed to save project to {path}: {e}")
+            return False
+
+        self._logger.info(f"Project saved to {path}")
+        return True
+
+    @Slot(object)
+    def open(self, path) -> bool:
+        """
+        Replace the current run with the one saved in a project file.
+
+        Args:
+            path: The path of the project file.
+
+        Returns:
+            bool: True if the project was opened, False otherwise.
+        """
+        try:
+            project = ProjectFile(path).read()
+        except (ProjectFileError, OSError) as e:
+            self._logger.error(str(e))
+            return False
+
+        # samples first, the run info then restores the saved validation state
+        self._sample_model.load_columns(project.row_count, project.columns)
+        self._state_model.load_run_info(project.run_info)
+
+        self._validation_results = [
+            ValidationResult(result["name"], result["message"], StatusLevel[result["severity"]])
+            for result in project.validation.get("results", [])
+            if result.get("severity") in StatusLevel.__members__
+        ]
+        self.validation_results_loaded.emit(self._validation_results)
+
+        self._logger.info(f"Project opened from {path}")
+        return True
@@ -0,0 +1,143 @@
+import heapq
+from typing import Iterable, List, Optional, Set
+
+
+class FreeRowIndex:
+    """Keeps track of which rows in the sample grid are empty.
+
+    The index stores the number of filled cells per row and a min-heap of empty
+    rows. Heap entries are removed lazily, so a row that gets filled stays in
+    the heap until it reaches the top. A row is in the heap at most once, so
+    rows that flip between empty and filled do not grow it. Looking up the
+    first free row or the number of filled rows never needs a scan of the grid.
+
+    Args:
+        row_count: Number of (empty) rows to start with.
+    """
+
+    def __init__(self, row_count: int = 0):
+        self._filled_cells: List[int] = []
+        self._filled_rows = 0
+        self._free_heap: List[int] = []
+        self._in_heap: Set[int] = set()
+        self.reset(row_count)
+
+    def __len__(self) -> int:
+        return len(self._filled_cells)
+
+    def reset(self, row_count: int, filled_cells: Optional[Iterable[int]] = None) -> None:
+        """Reset the index.
+
+        Args:
+            row_count: Number of rows in the grid.
+            filled_cells: Optional number of filled cells per row. All rows are
+                empty if not given.
+        """
+        if filled_cells is None:
+            self._filled_cells = [0] * row_count
+        else:
+            self._filled_cells = list(filled_cells)
+
+        self._filled_rows = sum(1 for count in self._filled_cells if count)
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        # Built in ascending order, so the list already is a valid heap.
+        self._free_heap = [row for row, count in enumerate(self._filled_cells) if count == 0]
+        self._in_heap = set(self._free_heap)
+
+    def _push(self, row: int) -> None:
+        # a stale entry of the row still in the heap becomes valid again
+        if row not in self._in_heap:
+            self._in_heap.add(row)
+            heapq.heappush(self._free_heap, row)
+
+    def _pop(self) -> int:
+        row = heapq.heappop(self._free_heap)
+        self._in_heap.discard(row)
+        return row
+
+    def _is_stale(self, row: int) -> bool:
+        return row >= len(self._filled_cells) or self._filled_cells[row] > 0
+
+    def update_cell(self, row: int, was_filled: bool, is_filled: bool) -> None:
+        """Record that a cell in the row changed between empty and filled.
+
+        Args:
+            row: The row of the cell.
+            was_filled: Whether the cell had a value before the change.
+            is_filled: Whether the cell has a value after the change.
+        """
+        if was_filled == is_filled or not 0 <= row < len(self._filled_cells):
+            return
+
+        if is_filled:
+            self._filled_cells[row] += 1
+            if self._filled_cells[row] == 1:
+                self._filled_rows += 1
+        else:
+            self._filled_cells[row] -= 1
+            if self._filled_cells[row] == 0:
+                self._filled_rows -= 1
+                self._push(row)
+
+    def insert_rows(self, first: int, count: int) -> None:
+        """Record that count empty rows were inserted before row first."""
+        if count <= 0:
+            return
+
+        if first >= len(self._filled_cells):
+            start = len(self._filled_cells)
+            self._filled_cells.extend([0] * count)
+            for row in range(start, start + count):
+                self._push(row)
+            return
+
+        self._filled_cells[first:first] = [0] * count
+        self._rebuild_heap()
+
+    def remove_rows(self, first: int, count: int) -> None:
+        """Record that count rows were removed starting at row first."""
+        if count <= 0:
+            return
+
+        removed = self._filled_cells[first:first + count]
+        self._filled_rows -= sum(1 for cells in removed if cells)
+        del self._filled_cells[first:first + count]
+        self._rebuild_heap()
+
+    def is_free(self, row: int) -> bool:
+        """Return True if the row exists and has no filled cells."""
+        return 0 <= row < len(self._filled_cells) and self._filled_cells[row] == 0
+
+    def first_free_row(self) -> int:
+        """Return the first empty row, or the row count if all rows are filled."""
+        while self._free_heap and self._is_stale(self._free_heap[0]):
+            self._pop()
+
+        return self._free_heap[0] if self._free_heap else len(self._filled_cells)
+
+    def free_rows(self, count: int) -> List[int]:
+        """Return up to count empty rows in ascending order.
+
+        Args:
+            count: The maximum number of rows to return.
+
+        Returns:
+            The first empty rows. Fewer than count rows are returned if the
+            grid does not have enough of them.
+        """
+        rows: List[int] = []
+        while self._free_heap and len(rows) < count:
+            row = self._pop()
+            if not self._is_stale(row):
+                rows.append(row)
+
+        for row in rows:
+            self._push(row)
+
+        return rows
+
+    def filled_row_count(self) -> int:
+        """Return the number of rows with at least one filled cell."""
+        return self._filled_rows
@@ -0,0 +1,103 @@
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def is_lane(value) -> bool:
+    """Return True if an exploded Lane value is a lane number.
+
+    Samples without lanes explode to a missing value, and invalid lane cells
+    reach the dataframe as text, validation reports them.
+    """
+    return isinstance(value, (int, np.integer))
+
+
+class LanePartition:
+    """Partition of a sample dataframe into the rows of each lane.
+
+    The Lane column (a list of lanes per sample) is exploded once and grouped
+    into a mapping of lane to positional row indices. Lane-wise consumers take
+    their rows from the partition instead of exploding the whole frame and
+    filtering it per lane with boolean masks.
+
+    Args:
+        dataframe: Sample dataframe with a list-valued Lane column.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame):
+        self._dataframe = dataframe
+        self._rows: Dict[int, np.ndarray] = {}
+        self._frames: Dict[int, pd.DataFrame] = {}
+
+        if dataframe.empty or "Lane" not in dataframe.columns:
+            return
+
+        lanes = pd.Series(dataframe["Lane"].to_numpy(), dtype=object).explode()
+        lanes = lanes[lanes.map(is_lane)]
+        if lanes.empty:
+            return
+
+        lanes = lanes.astype(int)
+        # The exploded series keeps the positional index of the sample rows,
+        # and groupby indices are positions into the exploded series
+        sample_positions = lanes.index.to_numpy(dtype=np.intp)
+        self._rows = {
+            int(lane): sample_positions[positions]
+            for lane, positions in lanes.groupby(lanes).indices.items()
+        }
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """The sample dataframe the partition was built from."""
+        return self._dataframe
+
+    @property
+    def lanes(self) -> List[int]:
+        """The lanes that have at least one sample, in ascending order."""
+        return sorted(self._rows)
+
+    @property
+    def size(self) -> int:
+        """The number of sample-lane combinations."""
+        return sum(len(rows) for rows in self._rows.values())
+
+    def rows(self, lane: int) -> np.ndarray:
+        """Return the positional row indices of the samples in a lane."""
+        return self._rows.get(int(lane), np.empty(0, dtype=np.intp))
+
+    def frame(self, lane: int) -> pd.DataFrame:
+        """Return the samples in a lane, with Lane set to the lane number.
+
+        Frames are cached, so callers should not modify them in place.
+        """
+        lane = int(lane)
+        frame = self._frames.get(lane)
+        if frame is None:
+            frame = self._dataframe.iloc[self.rows(lane)].copy()
+            frame["Lane"] = lane
+            self._frames[lane] = frame
+        return frame
+
+    def __iter__(self) -> Iterator[Tuple[int, pd.DataFrame]]:
+        for lane in self.lanes:
+            yield lane, self.frame(lane)
+
+    def exploded(self) -> pd.DataFrame:
+        """Return the samples exploded to one row per sample and lane.
+
+        Equivalent to exploding the Lane column of the dataframe and dropping
+        samples without lanes. Rows keep the sample order, with lanes in
+        ascending order within a sample.
+        """
+        if not self._rows:
+            return self._dataframe.iloc[0:0].copy()
+
+        lanes = self.lanes
+        positions = np.concatenate([self._rows[lane] for lane in lanes])
+        lane_values = np.repeat(lanes, [len(self._rows[lane]) for lane in lanes])
+
+        order = np.argsort(positions, kind="stable")
+        exploded = self._dataframe.iloc[positions[order]].reset_index(drop=True)
+        exploded["Lane"] = lane_values[order]
+        return exploded
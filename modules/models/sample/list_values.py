@@ -0,0 +1,146 @@
+import json
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+# Lanes are stored as a bitmask, bit (lane - 1) set for each lane. Instruments
+# have at most 8 lanes, so the mask fits in a byte.
+MAX_LANES = 8
+
+
+def lanes_to_mask(lanes: Iterable[int]) -> int:
+    """Convert an iterable of lane numbers (1-based) into a lane bitmask.
+
+    Args:
+        lanes: The lane numbers. Values outside 1..MAX_LANES are ignored.
+
+    Returns:
+        The lane bitmask.
+    """
+    mask = 0
+    for lane in lanes:
+        try:
+            lane = int(lane)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= lane <= MAX_LANES:
+            mask |= 1 << (lane - 1)
+    return mask
+
+
+@lru_cache(maxsize=1 << MAX_LANES)
+def mask_to_lanes(mask: int) -> Tuple[int, ...]:
+    """Convert a lane bitmask into a sorted tuple of lane numbers."""
+    return tuple(lane for lane in range(1, MAX_LANES + 1) if mask & (1 << (lane - 1)))
+
+
+@lru_cache(maxsize=1 << MAX_LANES)
+def render_lanes(mask: int) -> str:
+    """Render a lane bitmask as the JSON list shown in the sample table."""
+    lanes = mask_to_lanes(mask)
+    return json.dumps(list(lanes)) if lanes else ""
+
+
+_LANES_TEXT = re.compile(r"(\[)?\s*(\d+(?:\s*,\s*\d+)*)?\s*(\])?")
+
+
+def lanes_from_text(text) -> Optional[List[int]]:
+    """Parse lane cell text such as "[1, 2]" or "1,2" into lane numbers.
+
+    Returns:
+        The lane numbers, in any range, or None if the text is not a list of integers.
+    """
+    if not isinstance(text, str):
+        return None
+
+    match = _LANES_TEXT.fullmatch(text.strip())
+    if match is None or bool(match.group(1)) != bool(match.group(3)):
+        return None
+
+    return [int(lane) for lane in re.findall(r"\d+", match.group(2) or "")]
+
+
+def parse_lanes_text(text) -> Optional[int]:
+    """Parse lane cell text such as "[1, 2]" or "1,2" into a lane bitmask.
+
+    Returns:
+        The lane bitmask, 0 for empty text, or None if the text is not a list
+        of lanes in 1..MAX_LANES.
+    """
+    if not isinstance(text, str) or not text.strip():
+        return 0
+
+    lanes = lanes_from_text(text)
+    if lanes is None or not all(1 <= lane <= MAX_LANES for lane in lanes):
+        return None
+
+    return lanes_to_mask(lanes)
+
+
+class DictColumn(NamedTuple):
+    """A dictionary coded text column.
+
+    Attributes:
+        values: The distinct texts of the column
+        codes: Index into values of every row
+    """
+    values: List[str]
+    codes: np.ndarray
+
+
+# a dictionary coded text column, or an array of lane bitmasks for the Lane column
+Column = Union[DictColumn, np.ndarray]
+
+
+class ProfileIdSets:
+    """Dictionary encoding for the application profile ids of sample rows.
+
+    Every distinct set of profile ids gets a small integer code, and code 0 is
+    the empty set. Rows only store the code, so rows with the same profiles
+    share one interned tuple and its rendered text.
+    """
+
+    def __init__(self):
+        self._codes: Dict[Tuple[str, ...], int] = {(): 0}
+        self._values: List[Tuple[str, ...]] = [()]
+        self._texts: List[str] = [""]
+
+    def code(self, profile_ids: Iterable[str]) -> int:
+        """Return the code of the given profile ids, adding it if it is new."""
+        key = tuple(dict.fromkeys(str(profile_id) for profile_id in profile_ids))
+
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self._values)
+            self._codes[key] = code
+            self._values.append(key)
+            self._texts.append(json.dumps(list(key)))
+
+        return code
+
+    def ids(self, code: int) -> Tuple[str, ...]:
+        """Return the interned tuple of profile ids for a code."""
+        return self._values[code] if 0 <= code < len(self._values) else ()
+
+    def text(self, code: int) -> str:
+        """Return the rendered text for a code."""
+        return self._texts[code] if 0 <= code < len(self._texts) else ""
+
+    def parse_text(self, text) -> int:
+        """Parse profile id cell text such as '["A_1", "B_2"]' into a code."""
+        if not isinstance(text, str) or not text.strip():
+            return 0
+
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = [part.strip().strip("'\"") for part in text.strip("[]").split(",")]
+
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return 0
+
+        return self.code(profile_id for profile_id in value if profile_id)
@@ -1,11 +1,30 @@
-import ast
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
-from PySide6.QtCore import Qt, QSortFilterProxyModel, Signal
-from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, QModelIndex, QSortFilterProxyModel, Signal
+from PySide6.QtGui import QColor, QStandardItemModel, QStandardItem
 
 from modules.models.configuration.configuration_manager import ConfigurationManager
+from modules.models.indexes.index_mime import (
+    INDEX_COLUMNS_MIME_TYPE,
+    INDEX_JSON_MIME_TYPE,
+    decode_index_columns,
+    records_to_columns,
+)
+from modules.models.sample.free_row_index import FreeRowIndex
+from modules.models.sample.list_values import (
+    Column,
+    DictColumn,
+    ProfileIdSets,
+    lanes_from_text,
+    lanes_to_mask,
+    mask_to_lanes,
+    parse_lanes_text,
+    render_lanes,
+)
 from modules.models.sample.samplesheet_fns import to_json
+from modules.models.undo.undo import CellDeltaCommand, RemoveRowsCommand, UndoStack
 from modules.models.workdata.workdata_manager import WorkDataManager
 from modules.utils.utils import decode_bytes_json
 
@@ -21,6 +40,29 @@ def field_count(fields):
     return sum(len(fields[section]) for section in fields)
 
 
+# Fields whose cells hold a list of values. The structured value is kept as an
+# int in LIST_VALUE_ROLE: a lane bitmask for Lane and a ProfileIdSets code for
+# ApplicationProfileId. The cell text is rendered from it (cached), and text is
+# only parsed when typed, pasted or dropped into the cell.
+LIST_FIELDS = ("Lane", "ApplicationProfileId")
+LIST_VALUE_ROLE = Qt.UserRole + 1
+
+# Lane text that does not parse to lanes in 1..MAX_LANES is kept as typed, with
+# None as its structured value, and flagged so validation can report it.
+INVALID_CELL_COLOR = QColor("#f4c7c3")
+INVALID_LANES_TOOLTIP = "Lanes must be a list of lane numbers 1-8, e.g. [1, 2]"
+
+
+def _to_cell_text(value) -> str:
+    if isinstance(value, (list, dict)):
+        return to_json(value)
+    if isinstance(value, tuple):
+        return to_json(list(value))
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    return str(value)
+
+
 class SampleModel(QStandardItemModel):
 
     dropped_data = Signal(object)
@@ -34,11 +76,30 @@ class SampleModel(QStandardItemModel):
         self.sections_fields = self._configuration_manager.samples_settings["fields"]
         self.row_count = self._configuration_manager.samples_settings["row_count"]
         self.fields = get_column_headers(self.sections_fields)
+        self._list_columns = {self.fields.index(field) for field in LIST_FIELDS if field in self.fields}
+        self._lane_column = self.fields.index("Lane") if "Lane" in self.fields else None
+        self._profile_id_sets = ProfileIdSets()
+
+        # Changes are recorded as cell deltas once the model is set up
+        self.undo_stack = UndoStack()
+        self._record_undo = False
+
+        # Incremented on every data or structure change, so consumers can cache
+        # data derived from the model per generation
+        self._generation = 0
+        for signal in (self.dataChanged, self.rowsInserted, self.rowsRemoved, self.modelReset):
+            signal.connect(self._bump_generation)
+
+        self._free_rows = FreeRowIndex()
+        self.rowsInserted.connect(self._on_rows_inserted)
+        self.rowsRemoved.connect(self._on_rows_removed)
+        self.modelReset.connect(self._rebuild_free_rows)
 
         self.setColumnCount(len(self.fields))
         self.setHorizontalHeaderLabels(self.fields)
         self.setRowCount(self.row_count)
         self.set_empty_strings()
+        self._record_undo = True
 
         self.select_samples = False
 
@@ -73,6 +134,248 @@ class SampleModel(QStandardItemModel):
 
 
 
+    def _bump_generation(self, *args):
+        self._generation += 1
+
+    @property
+    def generation(self) -> int:
+        """A counter that changes whenever the sample data changes."""
+        return self._generation
+
+    def _cell_text(self, row: int, column: int) -> str:
+        item = self.item(row, column)
+        return item.text() if item is not None else ""
+
+    def _cell_filled(self, row: int, column: int) -> bool:
+        item = self.item(row, column)
+        return item is not None and item.text().strip() != ""
+
+    def _parse_list_cell(self, column: int, text) -> Optional[int]:
+        """Parse list cell text into its structured value, None if lane text is invalid."""
+        if column == self._lane_column:
+            return parse_lanes_text(text)
+        return self._profile_id_sets.parse_text(text)
+
+    def _render_list_cell(self, column: int, code: int) -> str:
+        if column == self._lane_column:
+            return render_lanes(code)
+        return self._profile_id_sets.text(code)
+
+    def _set_cell_text(self, row: int, column: int, text: str, code: int = None) -> None:
+        """
+        Write text to a cell directly and keep the free-row index in sync.
+
+        For list-valued cells the text is parsed into its structured value (or
+        the given code is used) and the cell text is normalized to its rendering.
+        Text that does not parse is kept as it is and the cell is flagged.
+        """
+        if column in self._list_columns:
+            if code is None:
+                code = self._parse_list_cell(column, text)
+            if code is not None:
+                text = self._render_list_cell(column, code)
+
+        item = self.item(row, column)
+        was_filled = item is not None and item.text().strip() != ""
+
+        if item is None:
+            item = QStandardItem(text)
+            self.setItem(row, column, item)
+        else:
+            item.setText(text)
+
+        if column in self._list_columns:
+            item.setData(code, LIST_VALUE_ROLE)
+            self._flag_list_cell(item, code is not None)
+
+        self._free_rows.update_cell(row, was_filled, text.strip() != "")
+
+    @staticmethod
+    def _flag_list_cell(item: QStandardItem, valid: bool) -> None:
+        """Mark a list cell whose text did not parse, or clear the mark."""
+        if valid:
+            if item.data(Qt.BackgroundRole) is not None:
+                item.setData(None, Qt.BackgroundRole)
+                item.setToolTip("")
+        else:
+            item.setData(INVALID_CELL_COLOR, Qt.BackgroundRole)
+            item.setToolTip(INVALID_LANES_TOOLTIP)
+
+    def _set_list_cell(self, row: int, column: int, code: int) -> None:
+        """Write the structured value of a list-valued cell directly."""
+        self._set_cell_text(row, column, "", code)
+
+    def list_value(self, row: int, column: int) -> int:
+        """
+        Return the structured value of a list-valued cell.
+
+        Args:
+            row (int): The model row.
+            column (int): The model column.
+
+        Returns:
+            int: The lane bitmask for Lane or the profile id set code for
+            ApplicationProfileId, 0 if the cell is empty.
+        """
+        item = self.item(row, column)
+        if item is None:
+            return 0
+
+        return item.data(LIST_VALUE_ROLE) or 0
+
+    def list_cell_valid(self, row: int, column: int) -> bool:
+        """Return False if the cell holds list text that did not parse."""
+        item = self.item(row, column)
+        return item is None or item.data(LIST_VALUE_ROLE) is not None or not item.text().strip()
+
+    def _lane_cell_value(self, row: int):
+        """The Lane value of a row for the sample dataframe.
+
+        Invalid text is passed on as the parsed lane numbers if it is a list of
+        integers, and as the raw text otherwise, so validation reports it.
+        """
+        if not self.list_cell_valid(row, self._lane_column):
+            text = self._cell_text(row, self._lane_column)
+            lanes = lanes_from_text(text)
+            return lanes if lanes is not None else text
+
+        return list(self.lanes(row)) or None
+
+    def lane_mask(self, row: int) -> int:
+        """Return the lane bitmask of a row (bit n-1 set for lane n)."""
+        return self.list_value(row, self._lane_column)
+
+    def lanes(self, row: int) -> tuple:
+        """Return the sorted lanes of a row."""
+        return mask_to_lanes(self.lane_mask(row))
+
+    def profile_ids(self, row: int) -> tuple:
+        """Return the application profile ids of a row."""
+        return self._profile_id_sets.ids(self.list_value(row, self.fields.index("ApplicationProfileId")))
+
+    def _on_rows_inserted(self, parent, first, last):
+        self._free_rows.insert_rows(first, last - first + 1)
+        for row in range(first, last + 1):
+            for column in range(self.columnCount()):
+                if self._cell_filled(row, column):
+                    self._free_rows.update_cell(row, False, True)
+
+    def _on_rows_removed(self, parent, first, last):
+        self._free_rows.remove_rows(first, last - first + 1)
+
+    def _rebuild_free_rows(self):
+        self._free_rows.reset(
+            self.rowCount(),
+            [sum(self._cell_filled(row, column) for column in range(self.columnCount()))
+             for row in range(self.rowCount())],
+        )
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Set the data of a cell and keep the free-row index in sync.
+
+        Args:
+            index (QModelIndex): The index of the cell.
+            value: The value to set.
+            role (int): The data role.
+
+        Returns:
+            bool: True if the data was set, False otherwise.
+        """
+        if role not in (Qt.EditRole, Qt.DisplayRole) or not index.isValid():
+            return super().setData(index, value, role)
+
+        old_text = self._cell_text(index.row(), index.column())
+
+        if index.column() in self._list_columns:
+            code = self._parse_list_cell(index.column(), value)
+            if code is not None:
+                value = self._render_list_cell(index.column(), code)
+            item = self.itemFromIndex(index)
+            was_blocked = self.blockSignals(True)
+            try:
+                item.setData(code, LIST_VALUE_ROLE)
+                self._flag_list_cell(item, code is not None)
+            finally:
+                self.blockSignals(was_blocked)
+
+        was_filled = self._cell_filled(index.row(), index.column())
+        result = super().setData(index, value, role)
+        if result:
+            self._free_rows.update_cell(index.row(), was_filled, self._cell_filled(index.row(), index.column()))
+
+            new_text = self._cell_text(index.row(), index.column())
+            if self._record_undo and new_text != old_text:
+                self.undo_stack.push(CellDeltaCommand(
+                    "Edit", {(index.row(), index.column()): (old_text, new_text)}, mergeable=True
+                ))
+
+        return result
+
+    def undo(self) -> bool:
+        """Undo the last change of the sample data, return True if there was one."""
+        return self._replay(self.undo_stack.undo)
+
+    def redo(self) -> bool:
+        """Redo the last undone change of the sample data, return True if there was one."""
+        return self._replay(self.undo_stack.redo)
+
+    def _replay(self, step) -> bool:
+        record_undo, self._record_undo = self._record_undo, False
+        try:
+            return step(self) is not None
+        finally:
+            self._record_undo = record_undo
+
+    def removeRows(self, row, count, parent=QModelIndex()) -> bool:
+        """Remove rows, recording the text of their cells so the removal can be undone."""
+        if not self._record_undo or parent.isValid() or count <= 0 or not 0 <= row <= self.rowCount() - count:
+            return super().removeRows(row, count, parent)
+
+        cells = [(offset, column, self.item(row + offset, column).text())
+                 for offset in range(count)
+                 for column in range(self.columnCount())
+                 if self._cell_filled(row + offset, column)]
+
+        result = super().removeRows(row, count, parent)
+        if result:
+            self.undo_stack.push(RemoveRowsCommand(row, count, cells))
+        return result
+
+    def insert_rows_unrecorded(self, row: int, count: int) -> None:
+        """Insert empty rows without recording an undo step."""
+        record_undo, self._record_undo = self._record_undo, False
+        try:
+            self.insertRows(row, count)
+            self.write_cells(((r, column, "") for r in range(row, row + count)
+                              for column in range(self.columnCount())), undo_text=None)
+        finally:
+            self._record_undo = record_undo
+
+    def remove_rows_unrecorded(self, row: int, count: int) -> None:
+        """Remove rows without recording an undo step."""
+        record_undo, self._record_undo = self._record_undo, False
+        try:
+            self.removeRows(row, count)
+        finally:
+            self._record_undo = record_undo
+
+    def first_free_row(self) -> int:
+        """Return the first empty row, or the row count if all rows are filled."""
+        return self._free_rows.first_free_row()
+
+    def free_rows(self, count: int) -> list:
+        """Return up to count empty rows in ascending order."""
+        return self._free_rows.free_rows(count)
+
+    def filled_row_count(self) -> int:
+        """Return the number of rows with at least one non-empty cell."""
+        return self._free_rows.filled_row_count()
+
+    def is_row_free(self, row: int) -> bool:
+        """Return True if the row exists and all its cells are empty."""
+        return self._free_rows.is_free(row)
+
     def refresh_view(self):
 
         top_left = self.index(0, 0)
@@ -108,73 +411,354 @@ class SampleModel(QStandardItemModel):
             parent (QObject): The parent object of the data.
 
         Returns:
-            bool: True if the mime data has the format "application/json", False otherwise.
+            bool: True if the mime data has the binary index column format or
+            "application/json", False otherwise.
         """
 
-        return bool(data.hasFormat("application/json"))
+        return bool(data.hasFormat(INDEX_COLUMNS_MIME_TYPE) or data.hasFormat(INDEX_JSON_MIME_TYPE))
 
     def set_dropped_index_data(self, data):
-        start_row = data["start_row"]
+        return self.set_column_data(data["start_row"], data["decoded_data"])
 
-        self.blockSignals(True)
+    def set_column_data(self, start_row: int, columns: dict, undo_text: Optional[str] = "Drop") -> bool:
+        """
+        Write column-oriented data into the model starting at start_row.
+
+        Each column slice is written in one pass with signals blocked, and a
+        single dataChanged is emitted for the rectangle that was touched.
+        Columns that are not model fields are ignored.
+
+        Args:
+            start_row (int): The first model row to write to.
+            columns (dict): Mapping of field name to a list of values.
+            undo_text (str): Description of the undo step, None to not record one.
+
+        Returns:
+            bool: True if any data was written, False otherwise.
+        """
+        field_columns = {self.fields.index(key): values
+                         for key, values in columns.items() if key in self.fields}
+        if not field_columns or start_row < 0:
+            return False
+
+        row_count = max(len(values) for values in field_columns.values())
+        if row_count == 0:
+            return False
+
+        end_row = start_row + row_count - 1
+        if end_row >= self.rowCount():
+            self.setRowCount(end_row + 1)
+
+        return self.write_cells(
+            ((row, column, value)
+             for column, values in field_columns.items()
+             for row, value in enumerate(values, start_row)),
+            undo_text=undo_text,
+        )
+
+    def write_cells(self, cells, undo_text: Optional[str] = "Edit cells") -> bool:
+        """
+        Write a batch of cells as a single model operation.
 
-        for i, row_data in enumerate(data["decoded_data"]):
-            for key, value in row_data.items():
-                if key in self.fields:
-                    column = self.fields.index(key)
-                    self.setData(self.index(start_row + i, column), value)
+        Signals are blocked while writing and one dataChanged is emitted for
+        the bounding rectangle of the written cells. Cells outside the model
+        are skipped. The changed cells are recorded as one undo step.
 
-        self.blockSignals(False)
+        Args:
+            cells: Iterable of (row, column, value) tuples. None is written as
+                an empty string.
+            undo_text: Description of the undo step, None to not record one.
+
+        Returns:
+            bool: True if any cell was written, False otherwise.
+        """
+        row_count = self.rowCount()
+        column_count = self.columnCount()
+        top, left, bottom, right = row_count, column_count, -1, -1
+
+        record = self._record_undo and undo_text is not None
+        deltas = {}
 
-        topLeft = self.index(0, 0)
-        bottomRight = self.index(self.rowCount() - 1, self.columnCount() - 1)
+        was_blocked = self.blockSignals(True)
+        try:
+            for row, column, value in cells:
+                if not (0 <= row < row_count and 0 <= column < column_count):
+                    continue
+
+                if record:
+                    old_text = self._cell_text(row, column)
+
+                self._set_cell_text(row, column, "" if value is None else str(value))
+                top, bottom = min(top, row), max(bottom, row)
+                left, right = min(left, column), max(right, column)
+
+                if record:
+                    new_text = self.item(row, column).text()
+                    if (row, column) in deltas:
+                        old_text = deltas[(row, column)][0]
+                    if new_text != old_text:
+                        deltas[(row, column)] = (old_text, new_text)
+                    else:
+                        deltas.pop((row, column), None)
+        finally:
+            self.blockSignals(was_blocked)
+
+        if bottom < 0:
+            return False
+
+        if deltas:
+            self.undo_stack.push(CellDeltaCommand(undo_text, deltas))
 
         self.dataChanged.emit(
-            topLeft,
-            bottomRight,
-            Qt.DisplayRole,
+            self.index(top, left),
+            self.index(bottom, right),
+            [Qt.DisplayRole, Qt.EditRole],
         )
 
         return True
 
+    def _emit_rows_changed(self, rows, columns) -> None:
+        """Emit one dataChanged per run of consecutive rows over the column span."""
+        if not rows or not columns:
+            return
+
+        left, right = min(columns), max(columns)
+        rows = sorted(set(rows))
+
+        run_start = previous = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == previous + 1:
+                previous = row
+                continue
+
+            self.dataChanged.emit(
+                self.index(run_start, left),
+                self.index(previous, right),
+                [Qt.DisplayRole, Qt.EditRole],
+            )
+            if row is not None:
+                run_start = previous = row
+
+    def _mutate_rows(self, rows, mutate, columns, undo_text: str) -> None:
+        """
+        Run mutate(row) for each row with signals blocked, then notify views.
+
+        The text of the given columns is kept from before each mutation, so the
+        changed cells are recorded as one undo step.
+
+        Args:
+            rows: Model rows to mutate.
+            mutate: Function changing a row, returning the columns it touched.
+            columns: The columns mutate may change.
+            undo_text: Description of the undo step.
+        """
+        rows = [row for row in rows if 0 <= row < self.rowCount()]
+        if not rows:
+            return
+
+        touched_rows, touched = [], set()
+        deltas = {}
+        was_blocked = self.blockSignals(True)
+        try:
+            for row in rows:
+                old_texts = {column: self._cell_text(row, column) for column in columns} \
+                    if self._record_undo else {}
+
+                touched_columns = mutate(row)
+                if touched_columns:
+                    touched_rows.append(row)
+                    touched.update(touched_columns)
+
+                    for column in touched_columns:
+                        if column not in old_texts:
+                            continue
+                        new_text = self.item(row, column).text()
+                        if new_text != old_texts[column]:
+                            deltas[(row, column)] = (old_texts[column], new_text)
+        finally:
+            self.blockSignals(was_blocked)
+
+        if deltas:
+            self.undo_stack.push(CellDeltaCommand(undo_text, deltas))
+
+        self._emit_rows_changed(touched_rows, touched)
+
+    def assign_lanes(self, rows, lanes) -> None:
+        """
+        Set the lanes of the given rows.
+
+        Args:
+            rows: Model (source) rows to update.
+            lanes: The lanes to assign, replacing any previous lanes.
+        """
+        lane_column = self._lane_column
+        lane_mask = lanes_to_mask(lanes)
+
+        def mutate(row):
+            if self.list_value(row, lane_column) == lane_mask:
+                return []
+
+            self._set_list_cell(row, lane_column, lane_mask)
+            return [lane_column]
+
+        self._mutate_rows(rows, mutate, [lane_column], "Assign lanes")
+
+    def add_profile(self, rows, profile_id: str, data: dict = None) -> None:
+        """
+        Add an application profile id to the given rows.
+
+        Args:
+            rows: Model (source) rows to update.
+            profile_id: The application profile id to add. Rows that already
+                have it are left unchanged.
+            data: Optional field values that belong to the profile and are
+                written to the rows along with the id.
+        """
+        profile_column = self.fields.index("ApplicationProfileId")
+        data_columns = {self.fields.index(key): value
+                        for key, value in (data or {}).items() if key in self.fields}
+
+        def mutate(row):
+            profile_ids = self._profile_id_sets.ids(self.list_value(row, profile_column))
+            if profile_id in profile_ids:
+                return []
+
+            self._set_list_cell(row, profile_column, self._profile_id_sets.code(profile_ids + (profile_id,)))
+            for column, value in data_columns.items():
+                self._set_cell_text(row, column, _to_cell_text(value))
+
+            return [profile_column, *data_columns]
+
+        self._mutate_rows(rows, mutate, [profile_column, *data_columns], "Add application profile")
+
+    def remove_profile(self, rows, profile_id: str, data_fields=None) -> None:
+        """
+        Remove an application profile id from the given rows.
+
+        Args:
+            rows: Model (source) rows to update.
+            profile_id: The application profile id to remove.
+            data_fields: Optional fields that belong to the profile and are
+                cleared in the rows along with the id.
+        """
+        profile_column = self.fields.index("ApplicationProfileId")
+        data_columns = [self.fields.index(key) for key in (data_fields or []) if key in self.fields]
+
+        def mutate(row):
+            profile_ids = self._profile_id_sets.ids(self.list_value(row, profile_column))
+            if profile_id not in profile_ids:
+                return []
+
+            remaining = (pid for pid in profile_ids if pid != profile_id)
+            self._set_list_cell(row, profile_column, self._profile_id_sets.code(remaining))
+            for column in data_columns:
+                self._set_cell_text(row, column, "")
+
+            return [profile_column, *data_columns]
+
+        self._mutate_rows(rows, mutate, [profile_column, *data_columns], "Remove application profile")
+
     def _find_first_empty_row(self):
         """
         Find the first empty row in the QStandardItemModel.
-        An empty row is where all columns are empty (optional: customize this logic).
+        An empty row is where all columns are empty.
         """
-        row_count = self.rowCount()
-        column_count = self.columnCount()
+        return self.first_free_row()
 
-        for row in range(row_count):
-            is_empty = True
-            for col in range(column_count):
-                item = self.item(row, col)
-                if item is not None and item.text().strip() != "":
-                    is_empty = False
-                    break
-            if is_empty:
-                return row
-        return row_count
+    def load_dataframe(self, df: pd.DataFrame) -> list:
+        """
+        Bulk-load a dataframe into the empty rows of the model.
 
-    def set_worksheet_data(self, df):
-        model_columns = [self.headerData(col, Qt.Horizontal) for col in range(self.columnCount())]
+        The empty rows are taken from the free-row index, rows are added at the
+        end if there are not enough of them, and the dataframe is converted to
+        cell text column by column. List and dict values are stored as JSON.
+        Views see a single rowsInserted (if the model grew) followed by a single
+        dataChanged.
 
-        for df_index, df_row in df.iterrows():
-            # Find the first empty row in the model
-            first_empty_row = self._find_first_empty_row()
-            # Add items to the row by matching column names
-            for col_index, column_name in enumerate(model_columns):
-                if column_name in df.columns:
-                    value = df_row[column_name]
+        Args:
+            df: DataFrame to load. Column names should match model fields.
+
+        Returns:
+            list: The model rows that the dataframe rows were written to.
+        """
+        if df.empty:
+            return []
+
+        target_rows = self.free_rows(len(df))
+        missing = len(df) - len(target_rows)
+        if missing > 0:
+            first_new_row = self.rowCount()
+            self.setRowCount(first_new_row + missing)
+            target_rows.extend(range(first_new_row, first_new_row + missing))
+
+        columns = [(self.fields.index(name), [_to_cell_text(value) for value in df[name].tolist()])
+                   for name in df.columns if name in self.fields]
+        if not columns:
+            return []
+
+        self.write_cells(
+            ((row, col, text)
+             for col, texts in columns
+             for row, text in zip(target_rows, texts)),
+            undo_text="Load samples",
+        )
 
-                    if isinstance(value, list):
-                        value = to_json(value)
+        return target_rows
 
-                    if isinstance(value, dict):
-                        value = to_json(value)
+    def column_texts(self, column: int) -> List[str]:
+        """Return the cell texts of a column, from the first to the last row."""
+        return [self._cell_text(row, column) for row in range(self.rowCount())]
 
-                    item = QStandardItem(str(value))
-                    self.setItem(first_empty_row, col_index, item)
+    def lane_masks(self) -> np.ndarray:
+        """Return the lane bitmask of every row."""
+        return np.fromiter((self.lane_mask(row) for row in range(self.rowCount())),
+                           dtype=np.uint8, count=self.rowCount())
+
+    def load_columns(self, row_count: int, columns: Dict[str, Column]) -> None:
+        """
+        Replace the sample data with the columns of a project file.
+
+        List-valued cells are parsed once per distinct value, the Lane column is
+        written from its bitmasks. Views see one dataChanged over the table and
+        the undo history is cleared.
+
+        Args:
+            row_count: The number of rows of the table.
+            columns: Mapping of field name to a dictionary coded text column, or
+                to an array of lane bitmasks for Lane. Unknown fields are skipped.
+        """
+        self.setRowCount(row_count)
+
+        was_blocked = self.blockSignals(True)
+        try:
+            for row in range(row_count):
+                for column in range(self.columnCount()):
+                    self._set_cell_text(row, column, "")
+
+            for name, data in columns.items():
+                if name not in self.fields:
+                    continue
+                column = self.fields.index(name)
+
+                if isinstance(data, DictColumn):
+                    list_codes = [self._parse_list_cell(column, value) for value in data.values] \
+                        if column in self._list_columns else None
+                    for row, code in enumerate(data.codes[:row_count].tolist()):
+                        if list_codes is not None:
+                            self._set_cell_text(row, column, data.values[code], list_codes[code])
+                        else:
+                            self._set_cell_text(row, column, data.values[code])
+                elif column == self._lane_column:
+                    for row, mask in enumerate(data[:row_count].tolist()):
+                        self._set_list_cell(row, column, mask)
+        finally:
+            self.blockSignals(was_blocked)
+
+        self.undo_stack.clear()
+        self.refresh_view()
+
+    def set_worksheet_data(self, df):
+        self.load_dataframe(df)
 
     def dropMimeData(self, data, action, row, column, parent) -> bool:
         """
@@ -189,37 +773,23 @@ class SampleModel(QStandardItemModel):
             bool: True if the drop was successful, False otherwise.
         """
 
-        print(data)
-
-        json_data_qba = data.data("application/json")
-
-        print(json_data_qba)
-
-        decoded_data = decode_bytes_json(json_data_qba)
-
-        print(decoded_data)
+        start_row = parent.row() if parent.isValid() else row
+        if start_row < 0:
+            return False
 
-        data = {"start_row": parent.row(), "decoded_data": decoded_data}
-        self.dropped_data.emit(data)
-
-        self.blockSignals(True)
-
-        for i, row_data in enumerate(decoded_data):
-            for key, value in row_data.items():
-                row = parent.row() + i
-                if key in self.fields:
-                    column = self.fields.index(key)
-                    self.setData(self.index(row, column), value)
+        if data.hasFormat(INDEX_COLUMNS_MIME_TYPE):
+            decoded_data = decode_index_columns(data.data(INDEX_COLUMNS_MIME_TYPE))
+        else:
+            decoded_data = None
 
-        self.blockSignals(False)
+        if decoded_data is None:
+            if not data.hasFormat(INDEX_JSON_MIME_TYPE):
+                return False
+            decoded_data = records_to_columns(decode_bytes_json(data.data(INDEX_JSON_MIME_TYPE)))
 
-        self.dataChanged.emit(
-            self.index(0, 0),
-            self.index(self.rowCount() - 1, self.columnCount() - 1),
-            Qt.DisplayRole,
-        )
+        self.dropped_data.emit({"start_row": start_row, "decoded_data": decoded_data})
 
-        return True
+        return self.set_column_data(start_row, decoded_data)
 
     def flags(self, index):
         """
@@ -241,33 +811,6 @@ class SampleModel(QStandardItemModel):
             flags |= Qt.ItemIsDropEnabled
         return flags
 
-    def _convert_string_to_list(self, value):
-        """Convert string representation of a list to a Python list.
-        
-        Args:
-            value: The value to convert (string, list, or other)
-            
-        Returns:
-            The converted value or original value if not a string list representation
-        """
-        if not isinstance(value, str) or not value.startswith('[') or not value.endswith(']'):
-            return value
-            
-        try:
-            # Try to evaluate as a Python literal (safe for strings, numbers, tuples, lists, dicts, booleans, and None)
-            import ast
-            result = ast.literal_eval(value)
-            return result if isinstance(result, list) else value
-        except (ValueError, SyntaxError):
-            # If evaluation fails, try to parse as a list of strings
-            try:
-                # Remove brackets and split by comma, then strip whitespace
-                items = [item.strip().strip("'\"") for item in value[1:-1].split(',')]
-                # Remove empty strings that might result from splitting
-                return [item for item in items if item]
-            except Exception:
-                return value
-
     def get_index_length_stats(self) -> dict:
         """
         Optimized version to calculate min/max lengths of IndexI5 and IndexI7 columns.
@@ -360,10 +903,11 @@ class SampleModel(QStandardItemModel):
                 df["BarcodeMismatchesIndex1"] = df["BarcodeMismatchesIndex1"].apply(self.safe_convert_numeric)
             if "BarcodeMismatchesIndex2" in df.columns:
                 df["BarcodeMismatchesIndex2"] = df["BarcodeMismatchesIndex2"].apply(self.safe_convert_numeric)
+            # List-valued columns come from their structured values, no parsing needed
             if "Lane" in df.columns:
-                df["Lane"] = df["Lane"].apply(self.safe_literal_eval)
-            if "ApplicationProfileName" in df.columns:
-                df["ApplicationProfileName"] = df["ApplicationProfileName"].apply(self.safe_literal_eval)
+                df["Lane"] = [self._lane_cell_value(row) for row in df.index]
+            if "ApplicationProfileId" in df.columns:
+                df["ApplicationProfileId"] = [list(self.profile_ids(row)) or None for row in df.index]
 
         return df
 
@@ -380,16 +924,6 @@ class SampleModel(QStandardItemModel):
             return pd.NA
 
 
-    @staticmethod
-    def safe_literal_eval(x):
-        if pd.isna(x):  # This catches <NA>, NaN, None
-            return None  # or return [] for empty list, or whatever default you want
-        try:
-            return ast.literal_eval(x)
-        except (ValueError, SyntaxError):
-            return None  # Handle other malformed strings
-
-
     @staticmethod
     def reverse_complement(sequence):
         complement = {"A": "T", "T": "A", "C": "G", "G": "C"}
@@ -397,41 +931,12 @@ class SampleModel(QStandardItemModel):
 
     def populate_from_dataframe(self, df: pd.DataFrame) -> None:
         """
-        Populate the model from a pandas DataFrame, starting from the first empty row in Sample_ID.
-        
+        Populate the model from a pandas DataFrame, filling the empty rows first.
+
         Args:
             df: DataFrame containing data to populate. Column names should match model headers.
         """
-        if df.empty:
-            return
-            
-        # Find the first empty row in Sample_ID column
-        sample_id_col = self.fields.index("Sample_ID")
-        start_row = 0
-        for row in range(self.rowCount()):
-            if not self.index(row, sample_id_col).data():
-                start_row = row
-                break
-        
-        # If no empty rows found, append new rows
-        if start_row == 0 and self.index(0, sample_id_col).data():
-            start_row = self.rowCount()
-            self.setRowCount(start_row + len(df))
-        
-        # Populate data
-        for df_row, (_, row_data) in enumerate(df.iterrows()):
-            target_row = start_row + df_row
-            if target_row >= self.rowCount():
-                self.insertRow(target_row)
-                
-            for col, field in enumerate(self.fields):
-                if field in row_data and pd.notna(row_data[field]):
-                    value = row_data[field]
-                    if pd.api.types.is_list_like(value) and not isinstance(value, str):
-                        value = ", ".join(map(str, value))
-                    self.setData(self.index(target_row, col), str(value))
-        
-        self.layoutChanged.emit()
+        self.load_dataframe(df)
 
 
 class CustomProxyModel(QSortFilterProxyModel):
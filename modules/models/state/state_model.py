@@ -6,17 +6,19 @@ instrument configuration, and validation states. It provides a reactive interfac
 using Qt signals to notify about state changes.
 """
 import json
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum, auto
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
 from PySide6.QtCore import QObject, Signal, Slot
 
 from modules.models.configuration.configuration_manager import ConfigurationManager
+from modules.models.sample.lane_partition import LanePartition
 from modules.models.sample.sample_model import SampleModel
 from modules.utils.utils import uuid
 
@@ -165,7 +167,91 @@ class StateModel(QObject):
         
         # Initialize run info with default values
         self._run_info = RunInfo()
-        
+
+        # Sample data derived from the sample model, cached per model generation
+        self._sample_df_cache: Optional[pd.DataFrame] = None
+        self._sample_df_generation = -1
+        self._lane_partition_cache: Optional[LanePartition] = None
+        self._lane_partition_generation = -1
+
+        # Batched updates, see batch()
+        self._batch_depth = 0
+        self._batch_start: Optional[Dict[str, Any]] = None
+        self._pending_signals: Dict[str, tuple] = {}
+        self._validate_pending = False
+
+    @contextmanager
+    def batch(self) -> Iterator["StateModel"]:
+        """Group state updates into one transaction.
+
+        Change signals are deferred to the end of the outermost batch, with the
+        latest value per signal. Signals of fields that end at their value from
+        before the batch are dropped, _validate_run_info runs once, and
+        state_changed is emitted once with the changed run info fields.
+
+        Example:
+            with state_model.batch():
+                state_model.instrument = "NovaSeq X"
+                state_model.flowcell = "25B"
+        """
+        if self._batch_depth == 0:
+            self._batch_start = asdict(self._run_info)
+            self._pending_signals = {}
+            self._validate_pending = False
+
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _emit(self, signal_name: str, *args) -> None:
+        """Emit a change signal, or defer it to the end of the current batch."""
+        if self._batch_depth:
+            self._pending_signals.pop(signal_name, None)
+            self._pending_signals[signal_name] = args
+            return
+
+        getattr(self, signal_name).emit(*args)
+
+    # signals whose run info fields are not named after the signal
+    _SIGNAL_FIELDS = {
+        "run_cycles_changed": ("read1_cycles", "index1_cycles", "index2_cycles", "read2_cycles"),
+        "sample_application_profile_changed": ("sample_application_profile_names",),
+        "validation_status": ("is_validated",),
+        "file_data_status_signal": ("file_data_generated",),
+    }
+
+    def _flush_batch(self) -> None:
+        start = self._batch_start
+        current = asdict(self._run_info)
+        changes = {name: value for name, value in current.items() if start.get(name) != value}
+
+        pending = self._pending_signals
+        self._batch_start = None
+        self._pending_signals = {}
+
+        for signal_name, args in pending.items():
+            fields = self._SIGNAL_FIELDS.get(signal_name)
+            if fields is None and signal_name.endswith("_changed"):
+                name = signal_name[:-len("_changed")]
+                fields = (name,) if name in current else None
+
+            # deduplicate values that are back where the batch started
+            if fields is not None and not any(name in changes for name in fields):
+                continue
+
+            getattr(self, signal_name).emit(*args)
+
+        if self._validate_pending:
+            self._validate_pending = False
+            self._validate_run_info()
+
+        if changes:
+            self.state_changed.emit(changes)
+
 
     # @property
     # def run_info(self) -> dict:
@@ -187,35 +273,71 @@ class StateModel(QObject):
             self._logger.debug("No fields to update in update_run_info")
             return
 
-        changed = False
+        # One transaction, so dependent fields and validation only notify once
+        with self.batch():
+            # Apply updates and track changes
+            for key, value in run_setup_data.items():
+                if not hasattr(self._run_info, key):
+                    self._logger.warning(f"Attempted to set unknown run info field: {key}")
+                    continue
+                    
+                current_value = getattr(self._run_info, key)
+                if current_value != value:
+                    setattr(self._run_info, key, value)
+
+                    # Emit specific signal for this property
+                    signal_name = f"{key}_changed"
+                    if hasattr(self, signal_name):
+                        self._emit(signal_name, value)
+
+            self._set_dependent_data_from_config()
+            self._validate_run_info()
+
+    def load_run_info(self, run_info: dict) -> None:
+        """
+        Replace the run info with one saved in a project file.
 
-        # Apply updates and track changes
-        for key, value in run_setup_data.items():
-            if not hasattr(self._run_info, key):
-                self._logger.warning(f"Attempted to set unknown run info field: {key}")
-                continue
-                
-            current_value = getattr(self._run_info, key)
-            if current_value != value:
-                setattr(self._run_info, key, value)
-                changed = True
+        Unlike set_run_setup_data the dependent fields are taken as saved
+        instead of from the instrument config, and the validation state is kept.
 
-                # Emit specific signal for this property
-                signal_name = f"{key}_changed"
-                if hasattr(self, signal_name):
-                    getattr(self, signal_name).emit(value)
+        Args:
+            run_info: Dictionary of RunInfo fields
+        """
+        with self.batch():
+            for key, value in run_info.items():
+                if not hasattr(self._run_info, key):
+                    self._logger.warning(f"Ignoring unknown run info field in project: {key}")
+                    continue
+
+                if getattr(self._run_info, key) != value:
+                    setattr(self._run_info, key, value)
 
-        self._set_dependent_data_from_config()
-        self._validate_run_info()
+                    signal_name = f"{key}_changed"
+                    if hasattr(self, signal_name):
+                        self._emit(signal_name, value)
+
+            # signals not named after their fields, the batch drops the unchanged ones
+            self._emit("run_cycles_changed", *self.run_cycles)
+            self._emit("sample_application_profile_changed", self._run_info.sample_application_profile_names)
+            self._emit("validation_status", self._run_info.is_validated)
+            self._emit("file_data_status_signal", self._run_info.file_data_generated)
+
+            self._validate_run_info()
 
 
     def _validate_run_info(self) -> None:
         """Validate all run info fields and update completion status.
+
+        Inside a batch the validation runs once, when the batch ends.
         
         Returns:
             bool: True if all validations pass, False otherwise
             dict: Dictionary containing validation results for each field
         """
+        if self._batch_depth:
+            self._validate_pending = True
+            return
+
         validations = {
             'required_fields': {
                 'date': bool(self._run_info.date),
@@ -270,9 +392,9 @@ class StateModel(QObject):
         if all_valid != self._run_info_complete:
             self._run_info_complete = all_valid
             if self._run_info_complete:
-                self.run_info_ready.emit()
+                self._emit("run_info_ready")
             else:
-                self.run_info_not_ready.emit()
+                self._emit("run_info_not_ready")
 
     @property
     def run_description(self) -> str:
@@ -283,7 +405,7 @@ class StateModel(QObject):
         if self._run_info.run_description != value:
             self.mark_as_unvalidated()
             self._run_info.run_description = value
-            self.run_description_changed.emit(value)
+            self._emit("run_description_changed", value)
 
     @staticmethod
     def _current_date_as_string():
@@ -350,24 +472,25 @@ class StateModel(QObject):
             .get("C")
         )
 
-        self.lanes = lanes
-        self.chemistry = chemistry
-        self.i5_seq_orientation = i5_seq_orientation
-        self.i5_samplesheet_orientation_bcl2fastq = i5_samplesheet_orientation_bcl2fastq
-        self.i5_samplesheet_orientation_bclconvert = i5_samplesheet_orientation_bclconvert
-        self.assess_color_balance = assess_color_balance
+        with self.batch():
+            self.lanes = lanes
+            self.chemistry = chemistry
+            self.i5_seq_orientation = i5_seq_orientation
+            self.i5_samplesheet_orientation_bcl2fastq = i5_samplesheet_orientation_bcl2fastq
+            self.i5_samplesheet_orientation_bclconvert = i5_samplesheet_orientation_bclconvert
+            self.assess_color_balance = assess_color_balance
 
-        self.date = self._current_date_as_string()
+            self.date = self._current_date_as_string()
 
-        self.color_a = color_a
-        self.color_t = color_t
-        self.color_g = color_g
-        self.color_c = color_c
+            self.color_a = color_a
+            self.color_t = color_t
+            self.color_g = color_g
+            self.color_c = color_c
 
-        self.sample_index1_minlen = 0
-        self.sample_index1_maxlen = 0
-        self.sample_index2_minlen = 0
-        self.sample_index2_maxlen = 0
+            self.sample_index1_minlen = 0
+            self.sample_index1_maxlen = 0
+            self.sample_index2_minlen = 0
+            self.sample_index2_maxlen = 0
 
         # self._check_run_info_complete()
 
@@ -403,13 +526,13 @@ class StateModel(QObject):
             field_value = getattr(self._run_info, field_name, None)
             if not field_value:
                 if self._run_info_complete:  # Only emit if state is changing
-                    self.run_info_ready.emit(False)
+                    self._emit("run_info_ready", False)
                 self._run_info_complete = False
                 return
         
         # All fields are valid
         if not self._run_info_complete:  # Only emit if state is changing
-            self.run_info_ready.emit(True)
+            self._emit("run_info_ready", True)
         self._run_info_complete = True
 
     @staticmethod
@@ -440,19 +563,20 @@ class StateModel(QObject):
 
     def update_aggregate_sample_data(self):
         """Update the minimum and maximum lengths of index sequences from the sample model."""
-        df = self._sample_model.to_dataframe()
+        df = self.sample_df
 
         # Get lengths for both index columns
         i7_min, i7_max = self._get_str_lengths_in_df_col(df["IndexI7"])
         i5_min, i5_max = self._get_str_lengths_in_df_col(df["IndexI5"])
 
         # Update the state model
-        self.sample_index1_minlen = int(i7_min)
-        self.sample_index1_maxlen = int(i7_max)
-        self.sample_index2_minlen = int(i5_min)
-        self.sample_index2_maxlen = int(i5_max)
+        with self.batch():
+            self.sample_index1_minlen = int(i7_min)
+            self.sample_index1_maxlen = int(i7_max)
+            self.sample_index2_minlen = int(i5_min)
+            self.sample_index2_maxlen = int(i5_max)
 
-        self.sample_application_profile_ids = self._get_unique_strings_explode(df["ApplicationProfileId"])
+            self.sample_application_profile_ids = self._get_unique_strings_explode(df["ApplicationProfileId"])
 
 
     @property
@@ -468,7 +592,7 @@ class StateModel(QObject):
     def samplesheet_v2(self, samplesheet: str):
         if self._run_info.samplesheet_v2 != samplesheet:
             self._run_info.samplesheet_v2 = samplesheet
-            self.samplesheet_v2_changed.emit(samplesheet)
+            self._emit("samplesheet_v2_changed", samplesheet)
             self.mark_as_generated()
 
     @property
@@ -479,7 +603,7 @@ class StateModel(QObject):
     def json(self, json: str):
         if self._run_info.json != json:
             self._run_info.json = json
-            self.json_changed.emit(json)
+            self._emit("json_changed", json)
             self.mark_as_generated()
 
 
@@ -491,7 +615,7 @@ class StateModel(QObject):
     def uuid(self, uuid):
         if uuid != self._run_info.uuid:
             self._run_info.uuid = uuid
-            self.uuid_changed.emit(uuid)
+            self._emit("uuid_changed", uuid)
 
     @property
     def sample_application_profile_ids(self) -> list:
@@ -501,7 +625,7 @@ class StateModel(QObject):
     def sample_application_profile_ids(self, sample_application_profile_names: list):
         if set(sample_application_profile_names) != set(self._run_info.sample_application_profile_names):
             self._run_info.sample_application_profile_names = sample_application_profile_names
-            self.sample_application_profile_changed.emit(sample_application_profile_names)
+            self._emit("sample_application_profile_changed", sample_application_profile_names)
             self.mark_as_unvalidated()
 
     @property
@@ -518,14 +642,14 @@ class StateModel(QObject):
         if not self._run_info.is_validated:
             self._run_info.is_validated = True
             self.uuid = uuid()
-            self.validation_status.emit(True)
+            self._emit("validation_status", True)
 
     def mark_as_unvalidated(self) -> None:
         """Mark the current state as validated."""
         if self._run_info.is_validated:
             self._run_info.is_validated = False
             self.uuid = "None"
-            self.validation_status.emit(False)
+            self._emit("validation_status", False)
             self._run_info.file_data_generated = False
             self.samplesheet_v2 = ""
             self.json = ""
@@ -535,7 +659,7 @@ class StateModel(QObject):
             return
 
         self._run_info.file_data_generated = True
-        self.file_data_status_signal.emit(True)
+        self._emit("file_data_status_signal", True)
 
 
     @property
@@ -550,7 +674,7 @@ class StateModel(QObject):
 
         self._run_info.assess_color_balance = assess_color_balance
         self.mark_as_unvalidated()
-        self.assess_color_balance_changed.emit(assess_color_balance)
+        self._emit("assess_color_balance_changed", assess_color_balance)
 
 
     @property
@@ -564,7 +688,7 @@ class StateModel(QObject):
 
         self._run_info.instrument = instrument
         self.mark_as_unvalidated()
-        self.instrument_changed.emit(instrument)
+        self._emit("instrument_changed", instrument)
 
     @property
     def base_colors(self):
@@ -580,12 +704,12 @@ class StateModel(QObject):
     @color_a.setter
     def color_a(self, color_a: object):
 
-        if self._run_info.color_t == color_a:
+        if self._run_info.color_a == color_a:
             return
 
         self._run_info.color_a = color_a
         self.mark_as_unvalidated()
-        self.color_a_changed.emit(color_a)
+        self._emit("color_a_changed", color_a)
 
     @property
     def color_t(self):
@@ -598,7 +722,7 @@ class StateModel(QObject):
 
         self._run_info.color_t = color_t
         self.mark_as_unvalidated()
-        self.color_t_changed.emit(color_t)
+        self._emit("color_t_changed", color_t)
 
     @property
     def color_g(self):
@@ -611,7 +735,7 @@ class StateModel(QObject):
 
         self._run_info.color_g = color_g
         self.mark_as_unvalidated()
-        self.color_g_changed.emit(color_g)
+        self._emit("color_g_changed", color_g)
 
     @property
     def color_c(self):
@@ -624,7 +748,7 @@ class StateModel(QObject):
 
         self._run_info.color_c = color_c
         self.mark_as_unvalidated()
-        self.color_c_changed.emit(color_c)
+        self._emit("color_c_changed", color_c)
 
     @property
     def chemistry(self) -> str:
@@ -635,7 +759,7 @@ class StateModel(QObject):
         if self._run_info.chemistry != value:
             self.mark_as_unvalidated()
             self._run_info.chemistry = value
-            self.chemistry_changed.emit(value)
+            self._emit("chemistry_changed", value)
 
     @property
     def date(self) -> str:
@@ -646,7 +770,7 @@ class StateModel(QObject):
         if self._run_info.date != value:
             self.mark_as_unvalidated()
             self._run_info.date = value
-            self.date_changed.emit(value)
+            self._emit("date_changed", value)
 
     @property
     def flowcell(self) -> str:
@@ -657,7 +781,7 @@ class StateModel(QObject):
         if self._run_info.flowcell != value:
             self.mark_as_unvalidated()
             self._run_info.flowcell = value
-            self.flowcell_changed.emit(value)
+            self._emit("flowcell_changed", value)
 
     @property
     def run_name(self) -> str:
@@ -668,7 +792,7 @@ class StateModel(QObject):
         if self._run_info.run_name != value:
             self.mark_as_unvalidated()
             self._run_info.run_name = value
-            self.run_name_changed.emit(value)
+            self._emit("run_name_changed", value)
     
     @property
     def reagent_kit(self) -> str:
@@ -679,7 +803,7 @@ class StateModel(QObject):
         if self._run_info.reagent_kit != value:
             self.mark_as_unvalidated()
             self._run_info.reagent_kit = value
-            self.reagent_kit_changed.emit(value)
+            self._emit("reagent_kit_changed", value)
 
     @property
     def i5_samplesheet_orientation_bcl2fastq(self) -> str:
@@ -690,7 +814,7 @@ class StateModel(QObject):
         if self._run_info.i5_samplesheet_orientation_bcl2fastq != value:
             self.mark_as_unvalidated()
             self._run_info.i5_samplesheet_orientation_bcl2fastq = value
-            self.i5_samplesheet_orientation_bcl2fastq_changed.emit(value)
+            self._emit("i5_samplesheet_orientation_bcl2fastq_changed", value)
 
     @property
     def i5_samplesheet_orientation_bclconvert(self) -> str:
@@ -701,7 +825,7 @@ class StateModel(QObject):
         if self._run_info.i5_samplesheet_orientation_bclconvert != value:
             self.mark_as_unvalidated()
             self._run_info.i5_samplesheet_orientation_bclconvert = value
-            self.i5_samplesheet_orientation_bclconvert_changed.emit(value)
+            self._emit("i5_samplesheet_orientation_bclconvert_changed", value)
 
     @property
     def lanes(self) -> list[int]:
@@ -714,31 +838,27 @@ class StateModel(QObject):
             return
 
         self._run_info.lanes = lanes
-        self.lanes_changed.emit(lanes)
+        self._emit("lanes_changed", lanes)
 
     @property
     def run_cycles(self) -> tuple[int, int, int, int]: # read1_cycles, index1_cycles, index2_cycles, read2_cycles
         return (self._run_info.read1_cycles,
                 self._run_info.index1_cycles,
                 self._run_info.index2_cycles,
-                self._run_info.read1_cycles)
+                self._run_info.read2_cycles)
 
     @run_cycles.setter
     def run_cycles(self, run_cycle_values: tuple[int, int, int, int]): # read1_cycles, index1_cycles, index2_cycles, read2_cycles
 
         read1_cycles, index1_cycles, index2_cycles, read2_cycles = run_cycle_values
 
-        if (self._run_info.read1_cycles != read1_cycles and
-                   self._run_info.index1_cycles != index1_cycles and
-                   self._run_info.index2_cycles != index2_cycles and
-                   self._run_info.read2_cycles != read2_cycles
-                   ):
+        if self.run_cycles != (read1_cycles, index1_cycles, index2_cycles, read2_cycles):
 
             self._run_info.read1_cycles = read1_cycles
             self._run_info.index1_cycles = index1_cycles
             self._run_info.index2_cycles = index2_cycles
             self._run_info.read2_cycles = read2_cycles
-            self.run_cycles_changed.emit(read1_cycles, index1_cycles, index2_cycles, read2_cycles)
+            self._emit("run_cycles_changed", read1_cycles, index1_cycles, index2_cycles, read2_cycles)
 
 
     @property
@@ -750,7 +870,7 @@ class StateModel(QObject):
         if self._run_info.index1_cycles != value:
             self.mark_as_unvalidated()
             self._run_info.index1_cycles = value
-            self.index1_cycles_changed.emit(value)
+            self._emit("index1_cycles_changed", value)
 
     @property
     def index2_cycles(self) -> int:
@@ -761,7 +881,7 @@ class StateModel(QObject):
         if self._run_info.index2_cycles != value:
             self.mark_as_unvalidated()
             self._run_info.index2_cycles = value
-            self.index2_cycles_changed.emit(value)
+            self._emit("index2_cycles_changed", value)
 
     @property
     def read1_cycles(self) -> int:
@@ -772,7 +892,7 @@ class StateModel(QObject):
         if self._run_info.read1_cycles != value:
             self.mark_as_unvalidated()
             self._run_info.read1_cycles = value
-            self.read1_cycles_changed.emit(value)
+            self._emit("read1_cycles_changed", value)
 
     @property
     def read2_cycles(self) -> int:
@@ -783,7 +903,7 @@ class StateModel(QObject):
         if self._run_info.read2_cycles != value:
             self.mark_as_unvalidated()
             self._run_info.read2_cycles = value
-            self.read2_cycles_changed.emit(value)
+            self._emit("read2_cycles_changed", value)
 
     @property
     def custom_cycles(self) -> bool:
@@ -794,7 +914,7 @@ class StateModel(QObject):
         if self._run_info.custom_cycles != custom_cycles:
             self.mark_as_unvalidated()
             self._run_info.custom_cycles = custom_cycles
-            self.custom_cycles_changed.emit(custom_cycles)
+            self._emit("custom_cycles_changed", custom_cycles)
 
     @property
     def i5_seq_orientation(self) -> str:
@@ -805,7 +925,7 @@ class StateModel(QObject):
         if self._run_info.i5_seq_orientation != i5_seq_orientation:
             self.mark_as_unvalidated()
             self._run_info.i5_seq_orientation = i5_seq_orientation
-            self.i5_seq_orientation_changed.emit(i5_seq_orientation)
+            self._emit("i5_seq_orientation_changed", i5_seq_orientation)
 
     @property
     def dragen_app_version(self) -> str:
@@ -816,7 +936,7 @@ class StateModel(QObject):
         if self._run_info.dragen_app_version != dragen_app_version:
             self.mark_as_unvalidated()
             self._run_info.dragen_app_version = dragen_app_version
-            self.dragen_app_version_changed.emit(dragen_app_version)
+            self._emit("dragen_app_version_changed", dragen_app_version)
 
     @property
     def sample_index1_minlen(self) -> int:
@@ -827,7 +947,7 @@ class StateModel(QObject):
         if self._run_info.sample_index1_minlen != sample_index1_minlen:
             self.mark_as_unvalidated()
             self._run_info.sample_index1_minlen = sample_index1_minlen
-            self.sample_index1_minlen_changed.emit(sample_index1_minlen)
+            self._emit("sample_index1_minlen_changed", sample_index1_minlen)
 
     @property
     def sample_index1_maxlen(self) -> int:
@@ -838,7 +958,7 @@ class StateModel(QObject):
         if self._run_info.sample_index1_maxlen != sample_index1_maxlen:
             self.mark_as_unvalidated()
             self._run_info.sample_index1_maxlen = sample_index1_maxlen
-            self.sample_index1_maxlen_changed.emit(sample_index1_maxlen)
+            self._emit("sample_index1_maxlen_changed", sample_index1_maxlen)
 
 
     @property
@@ -850,7 +970,7 @@ class StateModel(QObject):
         if self._run_info.sample_index2_minlen != sample_index2_minlen:
             self.mark_as_unvalidated()
             self._run_info.sample_index2_minlen = sample_index2_minlen
-            self.sample_index2_minlen_changed.emit(sample_index2_minlen)
+            self._emit("sample_index2_minlen_changed", sample_index2_minlen)
 
     @property
     def sample_index2_maxlen(self) -> int:
@@ -861,11 +981,36 @@ class StateModel(QObject):
         if self._run_info.sample_index2_maxlen != sample_index2_maxlen:
             self.mark_as_unvalidated()
             self._run_info.sample_index2_maxlen = sample_index2_maxlen
-            self.sample_index2_maxlen_changed.emit(sample_index2_maxlen)
+            self._emit("sample_index2_maxlen_changed", sample_index2_maxlen)
+
+    @property
+    def sample_generation(self) -> int:
+        """Generation of the sample model, increases on every change of the sample data."""
+        return self._sample_model.generation
 
     @property
     def sample_df(self) -> pd.DataFrame:
-        return self._sample_model.to_dataframe()
+        """The sample data as a dataframe, rebuilt only when the sample model changed.
+
+        Each call returns a copy of the cached dataframe, so callers may modify it.
+        """
+        return self._cached_sample_df().copy()
+
+    def _cached_sample_df(self) -> pd.DataFrame:
+        generation = self._sample_model.generation
+        if self._sample_df_cache is None or self._sample_df_generation != generation:
+            self._sample_df_cache = self._sample_model.to_dataframe()
+            self._sample_df_generation = generation
+        return self._sample_df_cache
+
+    @property
+    def lane_partition(self) -> LanePartition:
+        """The sample data partitioned by lane, built once per sample model generation."""
+        generation = self._sample_model.generation
+        if self._lane_partition_cache is None or self._lane_partition_generation != generation:
+            self._lane_partition_cache = LanePartition(self._cached_sample_df())
+            self._lane_partition_generation = generation
+        return self._lane_partition_cache
 
     @property
     def has_run_info(self) -> bool:
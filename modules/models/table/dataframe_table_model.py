@@ -0,0 +1,134 @@
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+
+def _to_text(value: Any) -> str:
+    """Display text of a cell value, list-like values are joined and missing values are empty."""
+    if isinstance(value, (list, tuple, set)):
+        return ', '.join(map(str, value))
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """A read-only table model over the column arrays of a pandas DataFrame.
+
+    The model keeps the underlying NumPy array of each column and converts a
+    column to display strings the first time one of its cells is shown, so
+    creating the model does not depend on the number of cells. Sorting, when
+    enabled, permutes rows through an argsort of the sorted column instead of
+    reordering the data.
+
+    Args:
+        dataframe: The DataFrame to display, it is not copied and must not be modified
+        sortable: Whether sort() reorders the rows
+        parent: Optional parent QObject.
+    """
+
+    def __init__(self, dataframe: pd.DataFrame, sortable: bool = True, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("dataframe must be a pandas DataFrame")
+
+        self._headers: List[str] = [str(column) for column in dataframe.columns]
+        self._arrays: List[np.ndarray] = [
+            dataframe.iloc[:, i].to_numpy() for i in range(dataframe.shape[1])
+        ]
+        self._row_count = dataframe.shape[0]
+        self._sortable = sortable
+
+        self._text_cache: Dict[int, np.ndarray] = {}
+        self._order: Optional[np.ndarray] = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._arrays)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Return the cached display text of a cell for the display and tooltip roles.
+
+        Args:
+            index: The index of the cell.
+            role: The requested role.
+
+        Returns:
+            The cell text, its alignment, or None for other roles.
+        """
+        if not index.isValid():
+            return None
+
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            row = index.row() if self._order is None else self._order[index.row()]
+            return self._column_text(index.column())[row]
+
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+
+        if orientation == Qt.Vertical and 0 <= section < self._row_count:
+            return str(section + 1)
+
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """Order the rows by column, through a stable argsort of its values.
+
+        Args:
+            column: The column to sort by, a negative column restores the original order.
+            order: The sort order.
+        """
+        if not self._sortable:
+            return
+
+        self.beginResetModel()
+
+        if not 0 <= column < len(self._arrays):
+            self._order = None
+        else:
+            self._order = self._argsort(column)
+            if order == Qt.DescendingOrder:
+                self._order = self._order[::-1]
+
+        self.endResetModel()
+
+    def _argsort(self, column: int) -> np.ndarray:
+        values = self._arrays[column]
+        if values.dtype != object:
+            try:
+                return np.argsort(values, kind="stable")
+            except TypeError:
+                pass
+        # mixed or object values are ordered by their display text
+        return np.argsort(self._column_text(column).astype(str), kind="stable")
+
+    def _column_text(self, column: int) -> np.ndarray:
+        text = self._text_cache.get(column)
+        if text is None:
+            text = np.array([_to_text(value) for value in self._arrays[column]], dtype=object)
+            self._text_cache[column] = text
+        return text
@@ -0,0 +1,21 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from modules.models.sample.sample_model import SampleModel
+
+SAMPLE_FIELDS = ["Lane", "Sample_ID", "IndexI7", "IndexI5", "ApplicationProfileId"]
+
+
+class FakeConfigurationManager:
+    samples_settings = {"fields": {"Sample": SAMPLE_FIELDS}, "row_count": 4}
+
+
+@pytest.fixture
+def make_sample_model():
+    """Return a factory of empty four row SampleModels with SAMPLE_FIELDS."""
+    QCoreApplication.instance() or QCoreApplication([])
+
+    def make() -> SampleModel:
+        return SampleModel(FakeConfigurationManager(), None)
+
+    return make
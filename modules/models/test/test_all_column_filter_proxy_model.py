@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from PySide6.QtCore import QCoreApplication, Qt
+
+from modules.models.indexes.all_column_filter_proxy_model import AllColumnFilterProxyModel
+from modules.models.indexes.index_table_model import IndexTableModel
+
+
+@pytest.fixture(autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_search_keys_match_display_text():
+    df = pd.DataFrame({
+        "IndexI7": ["ACGT", np.nan, None, "TTGA"],
+        "Cycles": [1.5, np.nan, 2.0, 3.0],
+        "Ratio": np.array([0.1, 0.2, np.nan, 0.4], dtype=np.float32),
+        "Lanes": [[1, 2], [3], [], [4]],
+    })
+    model = IndexTableModel(df)
+    proxy = AllColumnFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    displayed = [
+        proxy._KEY_SEPARATOR.join(
+            model.data(model.index(row, column), Qt.DisplayRole) for column in range(model.columnCount())
+        ).lower()
+        for row in range(model.rowCount())
+    ]
+    assert proxy._search_keys.tolist() == displayed
+
+    proxy.set_filter_text("nan")
+    assert proxy.rowCount() == 0
+
+    proxy.set_filter_text("[1, 2]")
+    assert proxy.rowCount() == 1
+
+    proxy.set_filter_text("0.10000")
+    assert proxy.rowCount() == 0
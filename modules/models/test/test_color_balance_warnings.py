@@ -0,0 +1,25 @@
+import numpy as np
+
+from modules.models.validation.color_balance.color_balance_warnings import (
+    ColorBalanceWarning,
+    base_color_weights,
+    color_balance_warnings,
+    encode_bases,
+)
+
+# two channel chemistry: G is dark
+BASE_COLORS = {"A": ["blue", "green"], "C": ["blue"], "G": [], "T": ["green"]}
+
+
+def test_warnings_flag_dark_runs_and_same_colors():
+    codes = encode_bases(np.array([list("GGAC"), list("GGAT")], dtype=object))
+    weights = base_color_weights(BASE_COLORS)
+
+    cell_flags, cycle_flags = color_balance_warnings(codes, np.ones(2), weights)
+
+    assert cell_flags.dtype == np.uint8
+    assert cell_flags[:, :2].tolist() == [[ColorBalanceWarning.DARK_RUN] * 2] * 2
+    assert not cell_flags[:, 2:].any()
+    assert cycle_flags[0] & ColorBalanceWarning.LOW_BLUE and cycle_flags[0] & ColorBalanceWarning.LOW_GREEN
+    assert cycle_flags[2] & ColorBalanceWarning.SAME_COLOR
+    assert not cycle_flags[3] & ColorBalanceWarning.SAME_COLOR
@@ -0,0 +1,187 @@
+import logging
+from dataclasses import asdict
+
+import pytest
+from PySide6.QtCore import QObject, Signal
+
+from modules.models.journal.edit_journal import EditJournal, _shift_rows, replay
+from modules.models.sample.sample_model import SampleModel
+from modules.models.state.state_model import RunInfo
+from modules.utils import json_backend
+
+
+class FakeStateModel(QObject):
+    """Holds a RunInfo and emits state_changed like StateModel does at the end of a batch."""
+
+    state_changed = Signal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.run_info = RunInfo()
+
+    def load_run_info(self, run_info: dict) -> None:
+        changes = {key: value for key, value in run_info.items() if getattr(self.run_info, key) != value}
+        for key, value in changes.items():
+            setattr(self.run_info, key, value)
+        if changes:
+            self.state_changed.emit(changes)
+
+    set_run_setup_data = load_run_info
+
+
+@pytest.fixture
+def make_journal(make_sample_model):
+    def make(journal_dir):
+        sample_model = make_sample_model()
+        state_model = FakeStateModel()
+        journal = EditJournal(sample_model, state_model, logging.getLogger(__name__), journal_dir)
+        return journal, sample_model, state_model
+
+    return make
+
+
+def crash(journal: EditJournal) -> None:
+    """Write the pending records and stop, leaving the journal files behind."""
+    journal.flush()
+    journal._pool.waitForDone()
+    journal._flush_timer.stop()
+    journal._started = False
+    journal._lock_file.unlock()
+
+
+def texts(model: SampleModel, column: int):
+    return [model.item(row, column).text() if model.item(row, column) else "" for row in range(model.rowCount())]
+
+
+def test_shift_rows_insert():
+    cells = {(0, 0): "a", (1, 0): "b", (2, 1): "c"}
+    assert _shift_rows(cells, 1, 2) == {(0, 0): "a", (3, 0): "b", (4, 1): "c"}
+
+
+def test_shift_rows_remove_drops_removed_rows():
+    cells = {(0, 0): "a", (1, 0): "b", (2, 1): "c", (3, 0): "d"}
+    assert _shift_rows(cells, 1, -2) == {(0, 0): "a", (1, 0): "d"}
+
+
+def test_replay_applies_records_in_order():
+    records = [
+        {"seq": 0, "op": "cells", "cells": [[0, 1, "S1"], [1, 1, "S2"]]},
+        {"seq": 1, "op": "insert", "row": 1, "count": 1},
+        {"seq": 2, "op": "cells", "cells": [[1, 1, "new"], [0, 1, ""]]},
+        {"seq": 3, "op": "remove", "row": 2, "count": 1},
+        {"seq": 4, "op": "run_info", "data": {"run_name": "run1"}},
+    ]
+
+    row_count, cells, run_info = replay({"seq": -1, "row_count": 4}, records)
+
+    assert row_count == 4
+    assert cells == {(1, 1): "new"}
+    assert run_info == {"run_name": "run1"}
+
+
+def test_replay_resize_drops_rows_beyond_count():
+    snapshot = {"seq": 0, "row_count": 4, "cells": [[0, 0, "1"], [3, 0, "2"]]}
+    row_count, cells, _ = replay(snapshot, [{"seq": 1, "op": "resize", "count": 2}])
+
+    assert row_count == 2
+    assert cells == {(0, 0): "1"}
+
+
+def test_replay_skips_records_covered_by_snapshot():
+    snapshot = {"seq": 1, "row_count": 3, "cells": [[0, 1, "S1"]], "run_info": {"run_name": "snap"}}
+    records = [
+        {"seq": 0, "op": "insert", "row": 0, "count": 1},
+        {"seq": 1, "op": "run_info", "data": {"run_name": "old"}},
+        {"seq": 2, "op": "cells", "cells": [[1, 1, "S2"]]},
+    ]
+
+    row_count, cells, run_info = replay(snapshot, records)
+
+    assert row_count == 3
+    assert cells == {(0, 1): "S1", (1, 1): "S2"}
+    assert run_info == {"run_name": "snap"}
+
+
+def test_read_records_stops_at_torn_line(tmp_path, make_journal):
+    journal, _, _ = make_journal(tmp_path)
+    complete = [{"seq": 0, "op": "cells", "cells": [[0, 1, "S1"]]}, {"seq": 1, "op": "insert", "row": 0, "count": 1}]
+    data = b"".join(json_backend.dumpb(record) + b"\n" for record in complete)
+    journal._file.journal_path.write_bytes(data + b'{"seq": 2, "op": "cel')
+
+    assert journal._read_records() == complete
+
+
+def test_recover_start_crash_round_trip(tmp_path, make_journal):
+    journal, model, state = make_journal(tmp_path)
+    assert not journal.recover()
+    journal.start()
+
+    state.set_run_setup_data({"run_name": "run1", "instrument": "NovaSeq X", "samplesheet_v2": "generated"})
+    model.write_cells([(0, 1, "S1"), (1, 1, "S2"), (1, 2, "ACGT")])
+    model.insert_rows_unrecorded(0, 1)
+    model.write_cells([(0, 1, "S0")])
+    crash(journal)
+
+    # the recovered state is journaled again by start, including the run info
+    journal, model, state = make_journal(tmp_path)
+    assert journal.recover()
+    journal.start()
+    assert model.rowCount() == 5
+    assert texts(model, 1) == ["S0", "S1", "S2", "", ""]
+    assert state.run_info.run_name == "run1"
+    assert state.run_info.samplesheet_v2 == ""
+
+    state.set_run_setup_data({"run_description": "second session"})
+    crash(journal)
+
+    journal, model, state = make_journal(tmp_path)
+    assert journal.recover()
+    assert texts(model, 1)[:3] == ["S0", "S1", "S2"]
+    assert model.item(2, 2).text() == "ACGT"
+    assert (state.run_info.run_name, state.run_info.instrument, state.run_info.run_description) == \
+        ("run1", "NovaSeq X", "second session")
+    journal.close()
+
+
+def test_recover_after_compaction(tmp_path, make_journal):
+    journal, model, state = make_journal(tmp_path)
+    journal.start()
+
+    model.write_cells([(0, 1, "S1")])
+    journal.flush()
+    journal._compact()
+    model.write_cells([(1, 1, "S2")])
+    crash(journal)
+
+    journal, model, state = make_journal(tmp_path)
+    assert journal.recover()
+    assert texts(model, 1)[:2] == ["S1", "S2"]
+    journal.close()
+
+
+def test_clean_close_leaves_nothing_to_recover(tmp_path, make_journal):
+    journal, model, state = make_journal(tmp_path)
+    journal.start()
+    model.write_cells([(0, 1, "S1")])
+    journal.flush()
+    journal.close()
+
+    journal, model, state = make_journal(tmp_path)
+    assert not journal.recover()
+    assert asdict(state.run_info) == asdict(RunInfo())
+
+
+def test_second_instance_does_not_use_locked_journal(tmp_path, make_journal):
+    first, first_model, _ = make_journal(tmp_path)
+    first.start()
+    first_model.write_cells([(0, 1, "S1")])
+    first.flush()
+    first._pool.waitForDone()
+
+    second, second_model, _ = make_journal(tmp_path)
+    assert not second.recover()
+    second.start()
+    assert texts(second_model, 1)[0] == ""
+    assert second._file.journal_path.exists()
+
+    first.close()
@@ -0,0 +1,27 @@
+from dataclasses import replace
+
+from modules.models.export.export_cache import ExportCache
+from modules.models.test.test_export_samplesheet_v2 import make_export_model, make_snapshot
+from modules.utils import json_backend
+
+
+def test_json_keeps_status_fields():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=2, samples=4, lanes=2)
+    snapshot = replace(snapshot, run_info=replace(snapshot.run_info, is_validated=True))
+
+    run_info = json_backend.loads(export_model._json_text(export_model._build_json_data(snapshot)))["run_info"]
+
+    assert run_info["is_validated"] is True
+    assert run_info["file_data_generated"] is False
+    assert run_info["samplesheet_v2"] == "" and run_info["json"] == ""
+
+
+def test_cache_key_follows_status_fields():
+    run_info = make_snapshot(make_export_model(), profiles=1, samples=1, lanes=1).run_info
+
+    key = ExportCache.key(run_info, 1, {})
+
+    assert ExportCache.key(replace(run_info, is_validated=True), 1, {}) != key
+    assert ExportCache.key(replace(run_info, file_data_generated=True), 1, {}) != key
+    assert ExportCache.key(replace(run_info, samplesheet_v2="[Header]", json="{}"), 1, {}) == key
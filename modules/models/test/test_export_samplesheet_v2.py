@@ -0,0 +1,227 @@
+"""
+SampleSheet v2 generation against the previous per-profile explode.
+
+Run as a module for the 20 profiles x 384 samples x 8 lanes benchmark:
+
+    python -m modules.models.test.test_export_samplesheet_v2
+"""
+import logging
+import timeit
+from dataclasses import replace
+
+import pandas as pd
+
+from modules.models.export.export import ExportModel, ExportSnapshot
+from modules.models.export.samplesheet_v2.samplesheet_v2 import IlluminaSampleSheetV2
+from modules.models.state.state_model import RunInfo
+
+PATTERNS = ["Y{r}-I{i}-I{i}-Y{r}", "U7Y{r}-I{i}-I{i}-Y{r}", "Y{r}-I{i}N2-I{i}-Y{r}", None]
+
+
+class FakeApplicationManager:
+    def application_profile_to_app(self, profile_name):
+        return f"App{int(profile_name.split('_')[1]) % 4}"
+
+    def profile_name_to_settings(self, profile_name):
+        return {"SoftwareVersion": "4.2.7", "Profile": profile_name}
+
+    def profile_name_to_translate(self, profile_name):
+        return {"IndexI7": "Index", "IndexI5": "Index2"}
+
+    def profile_name_to_data_fields(self, profile_name):
+        fields = ["Sample_ID", "IndexI7", "IndexI5", "OverrideCycles", "ReferenceGenome"]
+        if int(profile_name.split("_")[1]) % 2:
+            fields.insert(0, "Lane")
+        return fields
+
+    def profile_name_to_data(self, profile_name):
+        return {"ReferenceGenome": f"genome_{profile_name}"}
+
+
+class FakeOverrideCyclesModel:
+    """Resolves patterns against fixed run cycles, counting the resolved patterns."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def pattern_to_cycles(self, pattern, run_cycles=None):
+        self.calls += 1
+        if not isinstance(pattern, str):
+            return None
+        return pattern.replace("{r}", "151").replace("{i}", "10")
+
+    def resolve_series(self, series, run_cycles=None):
+        resolved = {pattern: self.pattern_to_cycles(pattern) for pattern in series.dropna().unique()}
+        return series.map(resolved)
+
+
+class FakeConfigurationManager:
+    export_settings = {}
+
+
+def make_snapshot(export_model: ExportModel, profiles: int = 20, samples: int = 384, lanes: int = 8,
+                  extra_profile_ids: tuple = ()) -> ExportSnapshot:
+    profile_ids = [f"profile_{i}" for i in range(profiles)]
+    df = pd.DataFrame({
+        "Sample_ID": [f"S{i}" for i in range(samples)],
+        "Lane": [list(range(1, lanes + 1)) for _ in range(samples)],
+        "IndexI7": [f"ACGT{i:06d}" for i in range(samples)],
+        "IndexI5": [f"TTGA{i:06d}" for i in range(samples)],
+        "ApplicationProfileId": [[profile_ids[i % profiles], profile_ids[(i * 7 + 3) % profiles]]
+                                 for i in range(samples)],
+        "OverrideCyclesPattern": [PATTERNS[i % len(PATTERNS)] for i in range(samples)],
+    })
+
+    return export_model._make_snapshot(
+        RunInfo(run_name="bench", instrument="NovaSeq X", lanes=list(range(1, lanes + 1))),
+        df,
+        tuple(profile_ids) + tuple(extra_profile_ids),
+        (151, 10, 10, 151),
+        (),
+    )
+
+
+def make_export_model() -> ExportModel:
+    return ExportModel(object(), FakeConfigurationManager(), FakeApplicationManager(),
+                       FakeOverrideCyclesModel(), logging.getLogger(__name__))
+
+
+def reference_applications(export_model: ExportModel, snapshot: ExportSnapshot) -> list:
+    """The application sections as built before the single explode, per profile over the whole frame."""
+    application_manager = export_model._application_manager
+    override_cycles_model = export_model._override_cycles_model
+    illumina_samplesheet_v2 = IlluminaSampleSheetV2()
+    df_base = snapshot.sample_df
+
+    for profile_name in (profile.profile_id for profile in snapshot.profiles):
+        application_name = application_manager.application_profile_to_app(profile_name)
+        settings = application_manager.profile_name_to_settings(profile_name)
+        translate = application_manager.profile_name_to_translate(profile_name)
+        data_fields = application_manager.profile_name_to_data_fields(profile_name)
+
+        exploded_app_df = df_base.explode("ApplicationProfileId")
+        exploded_app_profile_df = exploded_app_df[exploded_app_df["ApplicationProfileId"] == profile_name].copy()
+
+        if "Lane" in data_fields:
+            exploded_app_profile_df = exploded_app_profile_df.explode("Lane")
+
+        for key, value in application_manager.profile_name_to_data(profile_name).items():
+            exploded_app_profile_df[key] = value
+
+        if "OverrideCycles" in data_fields:
+            exploded_app_profile_df["OverrideCycles"] = exploded_app_profile_df["OverrideCyclesPattern"].apply(
+                override_cycles_model.pattern_to_cycles
+            )
+
+        for new_field in [field for field in data_fields if field not in exploded_app_profile_df.columns]:
+            exploded_app_profile_df[new_field] = None
+
+        df = exploded_app_profile_df[data_fields].copy()
+        if translate:
+            df.rename(columns=translate, inplace=True)
+
+        illumina_samplesheet_v2.set_application(application_name, settings, df)
+
+    return illumina_samplesheet_v2._applications
+
+
+def test_samplesheet_v2_matches_per_profile_explode():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=6, samples=48, lanes=2)
+
+    applications = export_model._build_samplesheet_v2(snapshot)._applications
+    expected = reference_applications(export_model, snapshot)
+
+    assert len(applications) == len(expected)
+    for application, expected_application in zip(applications, expected):
+        assert application["ApplicationName"] == expected_application["ApplicationName"]
+        assert application["Settings"] == expected_application["Settings"]
+        pd.testing.assert_frame_equal(application["Data"], expected_application["Data"], check_dtype=False)
+
+
+def test_samplesheet_v2_profile_without_samples():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=3, samples=6, lanes=1, extra_profile_ids=("profile_9",))
+
+    applications = export_model._build_samplesheet_v2(snapshot)._applications
+
+    assert applications[-1]["Data"].empty
+    assert list(applications[-1]["Data"].columns) == ["Lane", "Sample_ID", "Index", "Index2",
+                                                      "OverrideCycles", "ReferenceGenome"]
+
+
+def test_override_cycles_resolved_once_per_pattern():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=1, samples=40, lanes=1)
+
+    export_model._build_samplesheet_v2(snapshot)
+    export_model._build_json_data(snapshot)
+
+    distinct_patterns = snapshot.sample_df["OverrideCyclesPattern"].dropna().nunique()
+    assert export_model._override_cycles_model.calls == distinct_patterns
+
+
+def test_build_from_snapshot_does_not_use_managers():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=4, samples=16, lanes=2)
+    expected = export_model._build_samplesheet_v2(snapshot).generate()
+
+    # worker threads only format the snapshot, the GUI thread managers are not called
+    export_model._application_manager = None
+    export_model._override_cycles_model = None
+
+    assert export_model._build_samplesheet_v2(snapshot).generate() == expected
+    export_model._json_text(export_model._build_json_data(snapshot))
+
+
+def test_samples_without_lanes_left_out_of_v1_and_v2():
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model, profiles=2, samples=4, lanes=2)
+    sample_df = snapshot.sample_df.copy()
+    sample_df["Lane"] = [[1, 2], None, [], "9,x"]
+    snapshot = replace(snapshot, sample_df=sample_df)
+
+    v1_data = export_model._build_samplesheet_v1(snapshot).split("[Data]")[1].strip().splitlines()[1:]
+    v1_rows = sorted((line.split(",")[0], line.split(",")[-1]) for line in v1_data)
+
+    v2_rows = set()
+    for application in export_model._build_samplesheet_v2(snapshot)._applications:
+        data = application["Data"]
+        if "Lane" in data.columns:
+            v2_rows.update(zip(data["Sample_ID"], data["Lane"].astype(str)))
+
+    assert v1_rows == [("S0", "1"), ("S0", "2")]
+    assert v2_rows == set(v1_rows)
+
+
+def benchmark(repeat: int = 5) -> None:
+    export_model = make_export_model()
+    snapshot = make_snapshot(export_model)
+
+    def best(fn):
+        return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+    print(f"SampleSheet v2, 20 profiles x 384 samples x 8 lanes (best of {repeat})")
+
+    reference = best(lambda: reference_applications(export_model, snapshot))
+    single_explode = best(lambda: export_model._build_samplesheet_v2(snapshot))
+    print(f"  build sections, per-profile explode: {reference * 1000:8.1f} ms")
+    print(f"  build sections, single explode:      {single_explode * 1000:8.1f} ms")
+    print(f"  speedup:                             {reference / single_explode:8.2f}x")
+
+    reference = best(lambda: _sheet_with(reference_applications(export_model, snapshot)).generate())
+    single_explode = best(lambda: export_model._build_samplesheet_v2(snapshot).generate())
+    print(f"  build and write, per-profile explode: {reference * 1000:8.1f} ms")
+    print(f"  build and write, single explode:      {single_explode * 1000:8.1f} ms")
+    print(f"  speedup:                              {reference / single_explode:8.2f}x")
+
+
+def _sheet_with(applications: list) -> IlluminaSampleSheetV2:
+    sheet = IlluminaSampleSheetV2()
+    for application in applications:
+        sheet.set_application(application["ApplicationName"], application["Settings"], application["Data"])
+    return sheet
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,34 @@
+from modules.models.sample.free_row_index import FreeRowIndex
+
+
+def test_toggling_rows_does_not_grow_heap():
+    index = FreeRowIndex(384)
+    index.update_cell(0, False, True)
+
+    for _ in range(1000):
+        for row in (100, 200, 383):
+            index.update_cell(row, False, True)
+            index.update_cell(row, True, False)
+
+    assert len(index._free_heap) <= 384
+    assert index.first_free_row() == 1
+    assert index.free_rows(3) == [1, 2, 3]
+    assert index.filled_row_count() == 1
+
+
+def test_free_rows_skip_filled_rows():
+    index = FreeRowIndex(6)
+    for row in (0, 2, 3):
+        index.update_cell(row, False, True)
+    index.update_cell(2, True, False)
+
+    assert index.free_rows(10) == [1, 2, 4, 5]
+    assert index.first_free_row() == 1
+
+    index.update_cell(1, False, True)
+    index.insert_rows(6, 2)
+    index.remove_rows(0, 1)
+
+    assert index.free_rows(10) == [1, 3, 4, 5, 6]
+    assert index.filled_row_count() == 2
+    assert len(index._free_heap) == len(set(index._free_heap))
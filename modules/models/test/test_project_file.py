@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from modules.models.project.project_file import (
+    _PREFIX,
+    MAGIC,
+    ProjectData,
+    ProjectFile,
+    ProjectFileError,
+    encode_texts,
+    write_project,
+)
+from modules.models.sample.list_values import DictColumn, lanes_to_mask
+from modules.utils import json_backend
+
+
+def make_project(row_count: int = 3) -> ProjectData:
+    sample_ids = [f"S{i}" for i in range(row_count)]
+    indexes = ["ACGT", "", "åäö"] * (row_count // 3) + ["ACGT", "", "åäö"][:row_count % 3]
+    return ProjectData(
+        run_info={"run_name": "run1", "lanes": [1, 2], "read1_cycles": 151},
+        row_count=row_count,
+        columns={
+            "Lane": np.array([lanes_to_mask(range(1, i % 3 + 1)) for i in range(row_count)], dtype=np.uint8),
+            "Sample_ID": encode_texts(sample_ids),
+            "IndexI7": encode_texts(indexes),
+        },
+        validation={"results": [{"name": "lanes", "message": "ok", "severity": "INFO"}]},
+    )
+
+
+def write_raw(path, header: dict, data: bytes = b"") -> None:
+    header_bytes = json_backend.dumpb(header)
+    path.write_bytes(_PREFIX.pack(MAGIC, len(header_bytes)) + header_bytes + data)
+
+
+def assert_columns_equal(column, expected):
+    if isinstance(expected, DictColumn):
+        assert isinstance(column, DictColumn)
+        assert [column.values[code] for code in column.codes] == [expected.values[code] for code in expected.codes]
+    else:
+        np.testing.assert_array_equal(column, expected)
+
+
+@pytest.mark.parametrize("row_count", [0, 3, 300])
+def test_write_read_round_trip(tmp_path, row_count):
+    path = tmp_path / "run.scproj"
+    project = make_project(row_count)
+
+    write_project(path, project)
+    project_file = ProjectFile(path)
+    read = project_file.read()
+
+    assert project_file.column_names == list(project.columns)
+    assert read.row_count == row_count
+    assert read.run_info == project.run_info
+    assert read.validation == project.validation
+    for name, column in project.columns.items():
+        assert_columns_equal(read.columns[name], column)
+    assert not path.with_name("run.scproj.tmp").exists()
+
+
+def test_dict_column_codes_widen_with_distinct_values(tmp_path):
+    path = tmp_path / "run.scproj"
+    texts = [f"S{i}" for i in range(300)]
+    write_project(path, ProjectData(run_info={}, row_count=300, columns={"Sample_ID": encode_texts(texts)}))
+
+    column = ProjectFile(path).column("Sample_ID")
+
+    assert column.codes.dtype == np.dtype("<u2")
+    assert [column.values[code] for code in column.codes] == texts
+
+
+def test_sample_model_round_trip(tmp_path, make_sample_model):
+    path = tmp_path / "run.scproj"
+    model = make_sample_model()
+    model.write_cells([(0, 0, "1,2"), (0, 1, "S1"), (1, 1, "S2"), (1, 0, "8"), (1, 3, "TTGA"),
+                       (2, 4, "[app_1, app_2]")])
+
+    columns = {
+        field: model.lane_masks() if field == "Lane" else encode_texts(model.column_texts(column))
+        for column, field in enumerate(model.fields)
+    }
+    write_project(path, ProjectData(run_info={}, row_count=model.rowCount(), columns=columns))
+
+    loaded = make_sample_model()
+    project = ProjectFile(path).read()
+    loaded.load_columns(project.row_count, project.columns)
+
+    for column in range(len(model.fields)):
+        assert loaded.column_texts(column) == model.column_texts(column)
+    assert [loaded.lanes(row) for row in range(3)] == [model.lanes(row) for row in range(3)]
+
+
+@pytest.mark.parametrize("missing", ["columns", "run_info", "validation", "row_count"])
+def test_header_missing_entry(tmp_path, missing):
+    path = tmp_path / "run.scproj"
+    write_project(path, make_project())
+    project_file = ProjectFile(path)
+    header = dict(project_file._header)
+    del header[missing]
+    write_raw(path, header)
+
+    with pytest.raises(ProjectFileError):
+        ProjectFile(path)
+
+
+@pytest.mark.parametrize("column", [
+    {"name": "Lane", "kind": "bits", "masks": {"offset": 0, "length": 1, "dtype": "|u1"}},
+    {"name": "Lane", "kind": "lane_mask"},
+    {"name": "Lane", "kind": "lane_mask", "masks": {"offset": 0, "length": 1, "dtype": "<f8"}},
+    {"name": "Sample_ID", "kind": "dict", "values": {"offset": 0, "length": 0}},
+    "Sample_ID",
+])
+def test_header_invalid_column(tmp_path, column):
+    path = tmp_path / "run.scproj"
+    ref = {"offset": 0, "length": 2}
+    write_raw(path, {"version": 1, "row_count": 0, "run_info": ref, "validation": ref, "columns": [column]})
+
+    with pytest.raises(ProjectFileError):
+        ProjectFile(path)
+
+
+def test_not_a_project_file(tmp_path):
+    path = tmp_path / "run.scproj"
+    path.write_bytes(b"PK\x03\x04" + b"\x00" * 16)
+
+    with pytest.raises(ProjectFileError):
+        ProjectFile(path)
+
+
+def test_truncated_sections(tmp_path):
+    path = tmp_path / "run.scproj"
+    write_project(path, make_project(30))
+    path.write_bytes(path.read_bytes()[:-16])
+
+    with pytest.raises(ProjectFileError):
+        ProjectFile(path).read()
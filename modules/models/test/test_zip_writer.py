@@ -0,0 +1,108 @@
+import io
+import time
+import zipfile
+
+from modules.models.export.package_builder import PackageEntry, PackageJob
+from modules.models.export.zip_writer import ZIP_DEFLATED, ZIP_STORED, compress_entry, write_zip
+
+CONTENTS = {
+    "SampleSheet.csv": "[Header]\nFileFormatVersion,2\n" * 200,
+    "report.json": b'{"results": []}',
+    "stored.txt": "stored as is",
+    "empty.txt": "",
+    "prøver/översikt.txt": "åäö, utf-8 names and content",
+}
+
+
+def make_archive(**kwargs) -> bytes:
+    entries = [
+        (name, compress_entry(content, level=0 if name == "stored.txt" else 6))
+        for name, content in CONTENTS.items()
+    ]
+    fh = io.BytesIO()
+    write_zip(fh, entries, **kwargs)
+    return fh.getvalue()
+
+
+def expected_bytes(content) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def test_zip_file_reads_archive():
+    with zipfile.ZipFile(io.BytesIO(make_archive())) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == list(CONTENTS)
+
+        for name, content in CONTENTS.items():
+            assert zf.read(name) == expected_bytes(content)
+
+
+def test_zip_entry_methods_and_sizes():
+    with zipfile.ZipFile(io.BytesIO(make_archive())) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+
+    assert infos["stored.txt"].compress_type == ZIP_STORED
+    assert infos["SampleSheet.csv"].compress_type == ZIP_DEFLATED
+    assert infos["SampleSheet.csv"].compress_size < infos["SampleSheet.csv"].file_size
+    assert infos["empty.txt"].file_size == 0
+    assert all(info.flag_bits & 0x800 for info in infos.values())
+
+
+def test_zip_timestamp():
+    timestamp = 1_700_000_000
+    with zipfile.ZipFile(io.BytesIO(make_archive(timestamp=timestamp))) as zf:
+        date_time = zf.getinfo("report.json").date_time
+
+    t = time.localtime(timestamp)
+    assert date_time == (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec // 2 * 2)
+
+
+def test_compressed_entry_reused_across_archives():
+    entry = compress_entry("reused " * 100)
+    for _ in range(2):
+        fh = io.BytesIO()
+        write_zip(fh, [("a.txt", entry), ("b.txt", entry)])
+        with zipfile.ZipFile(fh) as zf:
+            assert zf.testzip() is None
+            assert zf.read("a.txt") == zf.read("b.txt") == b"reused " * 100
+
+
+def test_package_job_writes_archive(tmp_path):
+    save_path = tmp_path / "package" / "run.zip"
+    entries = [
+        PackageEntry("SampleSheet.csv", lambda: CONTENTS["SampleSheet.csv"]),
+        PackageEntry("report.json", CONTENTS["report.json"]),
+        PackageEntry("stored.txt", compress_entry(CONTENTS["stored.txt"], level=0)),
+    ]
+    job = PackageJob(save_path, entries, workers=2)
+    finished, errors = [], []
+    job.signals.finished.connect(finished.append)
+    job.signals.error.connect(errors.append)
+
+    job.run()
+
+    assert errors == []
+    assert finished == [save_path]
+    with zipfile.ZipFile(save_path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["SampleSheet.csv", "report.json", "stored.txt"]
+        assert zf.read("stored.txt") == b"stored as is"
+    assert not save_path.with_name("run.zip.part").exists()
+
+
+def test_package_job_reports_failure(tmp_path):
+    save_path = tmp_path / "run.zip"
+
+    def fail():
+        raise RuntimeError("no samples")
+
+    job = PackageJob(save_path, [PackageEntry("SampleSheet.csv", fail)], workers=1)
+    finished, errors = [], []
+    job.signals.finished.connect(finished.append)
+    job.signals.error.connect(errors.append)
+
+    job.run()
+
+    assert finished == []
+    assert errors == ["no samples"]
+    assert not save_path.exists()
@@ -1,24 +1,203 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from modules.models.sample.sample_model import SampleModel
+
+Cell = Tuple[int, int]  # row, column
+
+
+class UndoCommand(ABC):
+    """A reversible change of the sample model.
+
+    Commands store only what changed, so undo and redo cost O(changed cells).
+    """
+
+    text = ""
+
+    @abstractmethod
+    def undo(self, model: "SampleModel") -> None:
+        """Revert the change."""
+
+    @abstractmethod
+    def redo(self, model: "SampleModel") -> None:
+        """Apply the change again."""
+
+    def cost(self) -> int:
+        """Estimated memory use in bytes, counted against the undo stack budget."""
+        return 0
+
+    def merge_with(self, other: "UndoCommand") -> bool:
+        """Absorb a command pushed right after this one, return True if merged."""
+        return False
+
+
+def _text_cost(text: str) -> int:
+    return sys.getsizeof(text)
+
+
+class CellDeltaCommand(UndoCommand):
+    """Old and new text of the cells changed by an edit, paste, drop or assignment.
+
+    Mergeable commands absorb the next mergeable command pushed within
+    MERGE_WINDOW seconds, so consecutive cell edits undo as one step.
+
+    Args:
+        text: Description of the change, e.g. "Paste"
+        cells: Mapping of (row, column) to (old text, new text), unchanged cells left out
+        mergeable: Whether consecutive commands merge into this one
+    """
+
+    MERGE_WINDOW = 1.0
+
+    # dict entry, key tuple and value tuple per cell
+    _CELL_OVERHEAD = 200
+
+    def __init__(self, text: str, cells: Dict[Cell, Tuple[str, str]], mergeable: bool = False):
+        self.text = text
+        self._cells = cells
+        self._mergeable = mergeable
+        self._timestamp = time.monotonic()
+        self._cost = sum(_text_cost(old) + _text_cost(new) for old, new in cells.values()) \
+            + self._CELL_OVERHEAD * len(cells)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def undo(self, model: "SampleModel") -> None:
+        model.write_cells(((row, column, old) for (row, column), (old, _) in self._cells.items()),
+                          undo_text=None)
+
+    def redo(self, model: "SampleModel") -> None:
+        model.write_cells(((row, column, new) for (row, column), (_, new) in self._cells.items()),
+                          undo_text=None)
+
+    def cost(self) -> int:
+        return self._cost
+
+    def merge_with(self, other: UndoCommand) -> bool:
+        if not (isinstance(other, CellDeltaCommand) and self._mergeable and other._mergeable):
+            return False
+        if other._timestamp - self._timestamp > self.MERGE_WINDOW:
+            return False
+
+        for cell, (old, new) in other._cells.items():
+            if cell in self._cells:
+                # keep the value from before the first edit
+                previous_old, previous_new = self._cells[cell]
+                self._cost += _text_cost(new) - _text_cost(previous_new)
+                self._cells[cell] = (previous_old, new)
+            else:
+                self._cells[cell] = (old, new)
+                self._cost += _text_cost(old) + _text_cost(new) + self._CELL_OVERHEAD
+
+        self._timestamp = other._timestamp
+        return True
+
+
+class RemoveRowsCommand(UndoCommand):
+    """Rows removed from the model, with the text of their non-empty cells.
+
+    Args:
+        first: The first removed row
+        count: The number of removed rows
+        cells: (row offset, column, text) of the non-empty cells of the removed rows
+    """
+
+    def __init__(self, first: int, count: int, cells: List[Tuple[int, int, str]]):
+        self.text = "Delete rows"
+        self._first = first
+        self._count = count
+        self._cells = cells
+        self._cost = sum(_text_cost(text) + 100 for _, _, text in cells)
+
+    def undo(self, model: "SampleModel") -> None:
+        model.insert_rows_unrecorded(self._first, self._count)
+        model.write_cells(((self._first + offset, column, text) for offset, column, text in self._cells),
+                          undo_text=None)
+
+    def redo(self, model: "SampleModel") -> None:
+        model.remove_rows_unrecorded(self._first, self._count)
+
+    def cost(self) -> int:
+        return self._cost
 
 
 class UndoStack:
-    def __init__(self):
-        self.stack = []
+    """Undo and redo stacks of delta commands within a memory budget.
+
+    When the estimated size of the undo stack exceeds the budget the oldest
+    commands are dropped. The newest command is always kept.
+
+    Args:
+        memory_budget: Budget in bytes for the commands on the undo stack
+    """
+
+    def __init__(self, memory_budget: int = 16 * 1024 * 1024):
+        self.memory_budget = memory_budget
+        self.stack: Deque[UndoCommand] = deque()
+        self.redo_stack: List[UndoCommand] = []
+        self._cost = 0
+
+    def push(self, command: UndoCommand) -> None:
+        """Push a command that has already been applied to the model."""
         self.redo_stack = []
 
-    def push(self, command):
+        if self.stack:
+            top = self.stack[-1]
+            top_cost = top.cost()
+            if top.merge_with(command):
+                self._cost += top.cost() - top_cost
+                self._trim()
+                return
+
+        self.stack.append(command)
+        self._cost += command.cost()
+        self._trim()
+
+    def undo(self, model: "SampleModel") -> Optional[UndoCommand]:
+        """Undo the newest command, returning it, or None if there is nothing to undo."""
+        if not self.stack:
+            return None
+
+        command = self.stack.pop()
+        self._cost -= command.cost()
+        command.undo(model)
+        self.redo_stack.append(command)
+        return command
+
+    def redo(self, model: "SampleModel") -> Optional[UndoCommand]:
+        """Redo the newest undone command, returning it, or None if there is nothing to redo."""
+        if not self.redo_stack:
+            return None
+
+        command = self.redo_stack.pop()
+        command.redo(model)
         self.stack.append(command)
+        self._cost += command.cost()
+        return command
+
+    def clear(self) -> None:
+        self.stack.clear()
         self.redo_stack = []
+        self._cost = 0
 
-    def pop(self):
-        if self.stack:
-            command = self.stack.pop()
-            self.redo_stack.append(command)
-            return command
-        return None
-
-    def redo(self):
-        if self.redo_stack:
-            command = self.redo_stack.pop()
-            self.stack.append(command)
-            return command
-        return None
\ No newline at end of file
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    @property
+    def cost(self) -> int:
+        """Estimated memory use of the undo stack in bytes."""
+        return self._cost
+
+    def _trim(self) -> None:
+        while len(self.stack) > 1 and self._cost > self.memory_budget:
+            self._cost -= self.stack.popleft().cost()
@@ -4,42 +4,63 @@ import numpy as np
 import pandas as pd
 from PySide6.QtCore import QObject, Signal
 
+from modules.models.compute.compute_service import CancelToken, ComputeService
+from modules.models.sample.lane_partition import LanePartition
 from modules.models.state.state_model import StateModel
-from modules.utils.utils import explode_df_lane_column
-from modules.views.validation.color_balance_widget import ColorBalanceValidationWidget
+from modules.models.validation.lane_result_cache import LaneResultCache
 
 
 class ColorBalanceDataGenerator(QObject):
 
     data_ready = Signal(object)
 
+    JOB_KEY = "color_balance"
+
     def __init__(
         self,
         state_model: StateModel,
+        compute_service: ComputeService,
         logger: Logger
     ):
         super().__init__()
 
         self._state_model = state_model
+        self._compute_service = compute_service
         self._logger = logger
 
+        # color balance tables of lanes by their index content, reused by later validations
+        self._lane_cache = LaneResultCache()
 
     def generate(self):
+        """Build the per lane index base tables in the compute service, superseding a running build."""
         i5_orientation = self._state_model.i5_seq_orientation
         i5_seq_rc = i5_orientation == "rc"
 
-        df = explode_df_lane_column(self._state_model.sample_df)
+        lane_partition = self._state_model.lane_partition
 
-        if df.empty:
+        if not lane_partition.lanes:
             return
 
-        unique_lanes = df["Lane"].unique()
         i5_col_name = "IndexI5RC" if i5_seq_rc else "IndexI5"
 
+        self._compute_service.submit(
+            self.JOB_KEY,
+            lambda token: self._lane_indexes(lane_partition, i5_col_name, token),
+            self.data_ready.emit,
+            priority=1,
+        )
+
+    def _lane_indexes(self, lane_partition: LanePartition, i5_col_name: str, token: CancelToken) -> dict:
         result = {}
 
-        for lane in unique_lanes:
-            lane_df = df[df["Lane"] == lane]
+        for lane, lane_df in lane_partition:
+            token.raise_if_cancelled()
+
+            cache_key = LaneResultCache.key(lane_df, i5_col_name)
+            cached = self._lane_cache.get(cache_key)
+            if cached is not None:
+                result[lane] = cached
+                continue
 
             i7_padded_indexes = self._index_df_padded(
                 lane_df, 10, "IndexI7", "Sample_ID"
@@ -52,9 +73,10 @@ class ColorBalanceDataGenerator(QObject):
                 i7_padded_indexes, i5_padded_indexes, on="Sample_ID"
             )
 
+            self._lane_cache.put(cache_key, concat_indexes)
             result[lane] = concat_indexes
 
-        self.data_ready.emit(result)
+        return result
 
     def _index_df_padded(
         self, df: pd.DataFrame, tot_len: int, col_name: str, id_name: str
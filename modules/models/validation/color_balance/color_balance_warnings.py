@@ -0,0 +1,148 @@
+"""
+Vectorized color balance summaries and warnings for the index cycles of a lane.
+
+The index bases of a lane are encoded once into a (samples, cycles) uint8
+tensor. Base and color proportions and all warnings are then computed for all
+cycles at once from that tensor and the sample proportions. Nothing here
+depends on Qt, so the same warnings are available outside the views.
+"""
+from enum import IntFlag
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+BASES = ("A", "C", "G", "T")
+MISSING = len(BASES)
+
+# color channels as the first letter of the configured fluorophore colors: blue, green, dark
+COLOR_CHANNELS = ("B", "G", "D")
+SIGNAL_CHANNELS = (0, 1)
+
+LOW_CHANNEL_THRESHOLD = 0.1
+MIN_DARK_RUN = 2
+
+_BASE_CODES = np.full(256, MISSING, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _BASE_CODES[ord(_base)] = _code
+
+
+class ColorBalanceWarning(IntFlag):
+    NONE = 0
+    # cell: part of a run of dark cycles at the start of an index read
+    DARK_RUN = 1
+    # cycle: the blue or green channel is below LOW_CHANNEL_THRESHOLD
+    LOW_BLUE = 2
+    LOW_GREEN = 4
+    # cycle: all samples give the same color
+    SAME_COLOR = 8
+
+
+def encode_bases(bases: np.ndarray) -> np.ndarray:
+    """Encode a 2d array of single bases to base codes.
+
+    Args:
+        bases: Array of single base strings, anything other than A, C, G or T
+            (NaN, None, "nan", "-") is encoded as missing
+
+    Returns:
+        uint8 array of the same shape, with codes indexing BASES or MISSING
+    """
+    bases = np.asarray(bases, dtype=object)
+    text = bases.astype(str)
+
+    single = np.where(np.char.str_len(text) == 1, text, "N").astype("U1")
+    code_points = single.view(np.uint32).reshape(bases.shape)
+
+    return _BASE_CODES[np.minimum(code_points, 255)]
+
+
+def base_color_weights(base_colors: Dict[str, List[str]]) -> np.ndarray:
+    """Return the share of each color channel per base code.
+
+    Args:
+        base_colors: Base to fluorophore color names, e.g. {"C": ["green", "blue"]}
+
+    Returns:
+        (len(BASES) + 1, len(COLOR_CHANNELS)) array, a base with two colors gives half of
+        its count to each, the missing code gives none
+    """
+    weights = np.zeros((len(BASES) + 1, len(COLOR_CHANNELS)))
+
+    for code, base in enumerate(BASES):
+        channels = [color[0].upper() for color in base_colors.get(base) or []]
+        for channel in channels:
+            weights[code, COLOR_CHANNELS.index(channel)] += 1 / len(channels)
+
+    return weights
+
+
+def cycle_counts(codes: np.ndarray, proportions: np.ndarray,
+                 weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Proportion weighted base and color counts per cycle.
+
+    Returns:
+        (cycles, len(BASES)) base counts and (cycles, len(COLOR_CHANNELS)) color counts
+    """
+    one_hot = (codes[:, :, None] == np.arange(len(BASES))).astype(float)
+    base_counts = np.einsum("s,sck->ck", proportions.astype(float), one_hot)
+    color_counts = base_counts @ weights[:len(BASES)]
+    return base_counts, color_counts
+
+
+def normalize(counts: np.ndarray) -> np.ndarray:
+    """Normalize counts per cycle to proportions rounded to two decimals, all zero cycles stay zero."""
+    total = counts.sum(axis=1, keepdims=True)
+    total[total == 0] = 0.00001
+    return np.round(counts / total, 2)
+
+
+def color_balance_warnings(codes: np.ndarray, proportions: np.ndarray, weights: np.ndarray,
+                           read_starts: Sequence[int] = (0,)) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the color balance warnings of all cells and cycles.
+
+    Args:
+        codes: (samples, cycles) base codes from encode_bases
+        proportions: Pool proportion of each sample, samples with proportion 0 are left out
+            of the cycle warnings
+        weights: Color channel weights from base_color_weights
+        read_starts: First cycle of each index read in codes, e.g. (0, 10) for i7 and i5
+
+    Returns:
+        (samples, cycles) cell warnings and (cycles,) cycle warnings, as ColorBalanceWarning bits
+    """
+    n_samples, n_cycles = codes.shape
+    cell_flags = np.zeros((n_samples, n_cycles), dtype=np.uint8)
+    cycle_flags = np.zeros(n_cycles, dtype=np.uint8)
+
+    present = codes != MISSING
+    signal = weights[codes][:, :, SIGNAL_CHANNELS]
+    dark = present & (signal.sum(axis=2) == 0)
+
+    # dark cycles at the start of each read, up to the first cycle with signal
+    bounds = list(read_starts) + [n_cycles]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        leading_dark = np.cumprod(dark[:, start:end], axis=1).astype(bool)
+        long_run = leading_dark.sum(axis=1) >= MIN_DARK_RUN
+        cell_flags[:, start:end][leading_dark & long_run[:, None]] |= np.uint8(ColorBalanceWarning.DARK_RUN)
+
+    base_counts, color_counts = cycle_counts(codes, proportions, weights)
+    has_bases = base_counts.sum(axis=1) > 0
+    color_total = color_counts.sum(axis=1)
+    color_total[color_total == 0] = 1
+    channel_share = color_counts / color_total[:, None]
+
+    blue, green = SIGNAL_CHANNELS
+    cycle_flags[has_bases & (channel_share[:, blue] < LOW_CHANNEL_THRESHOLD)] |= np.uint8(ColorBalanceWarning.LOW_BLUE)
+    cycle_flags[has_bases & (channel_share[:, green] < LOW_CHANNEL_THRESHOLD)] |= np.uint8(ColorBalanceWarning.LOW_GREEN)
+
+    # color signature per base code: which signal channels it lights
+    signature = ((weights[:, blue] > 0).astype(np.int16)
+                 + 2 * (weights[:, green] > 0).astype(np.int16))
+    pooled = present & (proportions > 0)[:, None]
+    cell_signature = signature[codes]
+    lowest = np.where(pooled, cell_signature, np.int16(4)).min(axis=0)
+    highest = np.where(pooled, cell_signature, np.int16(-1)).max(axis=0)
+    same_color = (pooled.sum(axis=0) >= 2) & (lowest == highest)
+    cycle_flags[same_color] |= np.uint8(ColorBalanceWarning.SAME_COLOR)
+
+    return cell_flags, cycle_flags
@@ -1,21 +1,43 @@
 import json
+from typing import List, Optional
 
-from PySide6.QtCore import Qt
+import numpy as np
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QStandardItemModel
 
+from modules.models.validation.color_balance.color_balance_warnings import (
+    BASES,
+    COLOR_CHANNELS,
+    base_color_weights,
+    color_balance_warnings,
+    cycle_counts,
+    encode_bases,
+    normalize,
+)
+
 
 class IndexColorBalanceModel(QStandardItemModel):
 
+    # ColorBalanceWarning bits of a cell, for the summary row the warnings of the cycle
+    WarningRole = Qt.UserRole + 1
+
+    # emitted after update_summation wrote new summary values
+    summary_changed = Signal()
+
     def __init__(self, base_colors, parent):
         super(IndexColorBalanceModel, self).__init__(parent=parent)
-        self.dataChanged.connect(self.update_summation)
+        self.dataChanged.connect(self._on_data_changed)
 
-        self._transformed_base_colors = {
-            key: [color[0].upper() for color in colors]
-            for key, colors in base_colors.items()
-        }
+        self._color_weights = base_color_weights(base_colors)
+
+        self._codes: Optional[np.ndarray] = None
+        self._cell_flags: Optional[np.ndarray] = None
+        self._cycle_flags: Optional[np.ndarray] = None
 
     def data(self, index, role=Qt.DisplayRole):
+        if role == self.WarningRole:
+            return self._warning_flags(index.row(), index.column())
+
         # Only modify data for display purposes
         if role == Qt.DisplayRole:
             original_value = super().data(index, role)
@@ -23,63 +45,104 @@ class IndexColorBalanceModel(QStandardItemModel):
                 return "-"
         return super().data(index, role)
 
+    def set_bases(self, bases: np.ndarray) -> None:
+        """Set the index bases of the sample rows as they are built.
+
+        Args:
+            bases: (samples, cycles) array of the base columns, from column 2 onwards
+        """
+        self._codes = encode_bases(bases)
+
+    def _warning_flags(self, row: int, column: int) -> int:
+        cycle = column - 2
+        if cycle < 0 or self._cell_flags is None:
+            return 0
+
+        if row == self.rowCount() - 1:
+            return int(self._cycle_flags[cycle]) if cycle < len(self._cycle_flags) else 0
+
+        if row < self._cell_flags.shape[0] and cycle < self._cell_flags.shape[1]:
+            return int(self._cell_flags[row, cycle])
+
+        return 0
+
+    def _read_starts(self) -> List[int]:
+        """First cycle of each index read, from where the header prefix (I7, I5, ...) changes."""
+        starts = []
+        previous = None
+        for column in range(2, self.columnCount()):
+            header = self.headerData(column, Qt.Horizontal) or ""
+            read = str(header).rsplit("_", 1)[0]
+            if read != previous:
+                starts.append(column - 2)
+                previous = read
+        return starts or [0]
+
+    def _bases_from_items(self) -> np.ndarray:
+        return np.array(
+            [[self.item(row, col).text() for col in range(2, self.columnCount())]
+             for row in range(self.rowCount() - 1)],
+            dtype=object,
+        ).reshape(self.rowCount() - 1, max(0, self.columnCount() - 2))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        # the summary row is written by update_summation itself
+        if top_left.row() < self.rowCount() - 1:
+            self.update_summation()
+
     def update_summation(self):
+        """Recompute the summary row and warnings, emitting one dataChanged and summary_changed if they changed."""
+        last_row = self.rowCount() - 1
+        if last_row < 0:
+            return
+
+        if self._codes is None or self._codes.shape != (last_row, self.columnCount() - 2):
+            self._codes = encode_bases(self._bases_from_items())
+
+        proportions = np.array([int(self.item(row, 1).text()) for row in range(last_row)], dtype=float)
+
+        previous_cycle_flags = self._cycle_flags
+        self._cell_flags, self._cycle_flags = color_balance_warnings(
+            self._codes, proportions, self._color_weights, self._read_starts()
+        )
+        flags_changed = (previous_cycle_flags is None
+                         or not np.array_equal(previous_cycle_flags, self._cycle_flags))
+
+        base_counts, color_counts = cycle_counts(self._codes, proportions, self._color_weights)
+        normalized_colors = normalize(color_counts)
+        normalized_bases = normalize(base_counts)
+
+        summaries = {}
+
+        for cycle, col in enumerate(range(2, self.columnCount())):
+            merged = {
+                "colors": dict(zip(COLOR_CHANNELS, map(float, normalized_colors[cycle]))),
+                "bases": dict(zip(BASES, map(float, normalized_bases[cycle]))),
+            }
+            norm_json = json.dumps(merged)
 
-        for col in range(2, self.columnCount()):
-            bases_count = {"A": 0, "C": 0, "G": 0, "T": 0}
-            merged = {}
+            if self.item(last_row, col).text() != norm_json:
+                summaries[col] = norm_json
 
-            for row in range(self.rowCount() - 1):
-                proportion = int(self.item(row, 1).text())
-                base = self.item(row, col).text()
+        if not summaries and not flags_changed:
+            return
 
-                if base in ["A", "C", "G", "T"]:
-                    bases_count[base] += proportion
+        # write the summary row without a dataChanged per cell
+        was_blocked = self.blockSignals(True)
+        try:
+            for col, norm_json in summaries.items():
+                self.item(last_row, col).setText(norm_json)
+        finally:
+            self.blockSignals(was_blocked)
 
-            color_counts = self._generic_base_to_color_count(bases_count)
-            normalized_color_counts = self._normalize(color_counts)
-            normalized_base_counts = self._normalize(bases_count)
+        changed_columns = list(summaries) if not flags_changed else list(range(2, self.columnCount()))
 
-            merged["colors"] = normalized_color_counts
-            merged["bases"] = normalized_base_counts
-            norm_json = json.dumps(merged)
-
-            last_row = self.rowCount() - 1
-            self.setData(self.index(last_row, col), norm_json, Qt.EditRole)
+        if changed_columns:
+            self.dataChanged.emit(self.index(last_row, changed_columns[0]),
+                                  self.index(last_row, changed_columns[-1]))
+        self.summary_changed.emit()
 
     @staticmethod
     def merge(dict1, dict2):
         res = dict1 | {"--": "---"} | dict2
         return res
-
-    @staticmethod
-    def _normalize(input_dict):
-        # Calculate the sum of values in the input dictionary
-        total = sum(input_dict.values())
-
-        if total == 0:
-            total = 0.00001
-
-        # Normalize the values and create a new dictionary
-        normalized_dict = {
-            key: round(value / total, 2) for key, value in input_dict.items()
-        }
-
-        return normalized_dict
-
-    def _generic_base_to_color_count(self, dict1):
-        color_count = {
-            "B": 0,
-            "G": 0,
-            "D": 0,
-        }
-
-        for base, count in dict1.items():
-
-            base_colors = self._transformed_base_colors[base]
-            no_colors = len(base_colors)
-
-            for color in base_colors:
-                color_count[color] += count / no_colors
-
-        return color_count
@@ -40,6 +40,7 @@ class GeneralValidator(QObject):
     def validate(self) -> None:
 
         sample_df = self._state_model.sample_df
+        lane_partition = self._state_model.lane_partition
         allowed_lanes = self._state_model.lanes
         index1_cycles: int = self._state_model.index1_cycles
         index2_cycles: int = self._state_model.index2_cycles
@@ -47,12 +48,12 @@ class GeneralValidator(QObject):
         validation_results = [
             check_sample_dataframe_overall_consistency(sample_df ),
             lanes_general_check(sample_df, allowed_lanes),
-            lane_sample_uniqueness_check(sample_df),
+            lane_sample_uniqueness_check(sample_df, lane_partition),
             application_settings_check(sample_df, self._application_manager),
             overall_sample_data_validator(sample_df),
             override_cycles_pattern_validator(sample_df),
             index_len_run_cycles_check(sample_df, index1_cycles, index2_cycles),
-            index_pair_uniqueness_check(sample_df),
+            index_pair_uniqueness_check(sample_df, lane_partition),
         ]
 
         self.general_validation_results_ready.emit(validation_results)
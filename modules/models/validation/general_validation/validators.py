@@ -6,6 +6,7 @@ import pandas as pd
 from pathlib import Path
 
 from modules.models.export.samplesheet_v1 import samplesheet_v1
+from modules.models.sample.lane_partition import LanePartition
 from modules.models.state.state_model import StateModel
 from modules.models.application.application_manager import ApplicationManager
 from modules.models.validation.application_validator import application_settings_check
@@ -113,9 +114,9 @@ def lanes_general_check(sample_df: pd.DataFrame, allowed_lanes: List[int]) -> Va
 
             if not lanes_set.issubset(allowed_lanes_set):
                 invalid_rows.append(
-                    f"Row {row + 1}: Lane values {lanes_list} not in allowed range {sorted(allowed_lanes_set)}")
+                    f"Row {idx + 1}: Lane values {lanes_list} not in allowed range {sorted(allowed_lanes_set)}")
         except Exception as e:
-            invalid_rows.append(f"Row {row + 1}: Error processing lane values: {str(e)}")
+            invalid_rows.append(f"Row {idx + 1}: Error processing lane values: {str(e)}")
 
     # Report any validation errors
     if invalid_rows:
@@ -145,7 +146,8 @@ def lanes_general_check(sample_df: pd.DataFrame, allowed_lanes: List[int]) -> Va
     )
 
 
-def lane_sample_uniqueness_check(sample_df: pd.DataFrame) -> ValidationResult:
+def lane_sample_uniqueness_check(sample_df: pd.DataFrame,
+                                 lane_partition: Optional[LanePartition] = None) -> ValidationResult:
 
     name = "lane sample uniqueness check"
 
@@ -186,20 +188,19 @@ def lane_sample_uniqueness_check(sample_df: pd.DataFrame) -> ValidationResult:
                 severity=StatusLevel.ERROR
             )
 
-        # Check for duplicate sample-lane combinations
+        # Check for duplicate sample-lane combinations, lane by lane
 
-        df_lane_exploded = sample_df.explode("Lane", ignore_index=True)
+        if lane_partition is None:
+            lane_partition = LanePartition(sample_df)
 
-        duplicates = df_lane_exploded[df_lane_exploded.duplicated(subset=["Sample_ID", "Lane"], keep=False)]
+        duplicate_entries = []
+        for lane in lane_partition.lanes:
+            sample_ids = sample_df["Sample_ID"].iloc[lane_partition.rows(lane)]
+            for sample_id in sample_ids[sample_ids.duplicated(keep=False)]:
+                duplicate_entries.append(f"Sample '{sample_id}' in lane {lane}")
 
-        if not duplicates.empty:
+        if duplicate_entries:
 
-            duplicate_entries = []
-            for _, row in duplicates.iterrows():
-                sample_id = row["Sample_ID"]
-                lane = str(row["Lane"])
-                duplicate_entries.append(f"Sample '{sample_id}' in lane {lane}")
-            
             return ValidationResult(
                 name=name,
                 message=f"Duplicate sample-lane combinations found:\n" +
@@ -209,7 +210,7 @@ def lane_sample_uniqueness_check(sample_df: pd.DataFrame) -> ValidationResult:
             
         return ValidationResult(
             name=name,
-            message=f"All {len(df_lane_exploded)} sample-lane combinations are unique",
+            message=f"All {lane_partition.size} sample-lane combinations are unique",
             severity=StatusLevel.INFO
         )
         
@@ -434,19 +435,21 @@ def index_len_run_cycles_check(sample_df, index1_cycles, index2_cycles) -> Valid
         )
 
 
-def index_pair_uniqueness_check(sample_df: pd.DataFrame) -> ValidationResult:
+def index_pair_uniqueness_check(sample_df: pd.DataFrame,
+                                lane_partition: Optional[LanePartition] = None) -> ValidationResult:
     name = "index pair uniqueness check"
 
-    # First, explode the Lane column to get one row per sample-lane combination
-    df_exploded = sample_df.explode('Lane').reset_index(drop=True)
+    # Rows of each lane, one entry per sample-lane combination
+    if lane_partition is None:
+        lane_partition = LanePartition(sample_df)
 
     lane_conflicts = []
 
-    # Group by lane to check uniqueness within each lane
-    for lane, lane_group in df_exploded.groupby('Lane'):
+    # Check uniqueness within each lane
+    for lane in lane_partition.lanes:
 
         # Get all samples in this lane
-        samples = lane_group.to_dict('records')
+        samples = sample_df.iloc[lane_partition.rows(lane)].to_dict('records')
 
         # Compare each pair of samples in the lane
         for i, sample1 in enumerate(samples):
@@ -1,20 +1,23 @@
 from logging import Logger
 
-from PySide6.QtCore import QObject, QThread, Slot, Signal
+from PySide6.QtCore import QObject, Slot, Signal
 
-from modules.models.sample.sample_model import SampleModel
+from modules.models.compute.compute_service import ComputeService
 from modules.models.state.state_model import StateModel
 from modules.models.validation.index_distance.index_distance_data_worker import IndexDistanceDataWorker
-from modules.views.validation.index_distance_overview_widget import IndexDistanceOverviewWidget
+from modules.models.validation.lane_result_cache import LaneResultCache
 
 
 class IndexDistanceDataGenerator(QObject):
 
     data_ready = Signal(object)
 
+    JOB_KEY = "index_distance"
+
     def __init__(
         self,
         state_model: StateModel,
+        compute_service: ComputeService,
         logger: Logger
     ):
         super().__init__()
@@ -23,36 +26,27 @@ class IndexDistanceDataGenerator(QObject):
             raise ValueError("model cannot be None")
 
         self._state_model = state_model
+        self._compute_service = compute_service
         self._logger = logger
 
-        self.thread = None
-        self.worker = None
+        # distance matrices of lanes by their index content, reused by later validations
+        self._lane_cache = LaneResultCache()
 
     def generate(self):
-
-        if self.thread is not None or self.worker is not None:
-            return
-
+        """Compute the index distances in the compute service, superseding a running computation."""
         i5_seq_orientation = self._state_model.i5_seq_orientation
         i5_seq_rc = i5_seq_orientation == "rc"
 
-        self.thread = QThread()
-        self.worker = IndexDistanceDataWorker(self._state_model, i5_seq_rc)
+        worker = IndexDistanceDataWorker(
+            self._state_model.lane_partition, self._state_model.lanes, i5_seq_rc, self._lane_cache
+        )
 
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
-        self.worker.results_ready.connect(self._receiver)
-        self.worker.error.connect(self._receiver)
-
-        self.thread.start()
+        # the distance matrices are the most expensive, the other overviews start first
+        self._compute_service.submit(
+            self.JOB_KEY, worker.run, self._receiver, self._receiver, priority=0
+        )
 
     @Slot(object)
     def _receiver(self, results):
-
-        self.thread.quit()
-        self.worker.deleteLater()
-        self.thread.deleteLater()
-        self.thread = None
-        self.worker = None
-
-        self.data_ready.emit(results)
\ No newline at end of file
+        # results are the distance matrices per lane, or an error message the overview shows
+        self.data_ready.emit(results)
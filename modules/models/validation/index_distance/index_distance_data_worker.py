@@ -1,26 +1,32 @@
+from typing import List
+
 import numpy as np
 import pandas as pd
-from PySide6.QtCore import QObject, Signal
 
-from modules.models.state.state_model import StateModel
-from modules.utils.utils import explode_df_lane_column
+from modules.models.compute.compute_service import CancelToken
+from modules.models.sample.lane_partition import LanePartition
+from modules.models.validation.lane_result_cache import LaneResultCache
+
 
+class IndexDistanceDataWorker:
+    """Computes the index distance matrices of each lane in the compute service.
 
-class IndexDistanceDataWorker(QObject):
-    results_ready = Signal(object)
-    error = Signal(str)
+    The worker holds the lane partition and settings snapshotted on the GUI thread.
+    Lanes with unchanged index content take their matrices from the lane cache.
+    """
 
-    def __init__(self, state_model: StateModel, i5_seq_rc: bool):
-        super().__init__()
-        self._state_model = state_model
-        self._df_lane_explode = explode_df_lane_column(self._state_model.sample_df)
+    def __init__(self, lane_partition: LanePartition, lanes: List[int], i5_seq_rc: bool,
+                 lane_cache: LaneResultCache):
+        self._lane_partition = lane_partition
+        self._lanes = list(lanes)
         self._i5_seq_rc = i5_seq_rc
+        self._lane_cache = lane_cache
 
-    def run(self):
+    def run(self, token: CancelToken) -> dict:
         """
-        Run the index distance validation and emit the result when finished.
+        Run the index distance validation, checking for cancellation between lanes.
 
-        Emits a dictionary with the lane number as the key and a distance matrices dictionary with the
+        Returns a dictionary with the lane number as the key and a distance matrices dictionary with the
         following structure as the value:
         {
             "i7_i5": pd.DataFrame,
@@ -28,35 +34,40 @@ class IndexDistanceDataWorker(QObject):
             "i5": pd.DataFrame
         }
         """
-        try:
-            validation_data = {}
-            for lane in self._state_model.lanes:
+        validation_data = {}
+        for lane in self._lanes:
+            token.raise_if_cancelled()
 
-                index_lane_df = self._df_lane_explode[self._df_lane_explode["Lane"] == lane]
+            index_lane_df = self._lane_partition.frame(lane)
+            i5_col_name = "IndexI5RC" if self._i5_seq_rc else "IndexI5"
 
-                i7_index_pos_df = self._padded_index_pos_df(
-                    index_lane_df, "IndexI7", "Sample_ID"
-                )
-                i5_index_pos_df = self._padded_index_pos_df(
-                    index_lane_df,
-                    "IndexI5RC" if self._i5_seq_rc else "IndexI5",
-                    "Sample_ID",
-                )
+            cache_key = LaneResultCache.key(index_lane_df, i5_col_name)
+            cached = self._lane_cache.get(cache_key)
+            if cached is not None:
+                validation_data[int(lane)] = cached
+                continue
 
-                i7_i5_indexes_pos_df = pd.merge(
-                    i7_index_pos_df, i5_index_pos_df, on="Sample_ID"
-                )
+            i7_index_pos_df = self._padded_index_pos_df(
+                index_lane_df, "IndexI7", "Sample_ID"
+            )
+            i5_index_pos_df = self._padded_index_pos_df(
+                index_lane_df,
+                i5_col_name,
+                "Sample_ID",
+            )
 
-                validation_data[int(lane)] = {
-                    "i7_i5": self._index_distance_matrix_df(i7_i5_indexes_pos_df),
-                    "i7": self._index_distance_matrix_df(i7_index_pos_df),
-                    "i5": self._index_distance_matrix_df(i5_index_pos_df),
-                }
+            i7_i5_indexes_pos_df = pd.merge(
+                i7_index_pos_df, i5_index_pos_df, on="Sample_ID"
+            )
 
-            self.results_ready.emit(validation_data)
+            validation_data[int(lane)] = {
+                "i7_i5": self._index_distance_matrix_df(i7_i5_indexes_pos_df),
+                "i7": self._index_distance_matrix_df(i7_index_pos_df),
+                "i5": self._index_distance_matrix_df(i5_index_pos_df),
+            }
+            self._lane_cache.put(cache_key, validation_data[int(lane)])
 
-        except Exception as error:
-            self.error.emit(str(error))
+        return validation_data
 
     @staticmethod
     def _base_by_index_pos(index_seq, index_pos):
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import pandas as pd
+
+
+class LaneResultCache:
+    """LRU cache of per lane validation results, keyed by a hash of the lane's index content.
+
+    Lanes whose samples and indexes did not change between validations reuse
+    their previous result. Results are computed in the compute service, so the
+    cache is locked, and cached results are shared and must not be modified.
+
+    Args:
+        max_entries: The number of lane results kept.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(lane_df: pd.DataFrame, i5_col_name: str) -> str:
+        """Hash the content of a lane that its results depend on.
+
+        Args:
+            lane_df: The samples of the lane
+            i5_col_name: The i5 column used, IndexI5 or IndexI5RC by the i5 orientation
+
+        Returns:
+            Hex digest of the (Sample_ID, IndexI7, i5 index) rows in order, and the i5 column
+        """
+        digest = hashlib.sha256(i5_col_name.encode())
+
+        for row in zip(lane_df["Sample_ID"], lane_df["IndexI7"], lane_df[i5_col_name]):
+            digest.update(b"\x1e")
+            digest.update("\x1f".join(map(str, row)).encode())
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: str, result: Any) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -3,6 +3,7 @@ from logging import Logger
 from PySide6.QtCore import QObject, Signal
 from pydantic_core.core_schema import general_wrap_validator_function
 
+from modules.models.compute.compute_service import ComputeService
 from modules.models.state.state_model import StateModel
 from modules.models.validation.color_balance.color_balance_data_generator import ColorBalanceDataGenerator
 from modules.models.validation.sample_data_overview.sample_data_overview import SampleDataOverviewGenerator
@@ -23,6 +24,7 @@ class MainValidator(QObject):
                  sample_data_overview_generator: SampleDataOverviewGenerator,
                  index_distance_data_generator: IndexDistanceDataGenerator,
                  color_balance_data_generator: ColorBalanceDataGenerator,
+                 compute_service: ComputeService,
                  state_model: StateModel,
                  logger: Logger
                  ):
@@ -33,10 +35,13 @@ class MainValidator(QObject):
         self._sample_data_overview_generator = sample_data_overview_generator
         self._index_distance_data_generator = index_distance_data_generator
         self._color_balance_data_generator = color_balance_data_generator
+        self._compute_service = compute_service
         self._state_model = state_model
         self._logger = logger
 
     def general_validate(self):
+        # jobs of the previous validation run are computed from stale sample data
+        self._compute_service.cancel_all()
         self.clear_validator_widgets.emit()
         self._general_validator.validate()
 
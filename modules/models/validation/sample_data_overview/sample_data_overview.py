@@ -4,6 +4,8 @@ from logging import Logger
 import pandas as pd
 from PySide6.QtCore import Signal, QObject
 
+from modules.models.compute.compute_service import CancelToken, ComputeService
+from modules.models.sample.lane_partition import LanePartition
 from modules.models.state.state_model import StateModel
 
 
@@ -21,15 +23,21 @@ class SampleDataOverviewGenerator(QObject):
     
     data_ready = Signal(tuple)  # (original_df, app_exploded_df, lane_exploded_df)
 
-    def __init__(self, state_model: StateModel, logger: Optional[Logger] = None) -> None:
+    JOB_KEY = "sample_data_overview"
+
+    def __init__(self, state_model: StateModel, compute_service: ComputeService,
+                 logger: Optional[Logger] = None) -> None:
         """Initialize the data preparer.
         
         Args:
             state_model: The application state model containing the sample data
+            compute_service: The compute service the views are prepared in
             logger: Optional logger instance. If not provided, a default logger will be created.
         """
         super().__init__()
         
+        self._compute_service = compute_service
+        
         self._logger = logger or logging.getLogger(__name__)
         
         if not state_model:
@@ -58,26 +66,23 @@ class SampleDataOverviewGenerator(QObject):
         return filtered.explode("ApplicationProfile", ignore_index=True) if not filtered.empty else filtered
 
     @staticmethod
-    def _lane_explode(df: pd.DataFrame) -> pd.DataFrame:
+    def _lane_explode(lane_partition: LanePartition) -> pd.DataFrame:
         """Explode the Lane column into separate rows.
         
         Args:
-            df: Input DataFrame with Lane column
+            lane_partition: The lane partition of the sample data
             
         Returns:
-            DataFrame with Lane values exploded into separate rows
+            DataFrame with Lane values exploded into separate rows, samples
+            without lanes are left out
         """
-        if df.empty or 'Lane' not in df.columns:
-            return df.copy()
-            
-        # Filter out empty lanes and explode
-        filtered = df[df["Lane"].apply(lambda x: bool(x))].copy()
-        return filtered.explode("Lane", ignore_index=True) if not filtered.empty else filtered
+        return lane_partition.exploded()
 
     def data_to_data_widget(self) -> None:
-        """Prepare and emit the data for the overview widget.
+        """Prepare the data for the overview widget in the compute service and emit it.
         
-        Processes the sample data and emits a tuple containing:
+        The sample data is snapshotted here, and the views are prepared in a worker.
+        When ready, data_ready is emitted with a tuple containing:
         - Original DataFrame
         - DataFrame with exploded application profiles
         - DataFrame with exploded lanes
@@ -87,21 +92,28 @@ class SampleDataOverviewGenerator(QObject):
                              " in state model")
             return
             
-        try:
-            sample_df = self._state_model.sample_df
-            
-            # Ensure we're working with a copy to avoid modifying the original
-            df = sample_df.copy()
-            
-            # Create the different views
-            app_exploded = self._appname_explode(df)
-            lane_exploded = self._lane_explode(df)
-            
-            # Emit the prepared data
-            self.data_ready.emit((df, app_exploded, lane_exploded))
-            
-        except Exception as e:
-            self._logger.exception("Error preparing data for overview widget")
-            # Emit empty DataFrames with the same structure on error
-            self.data_ready.emit((pd.DataFrame(), pd.DataFrame(), pd.DataFrame()))
+        # sample_df hands out a copy, the worker may use it as it is
+        df = self._state_model.sample_df
+        lane_partition = self._state_model.lane_partition
+
+        self._compute_service.submit(
+            self.JOB_KEY,
+            lambda token: self._prepare(df, lane_partition, token),
+            self.data_ready.emit,
+            self._on_error,
+            priority=2,
+        )
+
+    def _prepare(self, df: pd.DataFrame, lane_partition: LanePartition,
+                 token: CancelToken) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        # Create the different views
+        app_exploded = self._appname_explode(df)
+        token.raise_if_cancelled()
+        lane_exploded = self._lane_explode(lane_partition)
+
+        return df, app_exploded, lane_exploded
 
+    def _on_error(self, message: str) -> None:
+        self._logger.error(f"Error preparing data for overview widget: {message}")
+        # Emit empty DataFrames with the same structure on error
+        self.data_ready.emit((pd.DataFrame(), pd.DataFrame(), pd.DataFrame()))
@@ -1,22 +1,9 @@
-import json
-
 import numpy as np
 import pandas as pd
 
 pd.set_option("future.no_silent_downcasting", True)
 
 
-class NpEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        if isinstance(obj, np.floating):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super(NpEncoder, self).default(obj)
-
-
 def get_base(string, index):
 
     if index >= len(string):
@@ -0,0 +1,121 @@
+"""
+JSON encoding with an optional orjson fast path.
+
+orjson is used when it is installed and serializes NumPy arrays and scalars
+natively. Otherwise the standard library json module is used with a default
+hook that converts NumPy and pandas values. Both backends write missing pandas
+values (pd.NA, NaT) as null.
+"""
+import json
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def backend_name() -> str:
+    """Return the name of the JSON backend in use."""
+    return "orjson" if orjson is not None else "json"
+
+
+def dumpb(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: The object to serialize.
+        indent: Pretty-print the output.
+
+    Returns:
+        The encoded JSON.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    return dumps(obj, indent).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string.
+
+    Args:
+        obj: The object to serialize.
+        indent: Pretty-print the output.
+
+    Returns:
+        The JSON string.
+    """
+    if orjson is not None:
+        return dumpb(obj, indent).decode("utf-8")
+
+    return json.dumps(obj, default=_default, indent=2 if indent else None, ensure_ascii=False)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from str, bytes or bytearray."""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def dataframe_records(df: pd.DataFrame) -> Iterable[dict]:
+    """Yield the rows of a dataframe as dicts, with missing values as None."""
+    columns = [str(column) for column in df.columns]
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        yield dict(zip(columns, row))
+
+
+def write_document(fh: IO[bytes], header: dict, records_key: str, records: Iterable[dict]) -> None:
+    """Stream a JSON object holding a header object and a list of records.
+
+    The header entries are written first, followed by records_key with the
+    records encoded one at a time, one record per line. Only a single record is
+    held as encoded JSON at any point.
+
+    Args:
+        fh: Binary file-like object to write to.
+        header: Mapping of top level keys to values, written before the records.
+        records_key: Top level key of the records list.
+        records: The records to write.
+    """
+    fh.write(b"{\n")
+    for key, value in header.items():
+        fh.write(b"  " + dumpb(str(key)) + b": " + dumpb(value) + b",\n")
+
+    fh.write(b"  " + dumpb(records_key) + b": [")
+    separator = b"\n    "
+    for record in records:
+        fh.write(separator)
+        fh.write(dumpb(record))
+        separator = b",\n    "
+    fh.write(b"\n  ]\n}\n")
@@ -49,6 +49,10 @@ class ExportWidget(QWidget):
         self._json_textedit = QTextEdit()
         self._json_textedit.setReadOnly(True)
 
+        # Highlighters are created once, they highlight the visible text first when repopulated
+        self._samplesheet_v2_highlighter = IlluminaSamplesheetV2Highlighter(self._samplesheet_v2_textedit)
+        self._json_highlighter = JsonHighlighter(self._json_textedit)
+
         hbox = QHBoxLayout()
         hbox.setContentsMargins(0, 0, 0, 0)
         self.generate_btn = QPushButton("Generate")
@@ -108,8 +112,8 @@ class ExportWidget(QWidget):
 
         text = self._state_model.samplesheet_v2
 
-        self._samplesheet_v2_textedit.setText(text)
-        IlluminaSamplesheetV2Highlighter(self._samplesheet_v2_textedit.document())
+        self._samplesheet_v2_textedit.setPlainText(text)
+        self._samplesheet_v2_highlighter.rehighlight()
 
     def populate_json_text(self, text):
 
@@ -118,7 +122,7 @@ class ExportWidget(QWidget):
         # font.setPointSize(12)
         # self._json_textedit.setFont(font)
 
-        JsonHighlighter(self._json_textedit.document())
+        self._json_highlighter.rehighlight()
 
 
     def _export_samplesheet_v2(self):
@@ -0,0 +1,129 @@
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QPoint, QTimer, Slot
+from PySide6.QtGui import QTextBlock, QTextCharFormat, QTextLayout
+from PySide6.QtWidgets import QTextEdit
+
+# (start, length, format) of a highlighted range in a line
+Highlight = Tuple[int, int, QTextCharFormat]
+
+# block user states hold the state of the block and the state of the block before it,
+# -1 (the Qt default) marks a block that is not highlighted yet
+_STATE_BITS = 8
+_STATE_MASK = (1 << _STATE_BITS) - 1
+
+
+class LazySyntaxHighlighter(QObject):
+    """Syntax highlighter that highlights the visible part of a document first.
+
+    QSyntaxHighlighter highlights the whole document as soon as its text is
+    replaced, which blocks the UI for large documents. This highlighter instead
+    highlights the blocks in the viewport right away, follows scrolling, and
+    highlights the remaining blocks in document order in small chunks from a zero
+    timeout timer, so the event loop keeps running in between.
+
+    Each block stores its own state and the state it was highlighted from. The
+    document order pass skips blocks that were already highlighted from the same
+    previous state, for example blocks highlighted while scrolled into view.
+
+    Subclasses pass the function highlighting one line, and can implement
+    previous_state_for to give the state of a block whose predecessor is not
+    highlighted yet.
+
+    Args:
+        text_edit: The text edit whose document is highlighted
+        highlight_line: Takes the text of a line and the state of the line before
+            it, 0 for the first line, and returns the highlighted ranges and the
+            state of the line, a small non-negative int
+    """
+
+    CHUNK_BLOCKS = 500
+
+    def __init__(self, text_edit: QTextEdit,
+                 highlight_line: Callable[[str, int], Tuple[List[Highlight], int]]):
+        super().__init__(text_edit)
+        self._highlight_line = highlight_line
+        self._text_edit = text_edit
+        self._document = text_edit.document()
+        self._next_block_number = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._highlight_chunk)
+
+        text_edit.verticalScrollBar().valueChanged.connect(self._highlight_viewport)
+
+    def previous_state_for(self, block: QTextBlock) -> int:
+        """Return the state of the block before block, when that block is not highlighted yet."""
+        return 0
+
+    def rehighlight(self) -> None:
+        """Highlight the document again, visible blocks first, after its text was replaced."""
+        self._document = self._text_edit.document()
+        self._next_block_number = 0
+        self._highlight_viewport()
+        self._timer.start()
+
+    @staticmethod
+    def _state(block: QTextBlock) -> Optional[int]:
+        user_state = block.userState()
+        return None if user_state < 0 else user_state & _STATE_MASK
+
+    @staticmethod
+    def _cached_previous_state(block: QTextBlock) -> Optional[int]:
+        user_state = block.userState()
+        return None if user_state < 0 else user_state >> _STATE_BITS
+
+    def _highlight_block(self, block: QTextBlock, previous_state: int) -> None:
+        highlights, state = self._highlight_line(block.text(), previous_state)
+
+        ranges = []
+        for start, length, char_format in highlights:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = char_format
+            ranges.append(format_range)
+
+        block.layout().setFormats(ranges)
+        block.setUserState((previous_state << _STATE_BITS) | state)
+        self._document.markContentsDirty(block.position(), block.length())
+
+    @Slot()
+    def _highlight_viewport(self, *args) -> None:
+        viewport = self._text_edit.viewport()
+        block = self._text_edit.cursorForPosition(QPoint(0, 0)).block()
+        last = self._text_edit.cursorForPosition(QPoint(viewport.width() - 1, viewport.height() - 1)).block()
+
+        while block.isValid():
+            if self._state(block) is None:
+                previous = block.previous()
+                previous_state = self._state(previous) if previous.isValid() else 0
+                if previous_state is None:
+                    previous_state = self.previous_state_for(block)
+                self._highlight_block(block, previous_state)
+
+            if block == last:
+                break
+            block = block.next()
+
+    @Slot()
+    def _highlight_chunk(self) -> None:
+        block = self._document.findBlockByNumber(self._next_block_number)
+
+        previous = block.previous()
+        previous_state = self._state(previous) if previous.isValid() else 0
+        if previous_state is None:
+            previous_state = self.previous_state_for(block)
+
+        for _ in range(self.CHUNK_BLOCKS):
+            if not block.isValid():
+                self._timer.stop()
+                return
+
+            if self._cached_previous_state(block) != previous_state:
+                self._highlight_block(block, previous_state)
+
+            previous_state = self._state(block)
+            block = block.next()
+            self._next_block_number += 1
@@ -1,26 +1,39 @@
 import re
-from PySide6.QtCore import QRegularExpression
-from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
-from PySide6.QtWidgets import QApplication, QTextEdit, QVBoxLayout, QWidget
+from PySide6.QtGui import QTextBlock, QTextCharFormat, QColor, QFont
+from PySide6.QtWidgets import QTextEdit
 
+from modules.views.export.lazy_highlighter import LazySyntaxHighlighter
 
-class IlluminaSamplesheetV2Highlighter(QSyntaxHighlighter):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+_COMMENT_RE = re.compile(r'^[#;]')
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]')
+_INI_RE = re.compile(r'^([^=]+?)=(.*)$')
 
-        # State tracking for different sections
-        self.IN_NORMAL_SECTION = 0
-        self.IN_DATA_SECTION = 1
-        self.IN_DATA_HEADER = 2
-        self.IN_DATA_ROWS = 3
+# Column colors, cycled through by column
+_COLUMN_COLORS = [
+    QColor(255, 120, 120),  # Bright red - Lane/Sample_ID
+    QColor(100, 200, 255),  # Bright blue - Sample names
+    QColor(200, 120, 255),  # Bright purple - Plate/Well info
+    QColor(255, 180, 60),   # Bright orange - Index IDs
+    QColor(100, 255, 150),  # Bright green - Index sequences
+    QColor(255, 120, 200),  # Bright pink - Projects
+    QColor(100, 220, 255),  # Bright cyan - Descriptions
+]
+
+
+class IlluminaSamplesheetV2Highlighter(LazySyntaxHighlighter):
+
+    # State tracking for different sections
+    IN_NORMAL_SECTION = 0
+    IN_DATA_SECTION = 1
+    IN_DATA_HEADER = 2
+    IN_DATA_ROWS = 3
+
+    def __init__(self, text_edit: QTextEdit):
+        super().__init__(text_edit, self.highlight_line)
 
         # Define highlighting formats
         self.setup_formats()
 
-        # Track current section type
-        self.current_section_type = self.IN_NORMAL_SECTION
-        self.data_section_name = ""
-
     def setup_formats(self):
         # Section headers [Header]
         self.section_format = QTextCharFormat()
@@ -41,15 +54,6 @@ class IlluminaSamplesheetV2Highlighter(QSyntaxHighlighter):
         self.value_format = QTextCharFormat()
         self.value_format.setForeground(QColor(206, 145, 120))  # Light brown
 
-        # CSV headers (column names in data sections)
-        self.csv_header_format = QTextCharFormat()
-        self.csv_header_format.setForeground(QColor(78, 201, 176))  # Teal
-        self.csv_header_format.setFontWeight(QFont.Weight.Bold)
-
-        # CSV data cells
-        self.csv_data_format = QTextCharFormat()
-        self.csv_data_format.setForeground(QColor(220, 220, 220))  # Light gray
-
         # CSV separators (commas)
         self.csv_separator_format = QTextCharFormat()
         self.csv_separator_format.setForeground(QColor(128, 128, 128))  # Gray
@@ -59,180 +63,133 @@ class IlluminaSamplesheetV2Highlighter(QSyntaxHighlighter):
         self.comment_format.setForeground(QColor(106, 153, 85))  # Green
         self.comment_format.setFontItalic(True)
 
-        # Numbers in CSV data
+        # Numbers in INI values
         self.number_format = QTextCharFormat()
         self.number_format.setForeground(QColor(181, 206, 168))  # Light green
 
+        # Numbers in CSV data
+        self.csv_number_format = QTextCharFormat()
+        self.csv_number_format.setForeground(QColor(181, 206, 168))  # Light green
+        self.csv_number_format.setFontWeight(QFont.Weight.Bold)
+
         # Empty/missing values
         self.empty_format = QTextCharFormat()
         self.empty_format.setForeground(QColor(128, 128, 128))  # Gray
         self.empty_format.setFontItalic(True)
 
-    def highlightBlock(self, text):
+        # CSV headers and data cells, one format per column color
+        self.csv_header_formats = []
+        self.csv_data_formats = []
+        for color in _COLUMN_COLORS:
+            header_format = QTextCharFormat()
+            header_format.setForeground(color)
+            header_format.setFontWeight(QFont.Weight.Bold)
+            self.csv_header_formats.append(header_format)
+
+            data_format = QTextCharFormat()
+            data_format.setForeground(color)
+            self.csv_data_formats.append(data_format)
+
+    def highlight_line(self, text, previous_state):
         # Handle comments first (lines starting with # or ;)
-        comment_pattern = QRegularExpression(r'^[#;].*')
-        comment_match = comment_pattern.match(text)
-        if comment_match.hasMatch():
-            self.setFormat(0, len(text), self.comment_format)
-            return
+        if _COMMENT_RE.match(text):
+            return [(0, len(text), self.comment_format)], self.IN_NORMAL_SECTION
 
-        # Handle empty lines
+        # Handle empty lines, they end a data section
         if not text.strip():
-            return
+            return [], self.IN_NORMAL_SECTION
 
         # Check for section headers
-        section_pattern = QRegularExpression(r'^\[([^\]]+)\]')
-        section_match = section_pattern.match(text)
-
-        if section_match.hasMatch():
-            section_name = section_match.captured(1)
-
+        section_match = _SECTION_RE.match(text)
+        if section_match:
             # Check if this is a data section
-            if '_Data' in section_name:
-                self.setFormat(0, len(text), self.data_section_format)
-                self.setCurrentBlockState(self.IN_DATA_SECTION)
-                self.data_section_name = section_name
-            else:
-                self.setFormat(0, len(text), self.section_format)
-                self.setCurrentBlockState(self.IN_NORMAL_SECTION)
-                self.data_section_name = ""
-            return
-
-        # Get previous block state to understand context
-        previous_state = self.previousBlockState() if self.previousBlockState() != -1 else self.IN_NORMAL_SECTION
+            if '_Data' in section_match.group(1):
+                return [(0, len(text), self.data_section_format)], self.IN_DATA_SECTION
+            return [(0, len(text), self.section_format)], self.IN_NORMAL_SECTION
 
         # Handle content based on section type
         if previous_state == self.IN_DATA_SECTION:
             # First line after data section header should be CSV headers
-            self.highlight_csv_header(text)
-            self.setCurrentBlockState(self.IN_DATA_HEADER)
-        elif previous_state == self.IN_DATA_HEADER or previous_state == self.IN_DATA_ROWS:
+            return self.highlight_csv(text, self.csv_header_formats, header=True), self.IN_DATA_HEADER
+
+        if previous_state == self.IN_DATA_HEADER or previous_state == self.IN_DATA_ROWS:
             # Subsequent lines are CSV data rows
-            if text.strip():  # Only if line has content
-                self.highlight_csv_data(text)
-                self.setCurrentBlockState(self.IN_DATA_ROWS)
-            else:
-                self.setCurrentBlockState(previous_state)
-        else:
-            # Regular INI-style key=value pairs
-            self.highlight_ini_line(text)
-            self.setCurrentBlockState(self.IN_NORMAL_SECTION)
-
-    def highlight_csv_header(self, text):
-        """Highlight CSV header row (column names)"""
-        # Split by comma and highlight each header
-        parts = text.split(',')
-        position = 0
+            return self.highlight_csv(text, self.csv_data_formats, header=False), self.IN_DATA_ROWS
 
-        # Define the same column colors as in highlight_csv_data
-        column_colors = [
-            QColor(255, 120, 120),  # Bright red - Lane/Sample_ID
-            QColor(100, 200, 255),  # Bright blue - Sample names
-            QColor(200, 120, 255),  # Bright purple - Plate/Well info
-            QColor(255, 180, 60),  # Bright orange - Index IDs
-            QColor(100, 255, 150),  # Bright green - Index sequences
-            QColor(255, 120, 200),  # Bright pink - Projects
-            QColor(100, 220, 255),  # Bright cyan - Descriptions
-        ]
+        # Regular INI-style key=value pairs
+        return self.highlight_ini_line(text), self.IN_NORMAL_SECTION
 
-        for i, part in enumerate(parts):
-            part_stripped = part.strip()
+    def previous_state_for(self, block: QTextBlock) -> int:
+        """Derive the state before block from the lines above it, up to the enclosing section header."""
+        previous = block.previous()
+        lines_after_header = 0
+
+        while previous.isValid():
+            text = previous.text()
+
+            if not text.strip() or _COMMENT_RE.match(text):
+                return self.IN_NORMAL_SECTION
+
+            section_match = _SECTION_RE.match(text)
+            if section_match:
+                if '_Data' not in section_match.group(1):
+                    return self.IN_NORMAL_SECTION
+                return self.IN_DATA_SECTION if lines_after_header == 0 else self.IN_DATA_ROWS
+
+            lines_after_header += 1
+            previous = previous.previous()
+
+        return self.IN_NORMAL_SECTION
 
-            # Find the actual position of this part in the original text
-            start_pos = text.find(part, position)
-            if start_pos != -1:
-                if part_stripped:
-                    # Create format for this header
-                    header_format = QTextCharFormat()
-                    color_index = i % len(column_colors)
-                    header_format.setForeground(column_colors[color_index])
-                    header_format.setFontWeight(QFont.Weight.Bold)
-
-                    self.setFormat(start_pos, len(part_stripped), header_format)
-                else:
-                    self.setFormat(start_pos, len(part), self.empty_format)
-
-                position = start_pos + len(part)
-
-                # Highlight comma separator
-                if i < len(parts) - 1:
-                    comma_pos = text.find(',', position)
-                    if comma_pos != -1:
-                        self.setFormat(comma_pos, 1, self.csv_separator_format)
-                        position = comma_pos + 1
-
-    def highlight_csv_data(self, text):
-        """Highlight CSV data rows"""
-        parts = text.split(',')
+    def highlight_csv(self, text, column_formats, header):
+        """Highlight a CSV header row (column names) or data row"""
+        highlights = []
         position = 0
+        separator = self.csv_separator_format
 
-        # Define column colors (cycle through them)
-        column_colors = [
-            QColor(255, 120, 120),  # Bright red - Lane/Sample_ID
-            QColor(100, 200, 255),  # Bright blue - Sample names
-            QColor(200, 120, 255),  # Bright purple - Plate/Well info
-            QColor(255, 180, 60),   # Bright orange - Index IDs
-            QColor(100, 255, 150),  # Bright green - Index sequences
-            QColor(255, 120, 200),  # Bright pink - Projects
-            QColor(100, 220, 255),  # Bright cyan - Descriptions
-        ]
+        for i, part in enumerate(text.split(',')):
+            if i:
+                # comma separator before this part
+                highlights.append((position - 1, 1, separator))
 
-        for i, part in enumerate(parts):
+            # cells are highlighted from their start, over their stripped length
+            start = position + len(part) - len(part.lstrip())
             part_stripped = part.strip()
 
-            # Find the actual position of this part in the original text
-            start_pos = text.find(part, position)
-            if start_pos != -1:
-                if part_stripped:
-                    # Create format for this column
-                    column_format = QTextCharFormat()
-
-                    # Check if it's a number
-                    if self.is_numeric(part_stripped):
-                        column_format.setForeground(QColor(181, 206, 168))  # Light green for numbers
-                        column_format.setFontWeight(QFont.Weight.Bold)
-                    else:
-                        # Use column-specific color
-                        color_index = i % len(column_colors)
-                        column_format.setForeground(column_colors[color_index])
-
-                    self.setFormat(start_pos, len(part_stripped), column_format)
-                else:
-                    # Empty cell
-                    self.setFormat(start_pos, len(part), self.empty_format)
-
-                position = start_pos + len(part)
-
-                # Highlight comma separator
-                if i < len(parts) - 1:
-                    comma_pos = text.find(',', position)
-                    if comma_pos != -1:
-                        self.setFormat(comma_pos, 1, self.csv_separator_format)
-                        position = comma_pos + 1
+            if not part_stripped:
+                # Empty cell
+                highlights.append((position, len(part), self.empty_format))
+            elif not header and self.is_numeric(part_stripped):
+                highlights.append((start, len(part_stripped), self.csv_number_format))
+            else:
+                highlights.append((start, len(part_stripped), column_formats[i % len(column_formats)]))
+
+            position += len(part) + 1
+
+        return highlights
 
     def highlight_ini_line(self, text):
         """Highlight INI-style key=value pairs"""
-        # Pattern for key=value
-        ini_pattern = QRegularExpression(r'^([^=]+?)=(.*)$')
-        match = ini_pattern.match(text)
-
-        if match.hasMatch():
-            # Highlight the key
-            key = match.captured(1)
-            self.setFormat(match.capturedStart(1), len(key), self.key_format)
-
-            # Highlight the equals sign
-            self.setFormat(match.capturedStart(2) - 1, 1, self.csv_separator_format)
-
-            # Highlight the value
-            value = match.captured(2)
-            if value:  # Only try to highlight if there's a value
-                if self.is_numeric(value.strip()):
-                    self.setFormat(match.capturedStart(2), len(value), self.number_format)
-                else:
-                    self.setFormat(match.capturedStart(2), len(value), self.value_format)
-
-    def is_numeric(self, text):
+        match = _INI_RE.match(text)
+        if not match:
+            return []
+
+        # Highlight the key and the equals sign
+        highlights = [
+            (match.start(1), len(match.group(1)), self.key_format),
+            (match.start(2) - 1, 1, self.csv_separator_format),
+        ]
+
+        # Highlight the value
+        value = match.group(2)
+        if value:  # Only try to highlight if there's a value
+            value_format = self.number_format if self.is_numeric(value.strip()) else self.value_format
+            highlights.append((match.start(2), len(value), value_format))
+
+        return highlights
+
+    @staticmethod
+    def is_numeric(text):
         """Check if text represents a numeric value"""
         try:
             float(text)
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QFileDialog
 )
 
+from modules.models.project.project_file import PROJECT_SUFFIX
 from modules.views.ui_components import HorizontalLine
 from modules.views.import_worksheet.import_worksheet_view import FetchWorksheetView
 
@@ -14,6 +15,8 @@ from modules.views.import_worksheet.import_worksheet_view import FetchWorksheetV
 class FileView(QWidget):
 
     worksheet_filepath_ready = Signal(object)
+    project_open_path_ready = Signal(object)
+    project_save_path_ready = Signal(object)
 
     def __init__(self, worksheet_view: FetchWorksheetView):
         super().__init__()
@@ -26,6 +29,8 @@ class FileView(QWidget):
         self._new_samplesheet_btn = QPushButton("New Samplesheet")
         self._import_worksheet_btn = QPushButton("Import Worksheet")
         self._fetch_work_data_btn = QPushButton("Fetch Workdata")
+        self._open_project_btn = QPushButton("Open Project")
+        self._save_project_btn = QPushButton("Save Project")
 
 
         layout = QVBoxLayout()
@@ -35,6 +40,8 @@ class FileView(QWidget):
         layout.addWidget(self._new_samplesheet_btn)
         layout.addWidget(self._import_worksheet_btn)
         layout.addWidget(self._fetch_work_data_btn)
+        layout.addWidget(self._open_project_btn)
+        layout.addWidget(self._save_project_btn)
 
         layout.addStretch()
 
@@ -45,6 +52,8 @@ class FileView(QWidget):
 
         self._import_worksheet_btn.clicked.connect(self._import_worksheet)
         self._fetch_work_data_btn.clicked.connect(self._fetch_work_data)
+        self._open_project_btn.clicked.connect(self._open_project)
+        self._save_project_btn.clicked.connect(self._save_project)
 
 
     def _import_worksheet(self):
@@ -62,3 +71,27 @@ class FileView(QWidget):
 
     def _fetch_work_data(self):
         self._worksheet_view.show()
+
+    def _open_project(self):
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            None,
+            "Open Project",
+            "",
+            f"Project Files (*{PROJECT_SUFFIX});;All Files (*)",
+        )
+
+        if file_path:
+            self.project_open_path_ready.emit(file_path)
+
+    def _save_project(self):
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            None,
+            "Save Project",
+            "",
+            f"Project Files (*{PROJECT_SUFFIX})",
+        )
+
+        if file_path:
+            self.project_save_path_ready.emit(file_path)
@@ -16,6 +16,13 @@ from modules.views.run_setup.pattern_validator import PatternValidator
 from modules.views.ui_components import HorizontalLine
 
 
+# the run info fields set from this widget
+RUN_SETUP_FIELDS = frozenset({
+    "investigator", "run_name", "run_description", "instrument", "flowcell", "reagent_kit",
+    "read1_cycles", "index1_cycles", "index2_cycles", "read2_cycles", "custom_cycles",
+})
+
+
 class RunSetupWidget(QWidget):
 
     run_setup_data_ready = Signal(dict)
@@ -201,6 +208,31 @@ class RunSetupWidget(QWidget):
         self._pattern_validator.set_template(template)
         self._custom_cycles_le.setValidator(self._pattern_validator)
 
+    @Slot(dict)
+    def show_run_info(self, changes: dict):
+        """Show the run setup of the state model after it changed, e.g. by opening a project."""
+        if not RUN_SETUP_FIELDS & changes.keys():
+            return
+
+        run_info = self._state_model.run_info
+
+        self._investigator_cb.setCurrentText(run_info.investigator)
+        self._run_name_le.setText(run_info.run_name)
+        self._run_description_le.setText(run_info.run_description)
+
+        # each combobox repopulates the ones below it, and a new read cycles
+        # template clears the custom cycles, so they are set top down
+        self._instrument_cb.setCurrentText(run_info.instrument)
+        self._flowcell_cb.setCurrentText(run_info.flowcell)
+        self._reagent_kit_cb.setCurrentText(run_info.reagent_kit)
+
+        read_cycles = (f"{run_info.read1_cycles}-{run_info.index1_cycles}-"
+                       f"{run_info.index2_cycles}-{run_info.read2_cycles}")
+        if run_info.custom_cycles:
+            self._custom_cycles_le.setText(read_cycles)
+        else:
+            self._read_cycles_cb.setCurrentText(read_cycles)
+
     def _commit(self):
         """Commit the data from the input widgets."""
 
@@ -1,7 +1,6 @@
 from PySide6.QtGui import (
     QKeyEvent,
     QCursor,
-    QStandardItemModel,
 )
 from PySide6.QtCore import (
     Qt,
@@ -9,7 +8,6 @@ from PySide6.QtCore import (
     QPoint,
     Slot,
     QItemSelectionModel,
-    QSortFilterProxyModel,
     QTimer,
 )
 from PySide6.QtWidgets import (
@@ -30,10 +28,8 @@ from PySide6.QtWidgets import (
 )
 
 from modules.models.application.application_profile import ApplicationProfile
-from modules.utils.utils import json_to_obj, obj_to_json
 
 from modules.models.sample.sample_model import CustomProxyModel
-from modules.utils.utils import header_to_index_map
 from modules.views.sample.column_visibility_view import ColumnVisibilityWidget
 
 
@@ -57,53 +53,67 @@ def list2d_to_tabbed_str(data):
     return "\n".join(tab_delimited_rows)
 
 
-def clipboard_text_to_model():
+def tabbed_str_to_list2d(text):
+    """
+    Parse tab-delimited text, e.g. copied from Excel, into a 2D list.
+
+    Windows and old Mac line endings are accepted and empty lines are skipped.
+
+    Args:
+        text (str): The tab-delimited text.
+
+    Returns:
+        list of lists: One list of cell strings per non-empty line.
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return [line.split("\t") for line in lines if line]
+
+
+def clipboard_text_to_list2d():
     clipboard = QApplication.clipboard()
     mime_data = clipboard.mimeData()
 
     if not mime_data.hasText():
         return None
 
-    text = mime_data.text()
-    rows = text.split("\n")
-    rows = [row for row in rows if row]  # remove empty rows
-
-    max_cols = max(len(row.split("\t")) for row in rows)
-    dummy_model = QStandardItemModel(len(rows), max_cols)
+    return tabbed_str_to_list2d(mime_data.text()) or None
 
-    for r_count, r in enumerate(rows):
-        for c_count, value in enumerate(r.split("\t")):
-            dummy_model.setData(dummy_model.index(r_count, c_count), value, Qt.EditRole)
-
-    return dummy_model
 
+def block_paste_cells(start_index, data, proxy_model):
+    """
+    Map a 2D block pasted at a proxy index to source model cells.
 
-def regular_paste(selected_indexes, source_model, target_proxy_model):
-    start_row = selected_indexes[0].row()
-    start_col = selected_indexes[0].column()
+    Each proxy row and column is mapped to the source model once. Rows and
+    columns that fall outside the proxy model are dropped.
 
-    source_row_count = source_model.rowCount()
-    source_col_count = source_model.columnCount()
+    Args:
+        start_index (QModelIndex): The proxy index of the top left cell.
+        data (list of lists): The block to paste.
+        proxy_model (QSortFilterProxyModel): The proxy model shown in the view.
 
-    target_model = target_proxy_model.sourceModel()
+    Returns:
+        list: (source_row, source_column, value) tuples.
+    """
+    cells = []
+    start_row = start_index.row()
+    start_col = start_index.column()
+    max_width = max(len(row_values) for row_values in data)
+    end_col = min(start_col + max_width, proxy_model.columnCount())
 
-    target_proxy_model.blockSignals(True)
+    source_columns = [
+        proxy_model.mapToSource(proxy_model.index(start_row, proxy_col)).column()
+        for proxy_col in range(start_col, end_col)
+    ]
 
-    for row in range(source_row_count):
-        for col in range(source_col_count):
-            idx = source_model.index(row, col)
-            value = source_model.data(idx, Qt.DisplayRole)
-            target_proxy_model.setData(
-                target_proxy_model.index(start_row + row, start_col + col),
-                value,
-                Qt.EditRole,
-            )
+    for row_offset, row_values in enumerate(data):
+        proxy_row = start_row + row_offset
+        if proxy_row >= proxy_model.rowCount():
+            break
 
-    target_proxy_model.blockSignals(False)
+        source_row = proxy_model.mapToSource(proxy_model.index(proxy_row, start_col)).row()
+        cells.extend(zip([source_row] * len(source_columns), source_columns, row_values))
 
-    target_model.refresh_view()
-
-    return True
+    return cells
 
 
 class SamplesWidget(QWidget):
@@ -301,6 +311,11 @@ class SampleTableView(QTableView):
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
+        self._row_resize_timer = QTimer(self)
+        self._row_resize_timer.setSingleShot(True)
+        self._row_resize_timer.setInterval(0)
+        self._row_resize_timer.timeout.connect(self.resizeRowsToContents)
+
     def flash_error(self):
         original_style = self.styleSheet()
         self.setStyleSheet("border: 1px solid red;")
@@ -329,227 +344,69 @@ class SampleTableView(QTableView):
         selected_rows = self.selectionModel().selectedRows()
         self.model().removeRows(selected_rows[0].row(), len(selected_rows))
 
-    @Slot(dict)
-    def remove_application_profile_id(self, application_profile: ApplicationProfile) -> None:
-
-        print("remove", application_profile)
-
+    def _selected_source_rows(self) -> list:
+        """Return the source model rows of the selected rows."""
         proxy_model = self.model()
-        source_model = proxy_model.sourceModel()
         selection_model = self.selectionModel()
-        selected_rows = [index.row() for index in selection_model.selectedRows()]
+        if proxy_model is None or selection_model is None:
+            return []
 
-        if not selected_rows:
-            return
-
-        header_index_map = header_to_index_map(proxy_model)
-
-        appname_column = header_index_map["ApplicationProfileId"]
-        application_profile_id = application_profile.id
-        application_name = application_profile.application_name
-        application_profile_data = application_profile.data
+        return [proxy_model.mapToSource(index).row() for index in selection_model.selectedRows()]
 
-        source_model.blockSignals(True)
-
-        for row in selected_rows:
-            app_profile_ids_json = (
-                proxy_model.data(proxy_model.index(row, appname_column), Qt.DisplayRole)
-                or "[]"
-            )
-            app_profile_ids_list = json_to_obj(app_profile_ids_json)
-            if application_profile_id in app_profile_ids_list:
-                app_profile_ids_list.remove(application_profile_id)
-
-            app_profile_ids_json = obj_to_json(app_profile_ids_list)
+    @Slot(dict)
+    def remove_application_profile_id(self, application_profile: ApplicationProfile) -> None:
+        """
+        Removes the application profile id from the selected rows in the model.
 
-            proxy_model.setData(
-                proxy_model.index(row, appname_column),
-                app_profile_ids_json,
-                Qt.EditRole,
-            )
+        For the "BCLConvert" application the profile's data fields are cleared as well.
 
-            if application_name == "BCLConvert":
-                self._set_bclconvert_data_empty(
-                    proxy_model, row, header_index_map, application_profile_data
-                )
+        Parameters:
+        - application_profile: The application profile to remove.
 
-        source_model.blockSignals(False)
+        Returns:
+        - None
+        """
+        selected_rows = self._selected_source_rows()
+        if not selected_rows:
+            return
 
-        source_model.dataChanged.emit(
-            source_model.index(0, 0),
-            source_model.index(
-                source_model.rowCount() - 1, source_model.columnCount() - 1
-            ),
-            Qt.DisplayRole,
-        )
+        data_fields = None
+        if application_profile.application_name == "BCLConvert":
+            data_fields = list(application_profile.data or {})
 
-        # self._set_dynamic_column_width()
+        self.model().sourceModel().remove_profile(selected_rows, application_profile.id, data_fields)
 
     @Slot(object)
     def set_application_profile_id(self, application_profile: ApplicationProfile) -> None:
         """
-        Sets the application_name data for the selected rows in the model.
+        Adds the application profile id to the selected rows in the model.
 
-        This method updates the specified rows in the proxy model with the application_name data
-        provided in the application_object. If the application_name is already set in the selection,
-        a warning dialog is displayed. Special handling is performed for the "BCLConvert"
-        application_name to set additional data.
+        For the "BCLConvert" application the profile's data is written to the
+        corresponding fields as well.
 
         Parameters:
-        - application_object (dict): A dictionary containing the application_name details, including:
-            - "Data": The data to be set for the application_name.
-            - "ApplicationName": The name of the application_name.
-            - "Application": The type of application_name.
+        - application_profile: The application profile to add.
 
         Returns:
         - None
         """
-
-        print("application_profile", application_profile)
-
-        data = application_profile.data
-
-        proxy_model = self.model()
-        source_model = proxy_model.sourceModel()
-        selection_model = self.selectionModel()
-        selected_rows = [index.row() for index in selection_model.selectedRows()]
-
+        selected_rows = self._selected_source_rows()
         if not selected_rows:
             return
 
-        header_index_map = header_to_index_map(proxy_model)
+        data = None
+        if application_profile.application_name == "BCLConvert":
+            data = application_profile.data
 
-        app_name_column = header_index_map["ApplicationProfileId"]
-        app_profile_id = application_profile.id
-        application_name = application_profile.application_name
-
-        source_model.blockSignals(True)
-
-        for row in selected_rows:
-            self._set_str_to_json(proxy_model, row, app_name_column, app_profile_id)
-
-            if application_name == "BCLConvert":
-                self._set_bclconvert_data(
-                    proxy_model, row, header_index_map, data
-                )
-
-        source_model.blockSignals(False)
-        source_model.dataChanged.emit(
-            source_model.index(0, 0),
-            source_model.index(
-                source_model.rowCount() - 1, source_model.columnCount() - 1
-            ),
-            Qt.DisplayRole,
-        )
+        self.model().sourceModel().add_profile(selected_rows, application_profile.id, data)
 
     @Slot(list)
     def set_lanes(self, lanes: list) -> None:
-        proxy_model = self.model()
-        source_model = proxy_model.sourceModel()
-        selection_model = self.selectionModel()
-        selected_rows = [index.row() for index in selection_model.selectedRows()]
-
+        selected_rows = self._selected_source_rows()
         if not selected_rows:
             return
 
-        lanes_json = obj_to_json(lanes)
-
-        header_index_map = header_to_index_map(proxy_model)
-        lane_column = header_index_map["Lane"]
-
-        source_model.blockSignals(True)
-
-        for row in selected_rows:
-            proxy_model.setData(
-                proxy_model.index(row, lane_column), lanes_json, Qt.EditRole
-            )
-
-        source_model.blockSignals(False)
-
-        source_model.dataChanged.emit(
-            source_model.index(0, 0),
-            source_model.index(
-                source_model.rowCount() - 1, source_model.columnCount() - 1
-            ),
-            Qt.DisplayRole,
-        )
-
-    @staticmethod
-    def _set_bclconvert_data(
-        proxy_model: QSortFilterProxyModel,
-        row: int,
-        header_index_map: dict,
-        app_data: dict,
-    ) -> None:
-        """
-        Sets BCLConvert data in the specified row of the proxy model.
-
-        Parameters:
-        - proxy_model: The QSortFilterProxyModel to set data in.
-        - row: The row index in the proxy model.
-        - header_index_map: A dictionary mapping header keys to column indices.
-        - app_data: A dictionary of data to set.
-        """
-        if not proxy_model or row < 0 or not app_data:
-            return
-
-        for key, value in app_data.items():
-            column = header_index_map.get(key)
-            if column is not None:
-                proxy_model.setData(proxy_model.index(row, column), value)
-
-    @staticmethod
-    def _set_bclconvert_data_empty(
-        proxy_model: QSortFilterProxyModel,
-        row: int,
-        header_index_map: dict,
-        app_data: dict,
-    ) -> None:
-        """
-        Sets BCLConvert data in the specified row of the proxy model.
-
-        Parameters:
-        - proxy_model: The QSortFilterProxyModel to set data in.
-        - row: The row index in the proxy model.
-        - header_index_map: A dictionary mapping header keys to column indices.
-        - app_data: A dictionary of data to set.
-        """
-        if not proxy_model or row < 0 or not app_data:
-            return
-
-        for key, value in app_data.items():
-            column = header_index_map.get(key)
-            if column is not None:
-                proxy_model.setData(proxy_model.index(row, column), "")
-
-    @staticmethod
-    def _json_data_as_obj(model: QSortFilterProxyModel, row: int, column: int) -> str:
-        """
-        Retrieve JSON data from a specified cell in the model and return it as a Python object.
-
-        Parameters:
-        - model: The QAbstractItemModel from which data is retrieved.
-        - row: The row index of the cell.
-        - column: The column index of the cell.
-
-        Returns:
-        - The JSON data from the specified cell, parsed as a Python object.
-        """
-        data = model.data(model.index(row, column), Qt.DisplayRole) or "[]"
-        return json_to_obj(data)
-
-    @staticmethod
-    def _set_str_to_json(model, row: int, column: int, value: str) -> None:
-        """
-        Sets the value of the specified cell to the given value, stored as a json
-        array. If the cell is currently empty, it will be initialized with an
-        empty list.
-        """
-        current_data = model.data(model.index(row, column), Qt.DisplayRole) or "[]"
-        data = json_to_obj(current_data)
-        if value not in data:
-            data.append(value)
-            model.setData(model.index(row, column), obj_to_json(data))
+        self.model().sourceModel().assign_lanes(selected_rows, lanes)
 
     def _table_popup(self):
         self.table_context_menu.exec(QCursor.pos())
@@ -664,22 +521,37 @@ class SampleTableView(QTableView):
         return selected_data
 
     def _delete_selection(self):
+        """Clear the selected cells in one model operation, undone as one step."""
+        proxy_model = self.model()
+        cells = []
+        for idx in self.selectedIndexes():
+            source_index = proxy_model.mapToSource(idx)
+            cells.append((source_index.row(), source_index.column(), ""))
 
-        model = self.model()
-        selected_indexes = self.selectedIndexes()
+        proxy_model.sourceModel().write_cells(cells, undo_text="Delete")
 
-        model.blockSignals(True)
-        for idx in selected_indexes:
-            model.setData(idx, "", Qt.EditRole)
+    def undo(self) -> None:
+        """Undo the last change of the sample data."""
+        if self.model().sourceModel().undo():
+            self._row_resize_timer.start()
 
-        model.blockSignals(False)
-        model.dataChanged.emit(
-            model.index(0, 0),
-            model.index(model.rowCount() - 1, model.columnCount() - 1),
-            Qt.DisplayRole,
-        )
+    def redo(self) -> None:
+        """Redo the last undone change of the sample data."""
+        if self.model().sourceModel().redo():
+            self._row_resize_timer.start()
 
     def keyPressEvent(self, event: QKeyEvent):
+        # Undo and redo work without a current cell
+        key, modifiers = event.key(), event.modifiers()
+        if key == Qt.Key_Z and modifiers == Qt.ControlModifier:
+            self.undo()
+            return True
+
+        if (key == Qt.Key_Y and modifiers == Qt.ControlModifier) or \
+                (key == Qt.Key_Z and modifiers == Qt.ControlModifier | Qt.ShiftModifier):
+            self.redo()
+            return True
+
         current_index = self.selectionModel().currentIndex()
         if not current_index.isValid():
             return
@@ -757,60 +629,42 @@ class SampleTableView(QTableView):
         multiple cells are selected and the clipboard content is a single cell, it is
         duplicated across the selected cells.
         
-        The function blocks model signals during the paste operation and emits
-        a single signal when done to improve performance.
+        The clipboard text is parsed straight into a 2D list, proxy rows are
+        mapped to source rows once, and the cells are written to the source
+        model in one batch with a single dataChanged. Resizing the rows to
+        their contents is deferred until pasting has settled.
 
         Returns:
             bool: True if the paste operation was successful, False otherwise.
         """
-        model = self.model()
-        
-        # Block signals before making changes
-        model.blockSignals(True)
-        source_model = clipboard_text_to_model()
-        source_model.blockSignals(True)
-
-        if source_model is not None:
-            selected_indexes = self.selectedIndexes()
-
-            if not selected_indexes:
-                model.blockSignals(False)  # Unblock signals before returning
-                return False
-
-            try:
-                if len(selected_indexes) == 1:
-                    regular_paste(selected_indexes, source_model, model)
-                    self.selectionModel().clearSelection()
-                    self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-                elif len(selected_indexes) > 1:
-                    if source_model.rowCount() == 1 and source_model.columnCount() == 1:
-                        source_index = source_model.index(0, 0)
-                        for idx in selected_indexes:
-                            model.setData(
-                                idx,
-                                source_model.data(source_index, Qt.DisplayRole),
-                                Qt.EditRole,
-                            )
-                
-                # Emit dataChanged for all affected items after unblocking signals
-                if selected_indexes:
-                    top_left = selected_indexes[0]
-                    bottom_right = selected_indexes[-1]
-                    model.blockSignals(False)
-                    source_model.blockSignals(False)
-                    # Unblock signals
-                    model.dataChanged.emit(top_left, bottom_right)
-                    return True
-                    
-            except Exception as e:
-                model.blockSignals(False)  # Make sure to unblock signals even if error occurs
-                source_model.blockSignals(False)
-                raise e
-
-        model.blockSignals(False)
-        source_model.blockSignals(False)
-        # Unblock signals if we get here
-        return False
+        data = clipboard_text_to_list2d()
+        if data is None:
+            return False
+
+        selected_indexes = self.selectedIndexes()
+        if not selected_indexes:
+            return False
+
+        proxy_model = self.model()
+        source_model = proxy_model.sourceModel()
+
+        if len(selected_indexes) == 1:
+            cells = block_paste_cells(selected_indexes[0], data, proxy_model)
+            self.selectionModel().clearSelection()
+        elif len(data) == 1 and len(data[0]) == 1:
+            value = data[0][0]
+            cells = []
+            for idx in selected_indexes:
+                source_index = proxy_model.mapToSource(idx)
+                cells.append((source_index.row(), source_index.column(), value))
+        else:
+            return False
+
+        if not source_model.write_cells(cells):
+            return False
+
+        self._row_resize_timer.start()
+        return True
 
     @Slot(str)
     def set_override_pattern(self, pattern: str) -> None:
@@ -7,6 +7,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QStatusBar,
+    QProgressBar,
 )
 
 
@@ -49,6 +50,12 @@ class StatusBar(QStatusBar):
         self.addWidget(self.spacer)
         self.addWidget(self.label)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(150)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        self.addPermanentWidget(self.progress_bar)
+
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.clear_message)
 
@@ -61,6 +68,19 @@ class StatusBar(QStatusBar):
         self.timer.stop()
         self.timer.start(timeout)
 
+    @Slot(int, int, str)
+    def display_progress(self, done: int, total: int, message: str):
+        """Show the progress of a background task, the bar is hidden when the task is done."""
+        self.display_message("INFO", message)
+
+        if done >= total:
+            self.progress_bar.hide()
+            return
+
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.show()
+
     def clear_message(self):
         """Clears the message when the timer expires."""
         self.label.clear()
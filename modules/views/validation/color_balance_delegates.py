@@ -1,10 +1,15 @@
 import json
-from typing import Any, Dict, Optional, Union
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
 
-from PySide6.QtCore import QEvent, QModelIndex, QSize, Qt, QRect
+from PySide6.QtCore import QEvent, QModelIndex, QSize, Qt, QRect, Slot
 from PySide6.QtGui import (
     QColor,
     QPainter,
+    QPalette,
+    QPixmap,
     QTextBlockFormat,
     QTextCharFormat,
     QTextCursor,
@@ -21,11 +26,53 @@ from PySide6.QtWidgets import (
     QStyledItemDelegate,
 )
 
+from modules.models.validation.color_balance.color_balance_warnings import ColorBalanceWarning
+from modules.models.validation.color_balance.index_color_balance_model import IndexColorBalanceModel
+
+
+@lru_cache(maxsize=1024)
+def _parse_summary(json_data: str) -> Dict[str, Any]:
+    """Parse a summary cell, the result is shared and must not be modified."""
+    return json.loads(json_data)
+
+
+class RenderedSummary:
+    """A summary cell rendered at one width, with its size hint."""
+    __slots__ = ("size", "pixmap")
+
+    def __init__(self, size: QSize, pixmap: QPixmap):
+        self.size = size
+        self.pixmap = pixmap
+
+
+class SummaryRenderCache:
+    """LRU cache of rendered summary cells keyed by (cell json, warnings, width, palette, pixel ratio)."""
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, RenderedSummary]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[RenderedSummary]:
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+        return rendered
+
+    def put(self, key: Tuple, rendered: RenderedSummary) -> None:
+        self._entries[key] = rendered
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 class ColorBalanceRowDelegate(QStyledItemDelegate):
     """
     A delegate for rendering color balance information in a table view.
-    Handles special rendering for color balance rows and adjacent G-base warnings.
+    Handles special rendering for color balance rows and dark cycle warnings, both read
+    from the warnings the model precomputes (IndexColorBalanceModel.WarningRole).
     """
     
     # Define warning colors
@@ -34,7 +81,12 @@ class ColorBalanceRowDelegate(QStyledItemDelegate):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._document_cache = {}
+        self._render_cache = SummaryRenderCache()
+
+    @Slot()
+    def invalidate(self) -> None:
+        """Drop the rendered summaries, connected to the model's summary_changed."""
+        self._render_cache.clear()
 
     def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
         """
@@ -50,53 +102,39 @@ class ColorBalanceRowDelegate(QStyledItemDelegate):
             # Handle special rows and columns
             if column >= 2 and index.row() == last_row:
                 self._paint_color_balance_row(painter, option, index)
-            elif column in (2, 3):  # Check for adjacent G bases
-                self._paint_adjacent_g_warning(painter, option, index)
+            elif column >= 2 and self._warnings(index) & ColorBalanceWarning.DARK_RUN:
+                self._paint_dark_run_warning(painter, option, index)
             else:
                 super().paint(painter, option, index)
         except Exception as e:
             # Fallback to default painting on error
             super().paint(painter, option, index)
 
-    def _paint_adjacent_g_warning(self, painter: QPainter, option: QStyleOptionViewItem, 
+    @staticmethod
+    def _warnings(index: QModelIndex) -> ColorBalanceWarning:
+        return ColorBalanceWarning(index.data(IndexColorBalanceModel.WarningRole) or 0)
+
+    def _paint_dark_run_warning(self, painter: QPainter, option: QStyleOptionViewItem,
                                 index: QModelIndex) -> None:
         """
-        Highlight cells with adjacent 'G' bases that might cause color balance issues.
+        Highlight cells in a run of dark cycles at the start of an index read.
         """
-        model = index.model()
-        current_value = model.data(index, Qt.DisplayRole)
-        
-        # Get the adjacent column (2 <-> 3)
-        adjacent_col = 3 if index.column() == 2 else 2
-        adjacent_index = model.index(index.row(), adjacent_col, index.parent())
-        adjacent_value = model.data(adjacent_index, Qt.DisplayRole)
-        
-        # Check for adjacent G bases
-        if current_value == adjacent_value == "G":
-            painter.save()
-            
-            # Draw warning background
-            painter.fillRect(option.rect, self.WARNING_COLOR)
-            
-            # Draw text with warning color
-            text = str(current_value or "")
-            text_rect = option.rect.adjusted(2, 0, -2, 0)  # Add some padding
-            
-            # Center the text
-            text_option = option
-            text_option.displayAlignment = Qt.AlignCenter
-            
-            # Draw text with warning color
-            painter.setPen(self.WARNING_TEXT_COLOR)
-            painter.drawText(text_rect, text_option.displayAlignment, text)
-            
-            # Draw a subtle border
-            painter.setPen(QColor(200, 150, 150))
-            painter.drawRect(option.rect.adjusted(0, 0, -1, -1))
-            
-            painter.restore()
-        else:
-            super().paint(painter, option, index)
+        painter.save()
+
+        # Draw warning background
+        painter.fillRect(option.rect, self.WARNING_COLOR)
+
+        # Draw the centered text with warning color, with some padding
+        text = str(index.data(Qt.DisplayRole) or "")
+        text_rect = option.rect.adjusted(2, 0, -2, 0)
+        painter.setPen(self.WARNING_TEXT_COLOR)
+        painter.drawText(text_rect, Qt.AlignCenter, text)
+
+        # Draw a subtle border
+        painter.setPen(QColor(200, 150, 150))
+        painter.drawRect(option.rect.adjusted(0, 0, -1, -1))
+
+        painter.restore()
 
     def _paint_color_balance_row(self, painter: QPainter, option: QStyleOptionViewItem, 
                                index: QModelIndex) -> None:
@@ -108,52 +146,102 @@ class ColorBalanceRowDelegate(QStyledItemDelegate):
             return
 
         try:
-            data = json.loads(json_data)
-            
-            # Create a document with formatted text
-            doc = QTextDocument()
-            doc.setDocumentMargin(2)  # Reduce margins
-            
-            # Configure default text format
-            default_format = QTextCharFormat()
-            default_format.setFontPointSize(9)  # Slightly smaller font
-            
-            # Create cursor for text insertion
-            cursor = QTextCursor(doc)
-            cursor.setCharFormat(default_format)
-            
-            # Add colors section
-            self._add_section(cursor, "Colors", data.get("colors", {}), default_format)
-            
-            # Add a single dashed line as separator
-            cursor.insertBlock()
-            separator_format = QTextCharFormat(default_format)
-            separator_format.setFontPointSize(8)  # Slightly smaller for separator
-            cursor.insertText("-" * 8, separator_format)  # Single dashed line
-            cursor.insertBlock()
-            
-            # Add bases section
-            self._add_section(cursor, "Bases", data.get("bases", {}), default_format)
-            
-            # Check for warnings
-            colors = data.get("colors", {})
-            if colors.get("G", 0) < 0.1:  # Low green warning
-                self._add_warning_background(doc, "Low green channel detected")
-            
-            # Draw the document
-            painter.save()
-            painter.translate(option.rect.topLeft())
-            doc.setTextWidth(option.rect.width())
-            doc.drawContents(painter)
-            painter.restore()
-            
+            rendered = self._rendered_summary(json_data, self._warnings(index), option.rect.width(), option)
         except (json.JSONDecodeError, AttributeError) as e:
             # Fallback to default rendering on error
             super().paint(painter, option, index)
+            return
+
+        painter.drawPixmap(option.rect.topLeft(), rendered.pixmap)
+
+    def _rendered_summary(self, json_data: str, warnings: ColorBalanceWarning, width: int,
+                          option: QStyleOptionViewItem) -> RenderedSummary:
+        """Return the summary cell rendered at width, from the cache when available."""
+        pixel_ratio = option.widget.devicePixelRatioF() if option.widget is not None else 1.0
+        palette: QPalette = option.palette
+        key = (json_data, int(warnings), width, palette.cacheKey(), pixel_ratio)
+
+        rendered = self._render_cache.get(key)
+        if rendered is None:
+            rendered = self._render_summary(_parse_summary(json_data), warnings, width, pixel_ratio)
+            self._render_cache.put(key, rendered)
+
+        return rendered
+
+    def _render_summary(self, data: Dict[str, Any], warnings: ColorBalanceWarning, width: int,
+                        pixel_ratio: float) -> RenderedSummary:
+        doc = self._summary_document(data, warnings)
+        if width > 0:
+            doc.setTextWidth(width)
+
+        size = QSize(
+            int(math.ceil(doc.idealWidth())) + 4,  # Add some padding
+            int(math.ceil(doc.size().height())) + 4
+        )
+
+        doc_size = doc.size()
+        pixmap = QPixmap(max(1, int(math.ceil(doc_size.width() * pixel_ratio))),
+                         max(1, int(math.ceil(doc_size.height() * pixel_ratio))))
+        pixmap.setDevicePixelRatio(pixel_ratio)
+        pixmap.fill(Qt.transparent)
+
+        pixmap_painter = QPainter(pixmap)
+        doc.drawContents(pixmap_painter)
+        pixmap_painter.end()
+
+        return RenderedSummary(size, pixmap)
+
+    def _summary_document(self, data: Dict[str, Any], warnings: ColorBalanceWarning) -> QTextDocument:
+        """Build the formatted summary document for parsed summary data and its cycle warnings."""
+        # Create a document with formatted text
+        doc = QTextDocument()
+        doc.setDocumentMargin(2)  # Reduce margins
+
+        # Configure default text format
+        default_format = QTextCharFormat()
+        default_format.setFontPointSize(9)  # Slightly smaller font
+
+        # Create cursor for text insertion
+        cursor = QTextCursor(doc)
+        cursor.setCharFormat(default_format)
+
+        # Add colors section
+        self._add_section(cursor, "Colors", data.get("colors", {}), default_format, warnings)
+
+        # Add a single dashed line as separator
+        cursor.insertBlock()
+        separator_format = QTextCharFormat(default_format)
+        separator_format.setFontPointSize(8)  # Slightly smaller for separator
+        cursor.insertText("-" * 8, separator_format)  # Single dashed line
+        cursor.insertBlock()
+
+        # Add bases section
+        self._add_section(cursor, "Bases", data.get("bases", {}), default_format)
+
+        if warnings & ColorBalanceWarning.SAME_COLOR:
+            cursor.insertBlock()
+            warning_format = QTextCharFormat(default_format)
+            warning_format.setForeground(self.WARNING_TEXT_COLOR)
+            warning_format.setFontWeight(600)
+            cursor.insertText("Same color in all samples", warning_format)
+
+        # Low channel warnings
+        low_channels = [name for flag, name in ((ColorBalanceWarning.LOW_GREEN, "green"),
+                                                (ColorBalanceWarning.LOW_BLUE, "blue"))
+                        if warnings & flag]
+        if low_channels:
+            self._add_warning_background(doc, f"Low {' and '.join(low_channels)} channel detected")
+
+        return doc
+
+    def _add_section(self, cursor: QTextCursor, title: str,
+                    data: Dict[str, Any], default_format: QTextCharFormat,
+                    warnings: ColorBalanceWarning = ColorBalanceWarning.NONE) -> None:
+        """Add a section with title and key-value pairs to the document, low channels in red."""
+        low_keys = {key for flag, key in ((ColorBalanceWarning.LOW_GREEN, "G"),
+                                          (ColorBalanceWarning.LOW_BLUE, "B"))
+                    if warnings & flag}
 
-    def _add_section(self, cursor: QTextCursor, title: str, 
-                    data: Dict[str, Any], default_format: QTextCharFormat) -> None:
-        """Add a section with title and key-value pairs to the document."""
         # Add section title
         title_format = QTextCharFormat(default_format)
         title_format.setFontWeight(600)  # Make title bold
@@ -166,7 +254,7 @@ class ColorBalanceRowDelegate(QStyledItemDelegate):
             # Format values differently based on type
             value_format = QTextCharFormat(default_format)
             if isinstance(value, (int, float)):
-                if key.lower() == 'g' and value < 0.1:  # Highlight low green values
+                if key in low_keys:  # Highlight low channel values
                     value_format.setForeground(Qt.red)
                     value_format.setFontWeight(600)
                 value_text = f"{value:.2f}" if isinstance(value, float) else str(value)
@@ -203,20 +291,13 @@ class ColorBalanceRowDelegate(QStyledItemDelegate):
         
         # Only calculate custom size for color balance rows
         if index.column() >= 2 and index.row() == last_row:
-            # Use cached document if available
-            cache_key = f"{index.row()}_{index.column()}"
-            if cache_key not in self._document_cache:
-                doc = QTextDocument()
-                doc.setDocumentMargin(2)
-                doc.setPlainText(str(index.data(Qt.DisplayRole) or ""))
-                doc.setTextWidth(option.rect.width())
-                self._document_cache[cache_key] = doc
-            
-            doc = self._document_cache[cache_key]
-            return QSize(
-                int(doc.idealWidth() + 4),  # Add some padding
-                int(doc.size().height() + 4)
-            )
+            json_data = index.data(Qt.DisplayRole)
+            if json_data:
+                try:
+                    return self._rendered_summary(json_data, self._warnings(index),
+                                                  option.rect.width(), option).size
+                except (json.JSONDecodeError, AttributeError):
+                    pass
             
         return super().sizeHint(option, index)
 
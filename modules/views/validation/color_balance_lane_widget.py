@@ -1,7 +1,7 @@
 import pandas as pd
-from PySide6.QtCore import Qt, QModelIndex
+from PySide6.QtCore import Qt, QModelIndex, QRect
 from PySide6.QtGui import QStandardItem, QPainter, QPen, QColor, QStandardItemModel
-from PySide6.QtWidgets import QTableView, QSizePolicy, QAbstractScrollArea, QHeaderView
+from PySide6.QtWidgets import QTableView, QSizePolicy, QAbstractScrollArea, QHeaderView, QStyleOptionViewItem
 
 from modules.models.validation.color_balance.index_color_balance_model import IndexColorBalanceModel
 from modules.views.validation.color_balance_delegates import ColorBalanceRowDelegate
@@ -34,7 +34,9 @@ class ColorBalanceLaneWidget(QTableView):
         super(ColorBalanceLaneWidget, self).__init__(parent)
         df = indexes_df.copy()
 
-        df["Proportion"] = "1"
+        # proportions saved from an earlier view of the lane are kept
+        if "Proportion" not in df.columns:
+            df["Proportion"] = "1"
 
         cols = ["Sample_ID", "Proportion"] + [
             col for col in df.columns if col not in ["Sample_ID", "Proportion"]
@@ -60,6 +62,11 @@ class ColorBalanceLaneWidget(QTableView):
         
         self._setup(base_colors)
 
+    def proportions(self) -> list:
+        """Return the Proportion texts of the sample rows."""
+        model = self._color_balance_model
+        return [model.item(row, 1).text() for row in range(model.rowCount() - 1)]
+
     def _setup(self, base_colors):
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
         self.setContentsMargins(0, 0, 0, 0)
@@ -76,8 +83,10 @@ class ColorBalanceLaneWidget(QTableView):
         self.verticalHeader().setSectionResizeMode(last_row, QHeaderView.Interactive)
         self.setRowHeight(last_row, 200)  # Increased from 140 to 200
         
-        # Set the delegate for custom rendering
-        self.setItemDelegate(ColorBalanceRowDelegate())
+        # Set the delegate for custom rendering, its rendered summaries are dropped when the summary changes
+        self._delegate = ColorBalanceRowDelegate(self)
+        self.setItemDelegate(self._delegate)
+        self._color_balance_model.summary_changed.connect(self._delegate.invalidate)
 
         self.setSizeAdjustPolicy(QAbstractScrollArea.AdjustToContents)
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -91,21 +100,24 @@ class ColorBalanceLaneWidget(QTableView):
         super().resizeEvent(event)
         # Update the summary row height based on content
         last_row = self._color_balance_model.rowCount() - 1
-        if last_row >= 0:
-            from PySide6.QtWidgets import QStyleOptionViewItem
-            
-            # Create a style option for the delegate
-            option = QStyleOptionViewItem()
-            option.initFrom(self.viewport())
-            option.rect = self.rect()
-            option.rect.setWidth(self.viewport().width())
-            
-            # Get the required height for the summary row
-            index = self.model().index(last_row, 0)
-            delegate = self.itemDelegate()
-            if delegate:
-                size = delegate.sizeHint(option, index)
-                self.setRowHeight(last_row, max(200, size.height() + 10))  # Ensure minimum height of 200
+        if last_row < 0:
+            return
+
+        option = QStyleOptionViewItem()
+        option.initFrom(self.viewport())
+        option.widget = self
+
+        # The delegate caches the rendered summaries per width, so only the first
+        # resize to a given column width lays out the summary documents
+        height = 0
+        for column in range(2, self._color_balance_model.columnCount()):
+            option.rect = QRect(0, 0, self.columnWidth(column), 0)
+            index = self._color_balance_model.index(last_row, column)
+            height = max(height, self._delegate.sizeHint(option, index).height())
+
+        row_height = max(200, height + 10)  # Ensure minimum height of 200
+        if self.rowHeight(last_row) != row_height:
+            self.setRowHeight(last_row, row_height)
 
     @staticmethod
     def _create_color_balance_model(
@@ -129,6 +141,9 @@ class ColorBalanceLaneWidget(QTableView):
             row_items = [QStandardItem(str(item)) for item in row]
             model.appendRow(row_items)
 
+        # encode the index bases of the sample rows once, the warnings are computed from them
+        model.set_bases(df.iloc[:-1, 2:].to_numpy(dtype=object))
+
         return model
 
     def paintEvent(self, event):
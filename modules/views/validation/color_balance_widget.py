@@ -1,40 +1,31 @@
-from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QSizePolicy, QScrollArea, QFrame
+from PySide6.QtWidgets import QSizePolicy
 
 from modules.models.state.state_model import StateModel
 from modules.views.validation.color_balance_lane_widget import ColorBalanceLaneWidget
+from modules.views.validation.lazy_tab_widget import LazyTabWidget
 
 
-class ColorBalanceValidationWidget(QTabWidget):
+class ColorBalanceValidationWidget(LazyTabWidget):
 
     def __init__(self, state_model: StateModel):
-        super().__init__()
+        super().__init__(self._build_lane_tab, save_tab=self._save_lane_tab)
 
         self._state_model = state_model
 
         self.setContentsMargins(0, 0, 0, 0)
-        self.layout = QVBoxLayout()
-        self.layout.setContentsMargins(0, 0, 0, 0)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.setLayout(self.layout)
 
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+    def _build_lane_tab(self, indexes_df):
+        return ColorBalanceLaneWidget(indexes_df, self._state_model.base_colors)
 
-    def clear(self):
-        # Remove and delete each tab widget
-        while self.count() > 0:
-            widget = self.widget(0)  # Get the first widget in the tab widget
-            self.removeTab(0)  # Remove the tab
-            widget.deleteLater()
+    @staticmethod
+    def _save_lane_tab(view, indexes_df):
+        # the proportions are edited in the view, keep them for when the lane is built again
+        return indexes_df.assign(Proportion=view.proportions())
 
     def populate(self, results):
+        """Add a tab per lane, the color balance table of a lane is built when its tab is shown."""
         self.clear()
 
         for lane in results:
-            tab_scroll_area = QScrollArea()
-            tab_scroll_area.setFrameShape(QFrame.NoFrame)
-
-            color_balance_table = ColorBalanceLaneWidget(
-                results[lane], self._state_model.base_colors
-            )
-
-            self.addTab(color_balance_table, f"lane {lane}")
+            self.add_lazy_tab(results[lane], f"lane {lane}")
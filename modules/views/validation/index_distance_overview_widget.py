@@ -3,22 +3,43 @@ from typing import Dict, Any, Optional
 from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QFont, QPalette, QColor
 from PySide6.QtWidgets import (
-    QTabWidget, QVBoxLayout, QSizePolicy, QLabel, 
+    QVBoxLayout, QSizePolicy, QLabel, 
     QWidget, QTabBar, QScrollArea, QFrame
 )
 from modules.views.validation.index_distance_lane_area_widget import IndexDistanceLaneAreaWidget
+from modules.views.validation.lazy_tab_widget import LazyTabWidget
 
 
-class IndexDistanceOverviewWidget(QTabWidget):
+def _build_lane_tab(lane_data: Dict[str, Any]) -> QWidget:
+    """Build the distance matrices of a lane when its tab is first shown.
+
+    Args:
+        lane_data: The i7, i5 and i7_i5 distance matrices of the lane
+
+    Returns:
+        The lane's matrices, or an error label if they could not be displayed
+    """
+    try:
+        return IndexDistanceLaneAreaWidget(lane_data)
+    except Exception as e:
+        label = QLabel(f"<b>Error:</b> Error displaying index distances: {str(e)}")
+        label.setAlignment(Qt.AlignCenter)
+        label.setWordWrap(True)
+        label.setStyleSheet("color: #d32f2f;")
+        return label
+
+
+class IndexDistanceOverviewWidget(LazyTabWidget):
     """A tabbed widget for displaying index distance matrices for each lane.
     
     This widget shows distance matrices for I7, I5, and combined I7-I5 indexes
     in separate tabs for each lane. It provides a clean, modern interface with
-    proper error handling and loading states.
+    proper error handling and loading states. The matrices of a lane are only
+    built when its tab is shown.
     """
     
     def __init__(self, parent: Optional[QWidget] = None):
-        super().__init__(parent)
+        super().__init__(_build_lane_tab, parent)
         self._setup_ui()
         self._apply_styles()
         
@@ -108,12 +129,11 @@ class IndexDistanceOverviewWidget(QTabWidget):
             for lane in lanes:
                 lane_data = results.get(lane)
                 if lane_data:
-                    tab = IndexDistanceLaneAreaWidget(lane_data)
-                    self.addTab(tab, f"Lane {lane}")
+                    self.add_lazy_tab(lane_data, f"Lane {lane}")
                     
         except Exception as e:
             self._show_error(f"Error displaying index distances: {str(e)}")
-    
+
     def _show_message(self, message: str) -> None:
         """Display an informational message.
         
@@ -137,14 +157,6 @@ class IndexDistanceOverviewWidget(QTabWidget):
         label.setStyleSheet("color: #d32f2f;")
         self.addTab(label, "Error")
     
-    def clear(self) -> None:
-        """Clear all tabs and clean up resources."""
-        while self.count() > 0:
-            widget = self.widget(0)
-            self.removeTab(0)
-            if widget:
-                widget.deleteLater()
-    
     def sizeHint(self) -> QSize:
         """Provide a reasonable default size for the widget."""
         return QSize(1000, 700)
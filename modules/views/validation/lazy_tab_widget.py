@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class LazyTabWidget(QTabWidget):
+    """A tab widget whose tabs hold lightweight results and build their views on first activation.
+
+    At most max_materialized tab views are kept alive. When another tab is shown,
+    the least recently shown hidden views are released and are built again from
+    their result if their tab is shown later. Views that hold user input are
+    given to save_tab before they are released, so the rebuilt view shows it.
+
+    Args:
+        build_tab: Builds the widget shown in a tab from the result given to add_lazy_tab
+        parent: The parent widget
+        max_materialized: The number of tab views kept alive
+        save_tab: Takes a view about to be released and its result, returns the
+            result to build the view from next time
+    """
+
+    def __init__(self, build_tab: Callable[[Any], QWidget], parent: Optional[QWidget] = None,
+                 max_materialized: int = 2, save_tab: Optional[Callable[[QWidget, Any], Any]] = None):
+        super().__init__(parent)
+
+        self._build_tab = build_tab
+        self._save_tab = save_tab
+        self._max_materialized = max(1, max_materialized)
+        self._tab_results: Dict[QWidget, Any] = {}
+        self._materialized: "OrderedDict[QWidget, QWidget]" = OrderedDict()
+
+        self.currentChanged.connect(self._on_current_changed)
+
+    def add_lazy_tab(self, result: Any, label: str) -> int:
+        """Add a tab that builds its view from result when it is first shown.
+
+        Args:
+            result: The lightweight result the view is built from
+            label: The tab label
+
+        Returns:
+            The index of the new tab
+        """
+        holder = QWidget()
+        layout = QVBoxLayout(holder)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # registered before addTab, which makes the first tab current
+        self._tab_results[holder] = result
+        index = self.addTab(holder, label)
+
+        if self.currentIndex() == index:
+            self._materialize(holder)
+
+        return index
+
+    def clear(self) -> None:
+        """Remove all tabs and delete their widgets."""
+        self._materialized.clear()
+        self._tab_results.clear()
+
+        while self.count() > 0:
+            widget = self.widget(0)
+            self.removeTab(0)
+            if widget:
+                widget.deleteLater()
+
+    def release_hidden(self) -> None:
+        """Release the views of all tabs that are not shown."""
+        self._release_hidden(keep=1)
+
+    def _on_current_changed(self, index: int) -> None:
+        holder = self.widget(index)
+        if holder in self._tab_results:
+            self._materialize(holder)
+
+    def _materialize(self, holder: QWidget) -> None:
+        if holder in self._materialized:
+            self._materialized.move_to_end(holder)
+            return
+
+        view = self._build_tab(self._tab_results[holder])
+        holder.layout().addWidget(view)
+        self._materialized[holder] = view
+
+        self._release_hidden(keep=self._max_materialized)
+
+    def _release_hidden(self, keep: int) -> None:
+        current = self.currentWidget()
+
+        for holder in list(self._materialized):
+            if len(self._materialized) <= keep:
+                break
+            if holder is current:
+                continue
+
+            view = self._materialized.pop(holder)
+            if self._save_tab is not None:
+                self._tab_results[holder] = self._save_tab(view, self._tab_results[holder])
+            holder.layout().removeWidget(view)
+            view.deleteLater()
@@ -1,11 +1,13 @@
 from PySide6.QtWidgets import (
-    QTabWidget, QTableWidget, QTableWidgetItem, QVBoxLayout,
+    QTabWidget, QTableView, QVBoxLayout,
     QWidget, QHeaderView, QLabel, QAbstractItemView
 )
 from PySide6.QtCore import Qt
 import pandas as pd
 from typing import Optional, Tuple
 
+from modules.models.table.dataframe_table_model import DataFrameTableModel
+
 
 class SampleDataOverviewWidget(QWidget):
     def __init__(self, parent=None):
@@ -73,13 +75,12 @@ class SampleDataOverviewWidget(QWidget):
     def clear(self):
         self.tab_widget.clear()
 
-    def _create_table_widget(self, title: str) -> QTableWidget:
-        table = QTableWidget()
+    def _create_table_view(self, title: str) -> QTableView:
+        table = QTableView()
         table.setAlternatingRowColors(True)
-        table.setSortingEnabled(True)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.setSelectionBehavior(QTableView.SelectRows)
+        table.setSelectionMode(QTableView.SingleSelection)
         table.verticalHeader().setVisible(False)
 
         # Enable smooth scrolling
@@ -92,45 +93,20 @@ class SampleDataOverviewWidget(QWidget):
         if df is None or df.empty:
             return
 
-        table = self._create_table_widget(title)
-
-        # Make a copy of the dataframe to avoid modifying the original
-        df_display = df.copy()
-        
-        # Convert any array-like columns to strings
-        for col in df_display.columns:
-            if df_display[col].apply(lambda x: isinstance(x, (list, tuple, set))).any():
-                df_display[col] = df_display[col].apply(
-                    lambda x: ', '.join(map(str, x)) if isinstance(x, (list, tuple, set)) else x
-                )
-
-        # Set up table data
-        rows, cols = df_display.shape
-        table.setRowCount(rows)
-        table.setColumnCount(cols)
-        table.setHorizontalHeaderLabels(df_display.columns)
-
-        # Fill table with data
-        for i, row in df_display.iterrows():
-            for j, value in enumerate(row):
-                # Handle different types of values safely
-                if pd.isna(value):
-                    display_text = ""
-                elif isinstance(value, (list, tuple, set)):
-                    display_text = ', '.join(map(str, value))
-                else:
-                    display_text = str(value)
-                
-                item = QTableWidgetItem(display_text)
-                item.setToolTip(display_text)
-                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                table.setItem(i, j, item)
-
-        # Configure header
+        table = self._create_table_view(title)
+
+        # The model wraps the dataframe's column arrays, cells are converted to text when shown
+        model = DataFrameTableModel(df, sortable=True, parent=table)
+        table.setModel(model)
+        # Rows keep their original order until a column header is clicked
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+
+        # Configure header, column widths are measured on a sample of the rows
         header = table.horizontalHeader()
-        for i in range(cols):
-            header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
-            header.setSectionResizeMode(i, QHeaderView.Interactive)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setResizeContentsPrecision(200)
+        table.resizeColumnsToContents()
 
         # Add tab
         container = QWidget()
@@ -139,7 +115,7 @@ class SampleDataOverviewWidget(QWidget):
         container_layout.addWidget(table)
 
         self.tab_widget.addTab(container, title)
-        # self.status_bar.setText(f"Showing {rows} rows, {cols} columns")
+        # self.status_bar.setText(f"Showing {model.rowCount()} rows, {model.columnCount()} columns")
 
     def populate(self, data: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]) -> None:
         """Update the widget with new data.